@@ -899,16 +899,21 @@ async def discover_agents_semantic(
     from ..search.service import faiss_service
 
     try:
+        all_agents = agent_service.get_all_agents()
+        agent_map = {agent.path: agent for agent in all_agents}
+
+        def can_access(entity_type: str, path: str, name: str) -> bool:
+            agent_card = agent_map.get(path)
+            return bool(agent_card and _filter_agents_by_access([agent_card], user_context))
+
         results = await faiss_service.search_entities(
             query=query,
             entity_types=["a2a_agent"],
             enabled_only=True,
             max_results=max_results,
+            access_filter=can_access,
         )
 
-        all_agents = agent_service.get_all_agents()
-        agent_map = {agent.path: agent for agent in all_agents}
-
         accessible_results = []
         for result in results:
             agent_card = agent_map.get(result.get("path"))
@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 
 from ..auth.dependencies import nginx_proxied_auth
-from ..search.service import faiss_service
+from ..core.config import settings
+from ..search.service import SearchWarmingError, faiss_service
 from ..services.server_service import server_service
 from ..services.agent_service import agent_service
 
@@ -65,6 +66,9 @@ class SemanticSearchRequest(BaseModel):
     max_results: int = Field(
         default=10, ge=1, le=50, description="Maximum results per entity collection"
     )
+    min_score: float = Field(
+        default=0.0, ge=0.0, le=1.0, description="Drop results with a lower relevance score"
+    )
 
 
 class SemanticSearchResponse(BaseModel):
@@ -130,6 +134,19 @@ def _user_can_access_agent(agent_path: str, user_context: dict) -> bool:
     return False
 
 
+def _access_filter(user_context: dict):
+    """Build the search_mixed access predicate for a user, or None for admins."""
+    if user_context.get("is_admin"):
+        return None
+
+    def can_access(entity_type: str, path: str, name: str) -> bool:
+        if entity_type == "a2a_agent":
+            return _user_can_access_agent(path, user_context)
+        return _user_can_access_server(path, name, user_context)
+
+    return can_access
+
+
 @router.post(
     "/semantic",
     response_model=SemanticSearchResponse,
@@ -154,11 +171,20 @@ async def semantic_search(
             query=request.query,
             entity_types=request.entity_types,
             max_results=request.max_results,
+            access_filter=_access_filter(user_context),
+            min_score=request.min_score,
         )
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
         ) from exc
+    except SearchWarmingError as exc:
+        logger.info("Semantic search requested while the search index is warming up")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Semantic search is warming up. Please retry shortly.",
+            headers={"Retry-After": str(settings.search_warmup_retry_after_seconds)},
+        ) from exc
     except RuntimeError as exc:
         logger.error("FAISS search service unavailable: %s", exc, exc_info=True)
         raise HTTPException(
@@ -271,3 +297,107 @@ async def semantic_search(
         total_tools=len(filtered_tools),
         total_agents=len(filtered_agents),
     )
+
+
+class IndexCompactionResponse(BaseModel):
+    live: int
+    dropped: int
+    tombstones_cleared: int
+    tool_live: int = 0
+    tool_dropped: int = 0
+    tool_tombstones_cleared: int = 0
+
+
+@router.post(
+    "/compact",
+    response_model=IndexCompactionResponse,
+    summary="Compact the semantic search index (admin only)",
+)
+async def compact_search_index(
+    user_context: Annotated[dict, Depends(nginx_proxied_auth)],
+    force: bool = False,
+) -> IndexCompactionResponse:
+    """
+    Rebuild a dense FAISS index, dropping removed vectors and renumbering IDs.
+
+    Without force, compaction only runs once tombstones pass the configured threshold.
+    """
+    if not user_context.get("is_admin"):
+        logger.warning(
+            "Non-admin user %s attempted to compact the search index",
+            user_context.get("username"),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This endpoint is only available to admin users",
+        )
+
+    try:
+        result = await faiss_service.compact_index(force=force)
+    except RuntimeError as exc:
+        logger.error("FAISS search service unavailable: %s", exc, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Semantic search is temporarily unavailable. Please try again later.",
+        ) from exc
+
+    logger.info("Search index compacted by %s: %s", user_context.get("username"), result)
+    return IndexCompactionResponse(**result)
+
+
+class QueryCacheStatsResponse(BaseModel):
+    enabled: bool
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    hit_rate: float
+
+
+@router.get(
+    "/cache/stats",
+    response_model=QueryCacheStatsResponse,
+    summary="Query embedding cache statistics (admin only)",
+)
+async def get_query_cache_stats(
+    user_context: Annotated[dict, Depends(nginx_proxied_auth)],
+) -> QueryCacheStatsResponse:
+    """Return hit/miss counters for the query embedding cache used by semantic search."""
+    if not user_context.get("is_admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This endpoint is only available to admin users",
+        )
+
+    return QueryCacheStatsResponse(**faiss_service.get_query_cache_stats())
+
+
+class EmbeddingBatcherStatsResponse(BaseModel):
+    batches: int
+    requests: int
+    texts: int
+    avg_batch_size: float
+    max_batch_size: int
+    avg_queue_wait_ms: float
+    max_queue_wait_ms: float
+
+
+@router.get(
+    "/encoder/stats",
+    response_model=EmbeddingBatcherStatsResponse,
+    summary="Query encoder batching statistics (admin only)",
+)
+async def get_embedding_batcher_stats(
+    user_context: Annotated[dict, Depends(nginx_proxied_auth)],
+) -> EmbeddingBatcherStatsResponse:
+    """Return batch size and queue wait metrics for the micro-batched query encoder."""
+    if not user_context.get("is_admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This endpoint is only available to admin users",
+        )
+
+    return EmbeddingBatcherStatsResponse(**faiss_service.get_embedding_batcher_stats())
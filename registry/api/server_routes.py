@@ -1,10 +1,11 @@
 import json
 import asyncio
+import bisect
 import logging
 import os
-from typing import Annotated
+from typing import Annotated, Any, Callable, Dict, Optional
 
-from fastapi import APIRouter, Request, Form, Depends, HTTPException, status, Cookie
+from fastapi import APIRouter, Request, Form, Depends, HTTPException, Query, status, Cookie
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 import httpx
@@ -1527,11 +1528,53 @@ async def internal_remove_server_from_groups(
         )
 
 
+# Fields /internal/list can project, and how each is read; health fields share one lookup
+_INTERNAL_LIST_FIELDS: Dict[str, Callable[[str, Dict[str, Any], Callable[[], Dict[str, Any]]], Any]] = {
+    "server_name": lambda path, info, health: info.get("server_name", "Unknown"),
+    "path": lambda path, info, health: path,
+    "description": lambda path, info, health: info.get("description", ""),
+    "proxy_pass_url": lambda path, info, health: info.get("proxy_pass_url", ""),
+    "is_enabled": lambda path, info, health: server_service.is_service_enabled(path),
+    "tags": lambda path, info, health: info.get("tags", []),
+    "num_tools": lambda path, info, health: info.get("num_tools", 0),
+    "num_stars": lambda path, info, health: info.get("num_stars", 0),
+    "is_python": lambda path, info, health: info.get("is_python", False),
+    "license": lambda path, info, health: info.get("license", "N/A"),
+    "health_status": lambda path, info, health: health()["status"],
+    "last_checked_iso": lambda path, info, health: health()["last_checked_iso"],
+    "tool_list": lambda path, info, health: info.get("tool_list", []),
+}
+
+
+def _project_service(service_path: str, server_info: Dict[str, Any], fields: list) -> Dict[str, Any]:
+    """Build the listing entry for one service with only the requested fields."""
+    from ..health.service import health_service
+
+    health_data: Dict[str, Any] = {}
+
+    def health() -> Dict[str, Any]:
+        if not health_data:
+            health_data.update(health_service._get_service_health_data(service_path))
+        return health_data
+
+    return {field: _INTERNAL_LIST_FIELDS[field](service_path, server_info, health) for field in fields}
+
+
 @router.get("/internal/list")
 async def internal_list_services(
     request: Request,
+    cursor: Annotated[Optional[str], Query(description="Service path to continue after (next_cursor of the previous page)")] = None,
+    limit: Annotated[Optional[int], Query(description="Maximum number of services to return", ge=1, le=1000)] = None,
+    fields: Annotated[Optional[str], Query(description="Comma-separated fields to include, e.g. server_name,path,description")] = None,
 ):
-    """Internal service listing endpoint for mcpgw-server (requires HTTP Basic Authentication with admin credentials)."""
+    """
+    Internal service listing endpoint for mcpgw-server (requires HTTP Basic Authentication with admin credentials).
+
+    Services are ordered by path. With limit, one page is returned and next_cursor is set
+    while more services follow; fields restricts each entry to the named fields, so unused
+    data such as tool_list is never serialised. Without parameters every service is
+    returned with all fields.
+    """
     import base64
     import os
 
@@ -1587,35 +1630,34 @@ async def internal_list_services(
     logger.warning(f"INTERNAL LIST: Authentication successful for admin user '{username}'")  # TODO: replace with debug
     logger.info(f"Internal service list request from admin user '{username}'")
 
+    if fields:
+        selected_fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown_fields = [field for field in selected_fields if field not in _INTERNAL_LIST_FIELDS]
+        if unknown_fields:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown_fields)}. Available: {', '.join(_INTERNAL_LIST_FIELDS)}"
+            )
+    else:
+        selected_fields = list(_INTERNAL_LIST_FIELDS)
+
     # Get all servers (admin access - no permission filtering)
     all_servers = server_service.get_all_servers()
 
     logger.warning(f"INTERNAL LIST: Found {len(all_servers)} servers")  # TODO: replace with debug
 
+    # Page over services ordered by path; the cursor is the last path of the previous page
+    service_paths = sorted(all_servers)
+    start_index = bisect.bisect_right(service_paths, cursor) if cursor else 0
+    end_index = len(service_paths) if limit is None else min(start_index + limit, len(service_paths))
+    page_paths = service_paths[start_index:end_index]
+    next_cursor = page_paths[-1] if page_paths and end_index < len(service_paths) else None
+
     # Transform the data to include enabled status and health information
-    services = []
-    for service_path, server_info in all_servers.items():
-        from ..health.service import health_service
-
-        # Get real health status from health service
-        health_data = health_service._get_service_health_data(service_path)
-
-        service_data = {
-            "server_name": server_info.get("server_name", "Unknown"),
-            "path": service_path,
-            "description": server_info.get("description", ""),
-            "proxy_pass_url": server_info.get("proxy_pass_url", ""),
-            "is_enabled": server_service.is_service_enabled(service_path),
-            "tags": server_info.get("tags", []),
-            "num_tools": server_info.get("num_tools", 0),
-            "num_stars": server_info.get("num_stars", 0),
-            "is_python": server_info.get("is_python", False),
-            "license": server_info.get("license", "N/A"),
-            "health_status": health_data["status"],
-            "last_checked_iso": health_data["last_checked_iso"],
-            "tool_list": server_info.get("tool_list", [])
-        }
-        services.append(service_data)
+    services = [
+        _project_service(service_path, all_servers[service_path], selected_fields)
+        for service_path in page_paths
+    ]
 
     logger.warning(f"INTERNAL LIST: Returning {len(services)} services")  # TODO: replace with debug
     logger.info(f"Internal service list completed for admin user '{username}' - returned {len(services)} services")
@@ -1624,7 +1666,8 @@ async def internal_list_services(
         status_code=200,
         content={
             "services": services,
-            "total_count": len(services)
+            "total_count": len(service_paths),
+            "next_cursor": next_cursor,
         },
     )
 
@@ -26,17 +26,54 @@ class Settings(BaseSettings):
     # Embeddings settings
     embeddings_model_name: str = "all-MiniLM-L6-v2"
     embeddings_model_dimensions: int = 384
+    embeddings_batch_size: int = 64  # Texts per encode() call during bulk re-indexing
+    embeddings_query_batch_max_size: int = 32  # Max texts coalesced into one encode() for concurrent queries
+    embeddings_query_batch_max_wait_ms: float = 5.0  # How long a query waits for others to join its batch
+    embeddings_backend: str = "torch"  # torch, or onnx for CPU-only hosts (needs sentence-transformers[onnx])
+    embeddings_onnx_quantization: str = "avx2"  # arm64, avx2, avx512 or avx512_vnni; empty for fp32 ONNX
+
+    # FAISS index backend settings
+    faiss_index_type: str = "flat"  # flat (exact search), hnsw or ivfpq
+    faiss_metric: str = "l2"  # l2, or cosine (L2-normalised vectors in an inner-product index)
+    faiss_hnsw_m: int = 32  # HNSW graph neighbours per node
+    faiss_hnsw_ef_construction: int = 80
+    faiss_hnsw_ef_search: int = 64
+    faiss_ivf_nlist: int = 256  # IVF coarse clusters (capped by training set size)
+    faiss_ivf_nprobe: int = 16  # IVF clusters visited per query
+    faiss_ivf_min_train_size: int = 2048  # Stay on flat search until this many vectors exist
+    faiss_pq_m: int = 48  # PQ sub-quantizers, must divide embeddings_model_dimensions
+
+    # FAISS index maintenance settings
+    faiss_compaction_tombstone_ratio: float = 0.2  # Compact once freed IDs exceed this share of allocated IDs
+    faiss_compaction_min_tombstones: int = 50  # Never compact for fewer freed IDs than this
+    faiss_snapshot_debounce_seconds: float = 2.0  # Quiet period before changes are snapshotted to disk
+    faiss_snapshot_max_delay_seconds: float = 30.0  # Upper bound on snapshot delay under constant churn
+
+    # Search query embedding cache settings
+    search_query_cache_size: int = 1024  # Cached query embeddings (0 disables the cache)
+    search_query_cache_ttl_seconds: int = 600
+    search_warmup_retry_after_seconds: int = 10  # Retry-After sent while the search model is loading
+    search_hybrid_enabled: bool = True  # Fuse BM25 keyword matches with vector results
+    search_rrf_k: int = 60  # Reciprocal rank fusion constant; larger values flatten rank differences
     
     # Health check settings
     health_check_interval_seconds: int = 300  # 5 minutes for automatic background checks (configurable via env var)
     health_check_timeout_seconds: int = 2  # Very fast timeout for user-driven actions
+    health_check_min_interval_seconds: int = 15  # Re-check delay right after a service changes state
+    health_check_max_interval_seconds: int = 1800  # Backoff cap for services that stay unhealthy
+    health_check_jitter_ratio: float = 0.1  # Each delay varies by up to this fraction either way
+    health_check_max_concurrency: int = 20  # Background checks in flight at once
+    health_check_http_max_connections: int = 100  # Probe client pool size across all servers
+    health_check_http_max_keepalive_connections: int = 50  # Idle probe connections kept open between checks
+    health_check_http_keepalive_expiry_seconds: float = 600.0  # Should outlast the check interval to be reused
+    health_check_tool_refresh_min_interval_seconds: int = 60  # Minimum gap between tool list fetches per server
     
     # WebSocket performance settings
     max_websocket_connections: int = 100  # Reasonable limit for development/testing
     websocket_send_timeout_seconds: float = 2.0  # Allow slightly more time per connection
     websocket_broadcast_interval_ms: int = 10  # Very responsive - 10ms minimum between broadcasts
-    websocket_max_batch_size: int = 20  # Smaller batches for faster updates
     websocket_cache_ttl_seconds: int = 1  # 1 second cache for near real-time user feedback
+    websocket_client_queue_size: int = 32  # Deltas queued per client before they collapse into one snapshot
 
     # Well-known discovery settings
     enable_wellknown_discovery: bool = True
@@ -65,6 +102,11 @@ class Settings(BaseSettings):
             return Path.cwd() / "registry" / "models" / self.embeddings_model_name
         return self.container_registry_dir / "models" / self.embeddings_model_name
 
+    @property
+    def embeddings_onnx_export_dir(self) -> Path:
+        # Used when the model is pulled from Hugging Face rather than a local directory
+        return self.embeddings_model_dir.with_name(f"{self.embeddings_model_name}-onnx")
+
     @property
     def servers_dir(self) -> Path:
         if self.is_local_dev:
@@ -108,10 +150,28 @@ class Settings(BaseSettings):
     def faiss_index_path(self) -> Path:
         return self.servers_dir / "service_index.faiss"
 
+    @property
+    def faiss_tool_index_path(self) -> Path:
+        return self.servers_dir / "service_index_tools.faiss"
+
     @property
     def faiss_metadata_path(self) -> Path:
         return self.servers_dir / "service_index_metadata.json"
 
+    @property
+    def faiss_metadata_binary_path(self) -> Path:
+        # Memory-mapped by readers such as mcpgw; see registry/search/metadata_file.py
+        return self.servers_dir / "service_index_metadata.bin"
+
+    @property
+    def faiss_tool_vectors_path(self) -> Path:
+        # Normalised per-tool embeddings, reused by mcpgw to rank tools without re-encoding
+        return self.servers_dir / "service_index_tool_vectors.bin"
+
+    @property
+    def faiss_wal_path(self) -> Path:
+        return self.servers_dir / "service_index_metadata.wal"
+
     @property
     def dotenv_path(self) -> Path:
         if self.is_local_dev:
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from itsdangerous import URLSafeTimedSerializer, SignatureExpired, BadSignature
@@ -14,6 +15,15 @@ router = APIRouter()
 signer = URLSafeTimedSerializer(settings.secret_key)
 
 
+def _is_resync_request(message: str) -> bool:
+    """Check for {"type": "resync"}, sent by clients that missed a delta."""
+    try:
+        data = json.loads(message)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(data, dict) and data.get("type") == "resync"
+
+
 @router.websocket("/ws/health_status")
 async def websocket_endpoint(websocket: WebSocket):
     """High-performance WebSocket endpoint for real-time health status updates with authentication."""
@@ -82,13 +92,16 @@ async def websocket_endpoint(websocket: WebSocket):
         
         # Keep connection open and handle client messages
         while True:
-            # We don't expect messages from client, but keep alive
+            # The only client message is a resync request after a sequence gap
             # Add timeout to prevent hanging on slow clients
             try:
-                await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
+                message = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
             except asyncio.TimeoutError:
                 # Send ping to keep connection alive
                 await websocket.ping()
+                continue
+            if _is_resync_request(message):
+                health_service.request_websocket_snapshot(websocket)
             
     except WebSocketDisconnect:
         logger.debug(f"WebSocket client disconnected: {websocket.client}")
@@ -111,4 +124,10 @@ async def health_status_http():
 @router.get("/ws/stats")
 async def websocket_stats():
     """Get WebSocket performance statistics for monitoring."""
-    return health_service.get_websocket_stats() 
\ No newline at end of file
+    return health_service.get_websocket_stats() 
+
+
+@router.get("/http_stats")
+async def health_check_http_stats():
+    """Get per-host connection reuse statistics for the health check HTTP client."""
+    return health_service.get_http_client_stats()
@@ -0,0 +1,151 @@
+import heapq
+import itertools
+import random
+import time
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple
+)
+
+
+class _ServiceSchedule:
+    __slots__ = ("due", "consecutive_failures", "checked_once")
+
+    def __init__(self, due: float):
+        self.due = due
+        self.consecutive_failures = 0
+        self.checked_once = False
+
+
+class HealthCheckScheduler:
+    """
+    Priority queue of per-service health check due times.
+
+    Healthy services are re-checked every interval, unhealthy ones back off
+    exponentially up to max_interval, and a service whose status just changed
+    is re-checked after min_interval to confirm the transition. Every delay is
+    jittered so services drift apart instead of being probed in one burst.
+    Only touched from the event loop, so it needs no locking.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        min_interval_seconds: float,
+        max_interval_seconds: float,
+        jitter_ratio: float,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.interval_seconds = interval_seconds
+        self.min_interval_seconds = min(min_interval_seconds, interval_seconds)
+        self.max_interval_seconds = max(max_interval_seconds, interval_seconds)
+        self.jitter_ratio = max(0.0, min(jitter_ratio, 1.0))
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._services: Dict[str, _ServiceSchedule] = {}
+        # Entries are (due, sequence, path); stale entries are skipped when popped
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._in_flight: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._services)
+
+    def __contains__(self, service_path: str) -> bool:
+        return service_path in self._services
+
+    def _push(self, service_path: str, due: float) -> None:
+        self._services[service_path].due = due
+        heapq.heappush(self._heap, (due, next(self._sequence), service_path))
+
+    def _jittered(self, delay: float) -> float:
+        if self.jitter_ratio:
+            delay *= 1.0 + self._rng.uniform(-self.jitter_ratio, self.jitter_ratio)
+        return max(0.0, delay)
+
+    def sync(self, service_paths: Iterable[str]) -> None:
+        """Track exactly the given services; new ones are due immediately."""
+        wanted = set(service_paths)
+        for service_path in list(self._services):
+            if service_path not in wanted:
+                del self._services[service_path]
+        now = self._clock()
+        for service_path in wanted:
+            if service_path not in self._services:
+                self._services[service_path] = _ServiceSchedule(now)
+                if service_path not in self._in_flight:
+                    self._push(service_path, now)
+
+    def pop_due(self, limit: Optional[int] = None) -> List[str]:
+        """Remove and return services whose check is due, earliest first."""
+        now = self._clock()
+        due_paths = []
+        while self._heap and (limit is None or len(due_paths) < limit):
+            due, _, service_path = self._heap[0]
+            schedule = self._services.get(service_path)
+            if schedule is None or schedule.due != due or service_path in self._in_flight:
+                heapq.heappop(self._heap)
+                continue
+            if due > now:
+                break
+            heapq.heappop(self._heap)
+            self._in_flight.add(service_path)
+            due_paths.append(service_path)
+        return due_paths
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the earliest pending check, or None when nothing is scheduled."""
+        while self._heap:
+            due, _, service_path = self._heap[0]
+            schedule = self._services.get(service_path)
+            if schedule is None or schedule.due != due or service_path in self._in_flight:
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, due - self._clock())
+        return None
+
+    def record_result(self, service_path: str, healthy: bool, status_changed: bool) -> Optional[float]:
+        """
+        Schedule the next check for a service after a check completed.
+
+        Returns the delay until the next check, or None if the service is no
+        longer tracked.
+        """
+        self._in_flight.discard(service_path)
+        schedule = self._services.get(service_path)
+        if schedule is None:
+            return None
+
+        if healthy:
+            schedule.consecutive_failures = 0
+        else:
+            schedule.consecutive_failures += 1
+
+        if status_changed and schedule.checked_once:
+            delay = self._jittered(self.min_interval_seconds)
+        elif not schedule.checked_once:
+            # Spread the first round over a whole interval so services that were
+            # registered together do not stay in lockstep
+            delay = self._rng.uniform(self.min_interval_seconds, self.interval_seconds)
+        elif healthy:
+            delay = self._jittered(self.interval_seconds)
+        else:
+            backoff = self.interval_seconds * 2 ** (schedule.consecutive_failures - 1)
+            delay = self._jittered(min(backoff, self.max_interval_seconds))
+
+        schedule.checked_once = True
+        self._push(service_path, self._clock() + delay)
+        return delay
+
+    def is_in_flight(self, service_path: str) -> bool:
+        return service_path in self._in_flight
+
+    def consecutive_failures(self, service_path: str) -> int:
+        schedule = self._services.get(service_path)
+        return schedule.consecutive_failures if schedule else 0
@@ -1,31 +1,89 @@
 import json
 import asyncio
+import hashlib
 import logging
 import httpx
 from datetime import datetime, timezone
 from typing import Dict, Set, Optional, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
 from collections import defaultdict, deque
-from time import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from time import monotonic, time
 
 from ..core.config import settings
 from registry.constants import HealthStatus
+from .scheduler import HealthCheckScheduler
 
 logger = logging.getLogger(__name__)
 
+# Longest the scheduler sleeps before looking for newly enabled services
+HEALTH_CHECK_RESYNC_SECONDS = 5.0
+
+
+class _ClientStream:
+    """
+    Outgoing messages for one WebSocket client, drained by its own sender task.
+
+    The queue is bounded: when a client falls behind, its queued deltas are
+    dropped and replaced by a single snapshot, so a slow browser costs memory
+    for at most max_queue messages and never holds up the broadcast.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue: int):
+        self.websocket = websocket
+        self.max_queue = max(1, max_queue)
+        self.queue: deque = deque()
+        self.needs_snapshot = True  # Every client starts from a snapshot
+        self.wakeup = asyncio.Event()
+        self.wakeup.set()
+        self.sender_task: Optional[asyncio.Task] = None
+        self.coalesced_count = 0
+
+    def enqueue(self, message: str) -> None:
+        if self.needs_snapshot:
+            return  # The pending snapshot already includes this update
+        if len(self.queue) >= self.max_queue:
+            self.queue.clear()
+            self.needs_snapshot = True
+            self.coalesced_count += 1
+        else:
+            self.queue.append(message)
+        self.wakeup.set()
+
+    def request_snapshot(self) -> None:
+        self.queue.clear()
+        self.needs_snapshot = True
+        self.wakeup.set()
+
 
 class HighPerformanceWebSocketManager:
-    """High-performance WebSocket manager for 400-1000+ concurrent connections."""
+    """
+    High-performance WebSocket manager for 400-1000+ concurrent connections.
+
+    Clients receive {"type": "snapshot", "seq": n, "data": {...}} on connect,
+    then {"type": "delta", "seq": n, "data": {...}, "removed": [...]} messages
+    carrying only the services that changed. Sequence numbers are consecutive,
+    so a client that sees a gap sends {"type": "resync"} to get a new snapshot.
+    Each update is serialised once and queued to every client.
+    """
     
     def __init__(self):
         self.connections: Set[WebSocket] = set()
         self.connection_metadata: Dict[WebSocket, Dict] = {}
+        self.streams: Dict[WebSocket, _ClientStream] = {}
         
         # Rate limiting and batching
         self.pending_updates: Dict[str, Dict] = {}  # service_path -> latest_data
+        self.full_refresh_pending = False
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
         self.last_broadcast_time = 0
         self.min_broadcast_interval = settings.websocket_broadcast_interval_ms / 1000.0
-        self.max_batch_size = settings.websocket_max_batch_size
+        self.client_queue_size = settings.websocket_client_queue_size
+
+        # State the clients have been sent, and its sequence number
+        self.sequence = 0
+        self.sent_state: Dict[str, Dict] = {}
+        self._snapshot_cache: Optional[Tuple[int, str]] = None
         
         # Connection health tracking
         self.failed_connections: Set[WebSocket] = set()
@@ -34,6 +92,7 @@ class HighPerformanceWebSocketManager:
         # Performance metrics
         self.broadcast_count = 0
         self.failed_send_count = 0
+        self.snapshot_count = 0
         
     async def add_connection(self, websocket: WebSocket) -> bool:
         """Add a new WebSocket connection with connection limits."""
@@ -54,8 +113,10 @@ class HighPerformanceWebSocketManager:
             
             logger.debug(f"WebSocket connected: {len(self.connections)} total connections")
             
-            # Send initial status efficiently
-            await self._send_initial_status_optimized(websocket)
+            # The sender task starts with the initial snapshot
+            stream = _ClientStream(websocket, self.client_queue_size)
+            self.streams[websocket] = stream
+            stream.sender_task = asyncio.create_task(self._run_sender(stream))
             return True
             
         except Exception as e:
@@ -67,84 +128,109 @@ class HighPerformanceWebSocketManager:
         self.connections.discard(websocket)
         self.connection_metadata.pop(websocket, None)
         self.failed_connections.discard(websocket)
+        stream = self.streams.pop(websocket, None)
+        if stream and stream.sender_task and stream.sender_task is not asyncio.current_task():
+            stream.sender_task.cancel()
+        if not self.connections:
+            # Updates are not broadcast without clients; the next snapshot rebuilds the state
+            self.sent_state = {}
         
         logger.debug(f"WebSocket disconnected: {len(self.connections)} total connections")
     
-    async def _send_initial_status_optimized(self, websocket: WebSocket):
-        """Send initial status using cached data to avoid blocking."""
-        try:
-            # Use cached health data to avoid blocking on service calls
-            cached_data = health_service._get_cached_health_data()
-            if cached_data:
-                await websocket.send_text(json.dumps(cached_data))
-        except Exception as e:
-            logger.warning(f"Failed to send initial status: {e}")
-            await self.remove_connection(websocket)
+    def request_snapshot(self, websocket: WebSocket) -> None:
+        """Handle a client resync request by replacing its queue with a snapshot."""
+        stream = self.streams.get(websocket)
+        if stream:
+            stream.request_snapshot()
     
     async def broadcast_update(self, service_path: Optional[str] = None, health_data: Optional[Dict] = None):
-        """High-performance broadcasting with batching and rate limiting."""
+        """Queue an update and broadcast it as a delta, at most once per broadcast interval."""
         if not self.connections:
             return
             
-        current_time = time()
-        
-        # Rate limiting: prevent too frequent broadcasts
-        if current_time - self.last_broadcast_time < self.min_broadcast_interval:
-            # Queue the update for later batch processing
-            if service_path and health_data:
-                self.pending_updates[service_path] = health_data
-            return
-        
-        # Prepare broadcast data
         if service_path and health_data:
-            # Single service update
-            broadcast_data = {service_path: health_data}
+            self.pending_updates[service_path] = health_data
         else:
-            # Batch updates or full status
-            if self.pending_updates:
-                # Send pending updates in batches
-                batch_data = dict(list(self.pending_updates.items())[:self.max_batch_size])
-                broadcast_data = batch_data
-                # Remove sent items from pending
-                for key in batch_data.keys():
-                    self.pending_updates.pop(key, None)
-            else:
-                # Full status update (avoid this when possible)
-                broadcast_data = health_service._get_cached_health_data()
-        
-        if broadcast_data:
-            await self._send_to_connections_optimized(broadcast_data)
-            self.last_broadcast_time = current_time
-    
-    async def _send_to_connections_optimized(self, data: Dict):
-        """Optimized concurrent sending with automatic cleanup."""
-        if not self.connections:
+            self.full_refresh_pending = True
+
+        # Rate limiting: updates arriving within the interval are merged into one delta
+        remaining = self.min_broadcast_interval - (time() - self.last_broadcast_time)
+        if remaining > 0:
+            if self.flush_handle is None:
+                self.flush_handle = asyncio.get_running_loop().call_later(remaining, self._flush_updates)
             return
-            
-        message = json.dumps(data)
-        connections_list = list(self.connections)  # Snapshot for safe iteration
-        
-        # Split into chunks for better memory management with many connections
-        chunk_size = 100  # Process 100 connections at a time
-        
-        for i in range(0, len(connections_list), chunk_size):
-            chunk = connections_list[i:i + chunk_size]
-            
-            # Send to chunk concurrently
-            tasks = [self._safe_send_message(conn, message) for conn in chunk]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Track failed connections
-            for conn, result in zip(chunk, results):
-                if isinstance(result, Exception):
-                    self.failed_connections.add(conn)
-                    self.failed_send_count += 1
-        
-        # Cleanup failed connections in batch (non-blocking)
-        if self.failed_connections:
-            asyncio.create_task(self._cleanup_failed_connections())
-            
+        self._flush_updates()
+
+    def _flush_updates(self) -> None:
+        """Diff pending updates against the state clients hold and queue one delta."""
+        self.flush_handle = None
+        self.last_broadcast_time = time()
+        updates, self.pending_updates = self.pending_updates, {}
+        if self.full_refresh_pending:
+            self.full_refresh_pending = False
+            # Read current data rather than the TTL cache, which may predate recent single-service deltas
+            current = health_service.get_all_health_status()
+            current.update(updates)
+            self._publish_changes(current, complete=True)
+        else:
+            self._publish_changes(updates, complete=False)
+
+    def _publish_changes(self, state: Dict[str, Dict], complete: bool) -> None:
+        """
+        Queue a delta of the services whose data differs from what clients hold.
+
+        When state is complete, services missing from it are reported as removed.
+        """
+        changed = {path: data for path, data in state.items() if self.sent_state.get(path) != data}
+        removed = [path for path in self.sent_state if path not in state] if complete else []
+        if not changed and not removed:
+            return
+
+        self.sequence += 1
+        self.sent_state.update(changed)
+        for path in removed:
+            del self.sent_state[path]
+
+        delta = {"type": "delta", "seq": self.sequence, "data": changed}
+        if removed:
+            delta["removed"] = removed
+        message = json.dumps(delta)
+        for stream in self.streams.values():
+            stream.enqueue(message)
         self.broadcast_count += 1
+
+    def _snapshot_message(self) -> str:
+        """Serialise the full state once per sequence number, shared by every client that needs it."""
+        if not self.sent_state:
+            # State is not tracked while nobody is connected, so catch up first
+            self._publish_changes(health_service.get_all_health_status(), complete=True)
+        if self._snapshot_cache is None or self._snapshot_cache[0] != self.sequence:
+            snapshot = {"type": "snapshot", "seq": self.sequence, "data": self.sent_state}
+            self._snapshot_cache = (self.sequence, json.dumps(snapshot))
+            self.snapshot_count += 1
+        return self._snapshot_cache[1]
+
+    async def _run_sender(self, stream: _ClientStream):
+        """Drain one client's queue so a slow client only delays itself."""
+        try:
+            while True:
+                await stream.wakeup.wait()
+                stream.wakeup.clear()
+                while stream.needs_snapshot or stream.queue:
+                    if stream.needs_snapshot:
+                        # Build first: a catch-up delta published meanwhile is already in the snapshot
+                        message = self._snapshot_message()
+                        stream.needs_snapshot = False
+                    else:
+                        message = stream.queue.popleft()
+                    result = await self._safe_send_message(stream.websocket, message)
+                    if result is not True:
+                        self.failed_connections.add(stream.websocket)
+                        self.failed_send_count += 1
+                        self.cleanup_task = asyncio.create_task(self._cleanup_failed_connections())
+                        return
+        except asyncio.CancelledError:
+            pass
     
     async def _safe_send_message(self, connection: WebSocket, message: str):
         """Send message with timeout and error handling."""
@@ -174,6 +260,10 @@ class HighPerformanceWebSocketManager:
             "active_connections": len(self.connections),
             "pending_updates": len(self.pending_updates),
             "total_broadcasts": self.broadcast_count,
+            "sequence": self.sequence,
+            "snapshots_serialised": self.snapshot_count,
+            "queued_messages": sum(len(stream.queue) for stream in self.streams.values()),
+            "coalesced_clients": sum(stream.coalesced_count for stream in self.streams.values()),
             "failed_sends": self.failed_send_count,
             "failed_connections": len(self.failed_connections)
         }
@@ -191,6 +281,23 @@ class HealthMonitoringService:
         
         # Background task management
         self.health_check_task: Optional[asyncio.Task] = None
+        self._health_check_scheduler: Optional[HealthCheckScheduler] = None
+        self._health_check_semaphore: Optional[asyncio.Semaphore] = None
+
+        # Probe HTTP client shared by background and on-demand checks
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_host_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"requests": 0, "connections_opened": 0}
+        )
+
+        # Streamable-http session IDs by MCP endpoint, reused across checks
+        self._mcp_sessions: Dict[str, Tuple[int, str]] = {}
+        self._mcp_session_stats: Dict[str, int] = {"handshakes": 0, "handshakes_avoided": 0, "sessions_rejected": 0}
+
+        # Background tool list refreshes: at most one in flight per service, throttled
+        self._tool_refresh_tasks: Dict[str, asyncio.Task] = {}
+        self._tool_refresh_started: Dict[str, float] = {}
         
         # Performance optimizations
         self._cached_health_data: Dict = {}
@@ -227,6 +334,14 @@ class HealthMonitoringService:
                 
         if close_tasks:
             await asyncio.gather(*close_tasks, return_exceptions=True)
+
+        for stream in list(self.websocket_manager.streams.values()):
+            if stream.sender_task:
+                stream.sender_task.cancel()
+
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
             
         logger.info("Health monitoring service shutdown complete")
         
@@ -242,10 +357,14 @@ class HealthMonitoringService:
         await self.websocket_manager.remove_connection(websocket)
         logger.info(f"WebSocket connection removed: {websocket.client}")
         
+    def request_websocket_snapshot(self, websocket: WebSocket):
+        """Resend the full health status to a client that reported a sequence gap."""
+        self.websocket_manager.request_snapshot(websocket)
+
     async def _send_initial_status(self, websocket: WebSocket):
         """Send initial health status to a newly connected WebSocket client."""
-        # This method is kept for compatibility but delegates to the optimized manager
-        await self.websocket_manager._send_initial_status_optimized(websocket)
+        # This method is kept for compatibility; the client's stream sends the snapshot
+        self.websocket_manager.request_snapshot(websocket)
             
     async def broadcast_health_update(self, service_path: Optional[str] = None):
         """Broadcast health status updates to all connected WebSocket clients."""
@@ -288,14 +407,85 @@ class HealthMonitoringService:
         """Get WebSocket performance statistics."""
         return self.websocket_manager.get_stats()
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Return the long-lived probe client, creating it on first use.
+
+        Keep-alive connections are reused across check cycles instead of paying
+        TCP/TLS setup on every probe. The client is bound to the event loop that
+        first uses it and replaced if that loop changes. Cookies are not kept,
+        so one probe cannot leak a session cookie into the next.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client.is_closed or self._http_client_loop is not loop:
+            self._http_client_loop = loop
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.health_check_timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=settings.health_check_http_max_connections,
+                    max_keepalive_connections=settings.health_check_http_max_keepalive_connections,
+                    keepalive_expiry=settings.health_check_http_keepalive_expiry_seconds,
+                ),
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+                event_hooks={"request": [self._track_http_request]},
+            )
+        return self._http_client
+
+    async def _track_http_request(self, request: httpx.Request) -> None:
+        """Count requests per host and attach a trace hook that counts new connections."""
+        host = request.url.netloc.decode("ascii")
+        host_stats = self._http_host_stats[host]
+        host_stats["requests"] += 1
+
+        async def trace(event_name: str, info: Dict) -> None:
+            # httpcore reports each new TCP connection; requests without one reused the pool
+            if event_name == "connection.connect_tcp.complete":
+                host_stats["connections_opened"] += 1
+
+        request.extensions["trace"] = trace
+
+    def get_http_client_stats(self) -> Dict:
+        """Get per-host connection reuse and MCP session reuse statistics for health probes."""
+        hosts = {}
+        for host, host_stats in sorted(self._http_host_stats.items()):
+            requests = host_stats["requests"]
+            hosts[host] = {
+                **host_stats,
+                "connection_reuse_ratio": (1.0 - host_stats["connections_opened"] / requests) if requests else 0.0,
+            }
+        total_requests = sum(host_stats["requests"] for host_stats in hosts.values())
+        total_connections = sum(host_stats["connections_opened"] for host_stats in hosts.values())
+        return {
+            "requests": total_requests,
+            "connections_opened": total_connections,
+            "connection_reuse_ratio": (1.0 - total_connections / total_requests) if total_requests else 0.0,
+            "hosts": hosts,
+            "mcp_sessions": {**self._mcp_session_stats, "cached": len(self._mcp_sessions)},
+        }
+
+    def _get_health_check_scheduler(self) -> HealthCheckScheduler:
+        """Create the background check scheduler on first use, once settings are final."""
+        if self._health_check_scheduler is None:
+            self._health_check_scheduler = HealthCheckScheduler(
+                interval_seconds=settings.health_check_interval_seconds,
+                min_interval_seconds=settings.health_check_min_interval_seconds,
+                max_interval_seconds=settings.health_check_max_interval_seconds,
+                jitter_ratio=settings.health_check_jitter_ratio,
+            )
+            self._health_check_semaphore = asyncio.Semaphore(max(1, settings.health_check_max_concurrency))
+        return self._health_check_scheduler
+
     async def _run_health_checks(self):
-        """Background task to run periodic health checks."""
-        logger.info("Starting periodic health checks...")
+        """Background task that checks each service when its own check falls due."""
+        logger.info("Starting scheduled health checks...")
         
         while True:
             try:
                 await self._perform_health_checks()
-                await asyncio.sleep(settings.health_check_interval_seconds)
+                # Wake up at least every few seconds to pick up newly enabled services
+                next_due = self._get_health_check_scheduler().seconds_until_next()
+                delay = HEALTH_CHECK_RESYNC_SECONDS if next_due is None else min(next_due, HEALTH_CHECK_RESYNC_SECONDS)
+                await asyncio.sleep(delay)
             except asyncio.CancelledError:
                 logger.info("Health check task cancelled")
                 break
@@ -304,39 +494,43 @@ class HealthMonitoringService:
                 await asyncio.sleep(60)  # Wait a minute before retrying
                 
     async def _perform_health_checks(self):
-        """Perform health checks on all enabled services."""
+        """Perform health checks on the enabled services that are due."""
         from ..services.server_service import server_service
         import httpx
         
+        scheduler = self._get_health_check_scheduler()
         enabled_services = server_service.get_enabled_services()
-        if not enabled_services:
+        server_infos = {}
+        for service_path in enabled_services:
+            server_info = server_service.get_server_info(service_path)
+            if server_info and server_info.get("proxy_pass_url"):
+                server_infos[service_path] = server_info
+        scheduler.sync(server_infos)
+
+        due_services = scheduler.pop_due()
+        if not due_services:
             return
             
         # Only log if there are many services to avoid spam
-        if len(enabled_services) > 1:
-            logger.debug(f"Performing health checks on {len(enabled_services)} enabled services")
+        if len(due_services) > 1:
+            logger.debug(f"Performing health checks on {len(due_services)} of {len(server_infos)} enabled services")
         
         # Track if any status changed to minimize broadcasts
         status_changed = False
         
-        # Perform actual health checks concurrently for better performance
-        async with httpx.AsyncClient(timeout=httpx.Timeout(settings.health_check_timeout_seconds)) as client:
-            # Batch process enabled services
-            check_tasks = []
-            for service_path in enabled_services:
-                server_info = server_service.get_server_info(service_path)
-                if server_info and server_info.get("proxy_pass_url"):
-                    check_tasks.append(self._check_single_service(client, service_path, server_info))
-            
-            # Execute all health checks concurrently
-            if check_tasks:
-                results = await asyncio.gather(*check_tasks, return_exceptions=True)
-                
-                # Check if any status changed
-                for result in results:
-                    if isinstance(result, bool) and result:  # True indicates status changed
-                        status_changed = True
-                        break
+        # Due checks run concurrently, bounded by the global concurrency limit
+        client = self._get_http_client()
+        check_tasks = [
+            self._check_scheduled_service(client, service_path, server_infos[service_path])
+            for service_path in due_services
+        ]
+        results = await asyncio.gather(*check_tasks, return_exceptions=True)
+        
+        # Check if any status changed
+        for result in results:
+            if isinstance(result, bool) and result:  # True indicates status changed
+                status_changed = True
+                break
             
         # Only broadcast if something actually changed
         if status_changed:
@@ -353,6 +547,32 @@ class HealthMonitoringService:
                 logger.info("Nginx configuration regenerated due to health status changes")
             except Exception as e:
                 logger.error(f"Failed to regenerate nginx configuration after health status change: {e}")
+
+    async def _check_scheduled_service(self, client: httpx.AsyncClient, service_path: str, server_info: Dict) -> bool:
+        """Check a service under the concurrency limit and schedule its next check."""
+        previous_status = self.server_health_status.get(service_path, HealthStatus.UNKNOWN)
+        try:
+            async with self._health_check_semaphore:
+                return await self._check_single_service(client, service_path, server_info)
+        finally:
+            self._schedule_next_check(service_path, previous_status)
+
+    def _schedule_next_check(self, service_path: str, previous_status: str) -> None:
+        """Feed a completed check into the scheduler so it picks the next interval."""
+        scheduler = self._health_check_scheduler
+        if scheduler is None:
+            return
+        new_status = self.server_health_status.get(service_path, HealthStatus.UNKNOWN)
+        healthy = HealthStatus.is_healthy(new_status)
+        # Only healthy <-> unhealthy transitions count, so a service flapping
+        # between failure details still backs off
+        state_changed = healthy != HealthStatus.is_healthy(previous_status)
+        delay = scheduler.record_result(service_path, healthy, state_changed)
+        if delay is not None and not healthy:
+            logger.debug(
+                f"Next health check for {service_path} in {delay:.0f}s "
+                f"({scheduler.consecutive_failures(service_path)} consecutive failures)"
+            )
             
     async def _check_single_service(self, client: httpx.AsyncClient, service_path: str, server_info: Dict) -> bool:
         """Check a single service and return True if status changed."""
@@ -392,7 +612,7 @@ class HealthMonitoringService:
                             logger.info(f"Service {service_path} is healthy but has no tools - will fetch tools")
 
                 if should_fetch_tools:
-                    asyncio.create_task(self._update_tools_background(service_path, proxy_pass_url))
+                    self._schedule_tool_refresh(service_path, proxy_pass_url)
             else:
                 new_status = status_detail  # Detailed error message from transport check
                 
@@ -521,6 +741,53 @@ class HealthMonitoringService:
             return None
 
 
+    @staticmethod
+    def _mcp_session_key(headers: Dict[str, str]) -> int:
+        """Fingerprint of the headers a session was negotiated with, e.g. its credentials."""
+        return hash(frozenset((name.lower(), value) for name, value in headers.items() if name.lower() != 'mcp-session-id'))
+
+    async def _ping_with_cached_mcp_session(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        headers: Dict[str, str]
+    ) -> bool:
+        """
+        Ping a streamable-http endpoint on the session cached from an earlier check.
+
+        Returns True if the server answered 200, saving the initialize round trip.
+        On any other outcome, e.g. 404 for an expired session after a restart, the
+        session is dropped and the caller performs the full handshake.
+        """
+        cached = self._mcp_sessions.get(endpoint)
+        if cached is None:
+            return False
+        session_key, session_id = cached
+        if session_key != self._mcp_session_key(headers):
+            # Server headers changed since the session was negotiated
+            del self._mcp_sessions[endpoint]
+            return False
+
+        ping_headers = {**headers, 'Mcp-Session-Id': session_id}
+        ping_payload = '{ "jsonrpc": "2.0", "id": "0", "method": "ping" }'
+        try:
+            response = await client.post(endpoint, headers=ping_headers, content=ping_payload, follow_redirects=True)
+        except Exception as e:
+            logger.debug(f"Ping on cached MCP session failed for {endpoint}: {type(e).__name__} - {e}")
+            response = None
+
+        if response is not None and response.status_code == 200:
+            self._mcp_session_stats["handshakes_avoided"] += 1
+            return True
+
+        logger.info(
+            f"Cached MCP session for {endpoint} rejected "
+            f"({response.status_code if response is not None else 'no response'}), re-initializing"
+        )
+        self._mcp_sessions.pop(endpoint, None)
+        self._mcp_session_stats["sessions_rejected"] += 1
+        return False
+
     async def _try_ping_without_auth(self, client: httpx.AsyncClient, endpoint: str) -> bool:
         """
         Try a simple ping without authentication headers.
@@ -651,8 +918,15 @@ class HealthMonitoringService:
                 endpoint = f"{base_url}/mcp"
 
             try:
+                # A session negotiated by an earlier check answers a plain ping;
+                # anything but 200 falls through to a fresh handshake below
+                if await self._ping_with_cached_mcp_session(client, endpoint, headers):
+                    logger.info(f"Health check succeeded at {endpoint} (reused MCP session)")
+                    return True, HealthStatus.HEALTHY
+
                 # Step 1: Initialize session to get session ID
                 logger.info(f"[TRACE] Initializing MCP session for endpoint: {endpoint}")
+                self._mcp_session_stats["handshakes"] += 1
                 session_id = await self._initialize_mcp_session(client, endpoint, headers)
 
                 # If initialize failed, check if it was due to auth (401/403)
@@ -665,6 +939,7 @@ class HealthMonitoringService:
                         return False, "unhealthy: session initialization failed and ping without auth failed"
 
                 # Step 2: Add session ID to headers for ping
+                session_key = self._mcp_session_key(headers)
                 headers['Mcp-Session-Id'] = session_id
                 ping_payload = '{ "jsonrpc": "2.0", "id": "0", "method": "ping" }'
 
@@ -672,6 +947,8 @@ class HealthMonitoringService:
                 logger.info(f"[TRACE] Headers being sent: {headers}")
                 response = await client.post(endpoint, headers=headers, content=ping_payload, follow_redirects=True)
                 logger.info(f"[TRACE] Response status: {response.status_code}")
+                if response.status_code == 200:
+                    self._mcp_sessions[endpoint] = (session_key, session_id)
 
                 # Check for auth failures first
                 if response.status_code in [401, 403]:
@@ -882,6 +1159,40 @@ class HealthMonitoringService:
         return False
 
         
+    def _schedule_tool_refresh(self, service_path: str, proxy_pass_url: str) -> bool:
+        """
+        Start a background tool list refresh unless one is running or ran recently.
+
+        Returns True if a refresh was started.
+        """
+        running = self._tool_refresh_tasks.get(service_path)
+        if running is not None and not running.done():
+            logger.debug(f"Tool refresh for {service_path} already in flight, not starting another")
+            return False
+
+        last_started = self._tool_refresh_started.get(service_path)
+        min_interval = settings.health_check_tool_refresh_min_interval_seconds
+        if last_started is not None and monotonic() - last_started < min_interval:
+            logger.debug(f"Tool refresh for {service_path} ran less than {min_interval}s ago, skipping")
+            return False
+
+        self._tool_refresh_started[service_path] = monotonic()
+        task = asyncio.create_task(self._update_tools_background(service_path, proxy_pass_url))
+        self._tool_refresh_tasks[service_path] = task
+
+        def forget(done: asyncio.Task) -> None:
+            if self._tool_refresh_tasks.get(service_path) is done:
+                del self._tool_refresh_tasks[service_path]
+
+        task.add_done_callback(forget)
+        return True
+
+    @staticmethod
+    def _hash_tool_list(tool_list: Optional[list]) -> str:
+        """Stable hash of a tool list, independent of key order within each tool."""
+        encoded = json.dumps(tool_list or [], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
     async def _update_tools_background(self, service_path: str, proxy_pass_url: str):
         """Update tool list in the background without blocking health checks."""
         try:
@@ -904,28 +1215,35 @@ class HealthMonitoringService:
                 new_tool_count = len(tool_list)
                 current_server_info = server_service.get_server_info(service_path)
                 if current_server_info:
-                    current_tool_count = current_server_info.get("num_tools", 0)
+                    current_tool_list = current_server_info.get("tool_list") or []
+
+                    # Skip the file write, re-embedding and scopes update when nothing changed
+                    if (
+                        self._hash_tool_list(tool_list) == self._hash_tool_list(current_tool_list)
+                        and current_server_info.get("num_tools", 0) == new_tool_count
+                    ):
+                        logger.info(f"Tool list for {service_path} unchanged ({new_tool_count} tools)")
+                        return
+
+                    updated_server_info = current_server_info.copy()
+                    updated_server_info["tool_list"] = tool_list
+                    updated_server_info["num_tools"] = new_tool_count
                     
-                    # Update if count changed OR if we have no tool details yet
-                    current_tool_list = current_server_info.get("tool_list", [])
-                    if current_tool_count != new_tool_count or not current_tool_list:
-                        updated_server_info = current_server_info.copy()
-                        updated_server_info["tool_list"] = tool_list
-                        updated_server_info["num_tools"] = new_tool_count
-                        
-                        server_service.update_server(service_path, updated_server_info)
+                    server_service.update_server(service_path, updated_server_info)
 
-                        # Update scopes.yml with newly discovered tools
+                    # Scopes only list tool names, so descriptions changing does not touch scopes.yml
+                    tool_names = [tool["name"] for tool in tool_list if "name" in tool]
+                    current_tool_names = [tool["name"] for tool in current_tool_list if isinstance(tool, dict) and "name" in tool]
+                    if set(tool_names) != set(current_tool_names):
                         try:
                             from ..utils.scopes_manager import update_server_scopes
-                            tool_names = [tool["name"] for tool in tool_list if "name" in tool]
                             await update_server_scopes(service_path, current_server_info.get("server_name", "Unknown"), tool_names)
                             logger.info(f"Updated scopes for {service_path} with {len(tool_names)} discovered tools")
                         except Exception as e:
                             logger.error(f"Failed to update scopes for {service_path} after tool discovery: {e}")
 
-                        # Broadcast only this specific service update
-                        await self.broadcast_health_update(service_path)
+                    # Broadcast only this specific service update
+                    await self.broadcast_health_update(service_path)
                         
         except Exception as e:
             logger.warning(f"Failed to fetch tools for {service_path}: {e}")
@@ -969,28 +1287,28 @@ class HealthMonitoringService:
         self.server_health_status[service_path] = HealthStatus.CHECKING
 
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(settings.health_check_timeout_seconds)) as client:
-                # Use transport-aware endpoint checking
-                is_healthy, status_detail = await self._check_server_endpoint_transport_aware(client, proxy_pass_url, server_info)
+            client = self._get_http_client()
+            # Use transport-aware endpoint checking
+            is_healthy, status_detail = await self._check_server_endpoint_transport_aware(client, proxy_pass_url, server_info)
+            
+            if is_healthy:
+                current_status = status_detail  # Could be "healthy" or "healthy-auth-expired"
+                logger.info(f"Health check successful for {service_path} ({proxy_pass_url}): {status_detail}")
                 
-                if is_healthy:
-                    current_status = status_detail  # Could be "healthy" or "healthy-auth-expired"
-                    logger.info(f"Health check successful for {service_path} ({proxy_pass_url}): {status_detail}")
-                    
-                    # Schedule tool list fetch in background only for fully healthy status
-                    logger.info(f"DEBUG: Health check status for {service_path}: status_detail='{status_detail}' (type: {type(status_detail)}) vs HealthStatus.HEALTHY='{HealthStatus.HEALTHY}' (type: {type(HealthStatus.HEALTHY)})")
-                    if status_detail == HealthStatus.HEALTHY:
-                        logger.info(f"DEBUG: Status detail matches HealthStatus.HEALTHY, triggering background tool update for {service_path}")
-                        asyncio.create_task(self._update_tools_background(service_path, proxy_pass_url))
-                    elif status_detail == HealthStatus.HEALTHY_AUTH_EXPIRED:
-                        logger.warning(f"Auth token expired for {service_path} but server is reachable")
-                    else:
-                        logger.info(f"DEBUG: Status detail '{status_detail}' does not match HealthStatus.HEALTHY, NOT triggering background tool update")
-                        
+                # Schedule tool list fetch in background only for fully healthy status
+                logger.info(f"DEBUG: Health check status for {service_path}: status_detail='{status_detail}' (type: {type(status_detail)}) vs HealthStatus.HEALTHY='{HealthStatus.HEALTHY}' (type: {type(HealthStatus.HEALTHY)})")
+                if status_detail == HealthStatus.HEALTHY:
+                    logger.info(f"DEBUG: Status detail matches HealthStatus.HEALTHY, triggering background tool update for {service_path}")
+                    self._schedule_tool_refresh(service_path, proxy_pass_url)
+                elif status_detail == HealthStatus.HEALTHY_AUTH_EXPIRED:
+                    logger.warning(f"Auth token expired for {service_path} but server is reachable")
                 else:
-                    current_status = status_detail  # Detailed error from transport check
-                    logger.info(f"Health check failed for {service_path} ({proxy_pass_url}): {status_detail}")
+                    logger.info(f"DEBUG: Status detail '{status_detail}' does not match HealthStatus.HEALTHY, NOT triggering background tool update")
                     
+            else:
+                current_status = status_detail  # Detailed error from transport check
+                logger.info(f"Health check failed for {service_path} ({proxy_pass_url}): {status_detail}")
+                
         except httpx.TimeoutException:
             current_status = "unhealthy: timeout"
             logger.info(f"Health check timeout for {service_path}")
@@ -1005,6 +1323,11 @@ class HealthMonitoringService:
         self.server_health_status[service_path] = current_status
         logger.info(f"Final health status for {service_path}: {current_status}")
 
+        # Restart the background schedule from this result, e.g. to end a backoff
+        scheduler = self._health_check_scheduler
+        if scheduler is not None and service_path in scheduler and not scheduler.is_in_flight(service_path):
+            self._schedule_next_check(service_path, previous_status)
+
         # Regenerate nginx configuration if status changed
         if previous_status != current_status:
             try:
@@ -89,6 +89,20 @@ logger = logging.getLogger(__name__)
 logger.info(f"Logging configured. Writing to file: {log_file_path}")
 
 
+def _collect_entities_to_index() -> list:
+    """Build (path, info, entity_type, is_enabled) tuples for every server and agent."""
+    entities_to_index = [
+        (service_path, server_info, "mcp_server", server_service.is_service_enabled(service_path))
+        for service_path, server_info in server_service.get_all_servers().items()
+    ]
+    entities_to_index.extend(
+        (agent_card.path, agent_card, "a2a_agent", agent_service.is_agent_enabled(agent_card.path))
+        for agent_card in agent_service.list_agents()
+    )
+    logger.info(f"📊 Updating FAISS index with {len(entities_to_index)} services and agents...")
+    return entities_to_index
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application startup and shutdown lifecycle management."""
@@ -99,35 +113,12 @@ async def lifespan(app: FastAPI):
         logger.info("📚 Loading server definitions and state...")
         server_service.load_servers_and_state()
         
-        logger.info("🔍 Initializing FAISS search service...")
-        await faiss_service.initialize()
-        
-        logger.info("📊 Updating FAISS index with all registered services...")
-        all_servers = server_service.get_all_servers()
-        for service_path, server_info in all_servers.items():
-            is_enabled = server_service.is_service_enabled(service_path)
-            try:
-                await faiss_service.add_or_update_service(service_path, server_info, is_enabled)
-                logger.debug(f"Updated FAISS index for service: {service_path}")
-            except Exception as e:
-                logger.error(f"Failed to update FAISS index for service {service_path}: {e}", exc_info=True)
-        
-        logger.info(f"✅ FAISS index updated with {len(all_servers)} services")
-
         logger.info("📋 Loading agent cards and state...")
         agent_service.load_agents_and_state()
 
-        logger.info("📊 Updating FAISS index with all registered agents...")
-        all_agents = agent_service.list_agents()
-        for agent_card in all_agents:
-            is_enabled = agent_service.is_agent_enabled(agent_card.path)
-            try:
-                await faiss_service.add_or_update_agent(agent_card.path, agent_card)
-                logger.debug(f"Updated FAISS index for agent: {agent_card.path}")
-            except Exception as e:
-                logger.error(f"Failed to update FAISS index for agent {agent_card.path}: {e}", exc_info=True)
-
-        logger.info(f"✅ FAISS index updated with {len(all_agents)} agents")
+        # Model loading and re-indexing run in the background; search returns 503 until ready
+        logger.info("🔍 Warming up FAISS search service in the background...")
+        faiss_service.start_background_initialization(_collect_entities_to_index)
 
         logger.info("🏥 Initializing health monitoring service...")
         await health_service.initialize()
@@ -175,6 +166,7 @@ async def lifespan(app: FastAPI):
     try:
         # Shutdown services gracefully
         await health_service.shutdown()
+        await faiss_service.shutdown()
         logger.info("✅ Shutdown completed successfully!")
     except Exception as e:
         logger.error(f"❌ Error during shutdown: {e}", exc_info=True)
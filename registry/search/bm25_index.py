@@ -0,0 +1,158 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import (
+    Container,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase terms for lexical matching.
+
+    Identifiers such as ``get_stock_aggregates`` are kept whole and also split
+    into their parts, so both the exact name and its words match.
+    """
+    terms: List[str] = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        parts = [part for part in token.split("_") if part]
+        if not parts:
+            continue
+        if len(parts) > 1:
+            terms.append("_".join(parts))
+        terms.extend(parts)
+    return terms
+
+
+class BM25Index:
+    """
+    In-memory inverted index with Okapi BM25 scoring.
+
+    Documents are added, replaced and removed incrementally; document
+    frequencies and the average length are kept up to date, so no rebuild is
+    needed. The index is only touched from the event loop, so it needs no locking.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        self._doc_terms: Dict[Hashable, Counter] = {}
+        self._doc_lengths: Dict[Hashable, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._doc_terms
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_lengths.clear()
+        self._total_length = 0
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index text under key, replacing any previous document for that key."""
+        self.remove(key)
+        terms = tokenize(text)
+        if not terms:
+            return
+        counts = Counter(terms)
+        self._doc_terms[key] = counts
+        self._doc_lengths[key] = len(terms)
+        self._total_length += len(terms)
+        for term, frequency in counts.items():
+            self._postings.setdefault(term, {})[key] = frequency
+
+    def remove(self, key: Hashable) -> None:
+        """Drop the document for key if it is indexed."""
+        counts = self._doc_terms.pop(key, None)
+        if counts is None:
+            return
+        self._total_length -= self._doc_lengths.pop(key)
+        for term in counts:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        allowed: Optional[Container[Hashable]] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Return up to k (key, score) pairs with a positive BM25 score, best first.
+
+        When allowed is given, only those keys are scored, so filtering does not
+        eat into the k results.
+        """
+        num_docs = len(self._doc_terms)
+        if num_docs == 0 or k <= 0:
+            return []
+
+        avg_length = self._total_length / num_docs
+        scores: Dict[Hashable, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            doc_freq = len(postings)
+            idf = math.log(1.0 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            for key, frequency in postings.items():
+                if allowed is not None and key not in allowed:
+                    continue
+                length_norm = 1.0 - self.b + self.b * self._doc_lengths[key] / avg_length
+                scores[key] = scores.get(key, 0.0) + idf * (
+                    frequency * (self.k1 + 1.0) / (frequency + self.k1 * length_norm)
+                )
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = 60,
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse ranked key lists with reciprocal rank fusion.
+
+    Each key scores sum(1 / (k + rank)) over the lists it appears in (rank
+    starts at 1). Scores are divided by the best attainable score, so a key
+    ranked first in every non-empty list scores 1.0.
+
+    Returns:
+        (key, score) pairs, best first
+    """
+    non_empty = [ranking for ranking in rankings if ranking]
+    if not non_empty:
+        return []
+
+    scores: Dict[Hashable, float] = {}
+    for ranking in non_empty:
+        seen = set()
+        for rank, key in enumerate(ranking, start=1):
+            if key in seen:
+                continue
+            seen.add(key)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+
+    best_attainable = len(non_empty) / (k + 1)
+    fused = [(key, score / best_attainable) for key, score in scores.items()]
+    fused.sort(key=lambda item: item[1], reverse=True)
+    return fused
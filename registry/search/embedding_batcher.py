@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce concurrent encode requests into batched encoder calls.
+
+    Callers await encode(texts). A background worker waits up to max_wait_ms
+    after the first pending request, or until max_batch_size texts are queued,
+    then runs one encode call on a worker thread and splits the result back to
+    each caller. Requests larger than max_batch_size are encoded on their own.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], Any],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.max_batch_texts = 0
+        self.total_queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts as part of the next batch and return their (n, d) embeddings."""
+        if not texts:
+            raise ValueError("encode() requires at least one text")
+
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((list(texts), future, time.monotonic()))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._loop is loop:
+            return
+        # First use, or the previous loop has gone away (e.g. between test event loops)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            batch = [first]
+            batch_texts = len(first[0])
+            deadline = time.monotonic() + self.max_wait_seconds
+
+            while batch_texts < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if batch_texts + len(item[0]) > self.max_batch_size:
+                    # Keep the oversized request for the next batch
+                    await self._dispatch(batch)
+                    batch, batch_texts = [item], len(item[0])
+                    deadline = time.monotonic() + self.max_wait_seconds
+                    continue
+                batch.append(item)
+                batch_texts += len(item[0])
+
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[List[str], asyncio.Future, float]]) -> None:
+        started = time.monotonic()
+        all_texts: List[str] = []
+        for texts, _, enqueued_at in batch:
+            all_texts.extend(texts)
+            wait = started - enqueued_at
+            self.total_queue_wait_seconds += wait
+            self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, wait)
+
+        self.batches += 1
+        self.requests += len(batch)
+        self.texts += len(all_texts)
+        self.max_batch_texts = max(self.max_batch_texts, len(all_texts))
+
+        try:
+            embeddings = np.asarray(
+                await asyncio.to_thread(self._encode_fn, all_texts), dtype=np.float32
+            )
+        except Exception as e:
+            logger.error(f"Batched encode of {len(all_texts)} text(s) failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for texts, future, _ in batch:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(texts)])
+            offset += len(texts)
+
+    async def close(self) -> None:
+        """Stop the background worker."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch size and queue wait metrics."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "avg_batch_size": (self.texts / self.batches) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_texts,
+            "avg_queue_wait_ms": (
+                self.total_queue_wait_seconds / self.requests * 1000.0 if self.requests else 0.0
+            ),
+            "max_queue_wait_ms": self.max_queue_wait_seconds * 1000.0,
+        }
@@ -0,0 +1,198 @@
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type
+)
+
+import numpy as np
+
+
+# Layout: header | ID table sorted by FAISS ID | records
+# Each record is a uint32 path length, the UTF-8 path, then the entry as compact JSON.
+METADATA_FILE_MAGIC = b"MCPGWMD1"
+_HEADER = struct.Struct("<8sQ")  # magic, record count
+_PATH_LENGTH = struct.Struct("<I")
+_ID_TABLE_DTYPE = np.dtype([("id", "<i8"), ("offset", "<u8"), ("length", "<u8")])
+
+
+def write_metadata_file(
+    path: Path,
+    metadata: Dict[str, Dict[str, Any]],
+    json_encoder: Optional[Type[json.JSONEncoder]] = None,
+) -> None:
+    """
+    Write the entity metadata store in the memory-mappable binary format.
+
+    Readers map the file and decode only the records they look up, so a reload
+    costs a new mapping rather than parsing the whole store.
+    """
+    records = []
+    for entity_path, entry in metadata.items():
+        if not isinstance(entry, dict) or entry.get("id") is None:
+            continue
+        path_bytes = entity_path.encode("utf-8")
+        body = json.dumps(entry, separators=(",", ":"), cls=json_encoder).encode("utf-8")
+        records.append((int(entry["id"]), _PATH_LENGTH.pack(len(path_bytes)) + path_bytes + body))
+    records.sort(key=lambda record: record[0])
+
+    table = np.zeros(len(records), dtype=_ID_TABLE_DTYPE)
+    offset = _HEADER.size + table.nbytes
+    for row, (faiss_id, record) in enumerate(records):
+        table[row] = (faiss_id, offset, len(record))
+        offset += len(record)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(METADATA_FILE_MAGIC, len(records)))
+        f.write(table.tobytes())
+        for _, record in records:
+            f.write(record)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class MappedMetadata(Mapping):
+    """
+    Read-only, memory-mapped view of a metadata file, keyed by entity path.
+
+    Processes mapping the same file share its page cache. Entries are decoded on
+    first access and cached for the lifetime of the mapping.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != METADATA_FILE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a metadata file")
+        self._table = np.frombuffer(self._mmap, dtype=_ID_TABLE_DTYPE, count=count, offset=_HEADER.size)
+        self._rows_by_path: Dict[str, int] = {}
+        for row in range(count):
+            self._rows_by_path[self._read_path(row)[0]] = row
+        self._decoded: Dict[int, Dict[str, Any]] = {}
+
+    def _read_path(self, row: int) -> Tuple[str, int]:
+        """Return the path of a record and the offset where its JSON body starts."""
+        offset = int(self._table[row]["offset"])
+        (path_length,) = _PATH_LENGTH.unpack_from(self._mmap, offset)
+        start = offset + _PATH_LENGTH.size
+        return self._mmap[start:start + path_length].decode("utf-8"), start + path_length
+
+    def _entry(self, row: int) -> Dict[str, Any]:
+        entry = self._decoded.get(row)
+        if entry is None:
+            _, body_start = self._read_path(row)
+            end = int(self._table[row]["offset"]) + int(self._table[row]["length"])
+            entry = json.loads(self._mmap[body_start:end])
+            self._decoded[row] = entry
+        return entry
+
+    def path_for_id(self, faiss_id: int) -> Optional[str]:
+        """Resolve a FAISS ID with a binary search over the ID table."""
+        ids = self._table["id"]
+        row = int(np.searchsorted(ids, faiss_id))
+        if row < len(ids) and ids[row] == faiss_id:
+            return self._read_path(row)[0]
+        return None
+
+    def __getitem__(self, path: str) -> Dict[str, Any]:
+        return self._entry(self._rows_by_path[path])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows_by_path)
+
+    def __len__(self) -> int:
+        return len(self._rows_by_path)
+
+
+# Layout: header | keys as compact JSON | padding | float32 matrix, one row per tool.
+# Keys are [server_path, tool_name, text_hash]; rows are L2-normalised so a dot
+# product with a normalised query is the cosine similarity.
+TOOL_VECTORS_FILE_MAGIC = b"MCPGWTV1"
+_TOOL_VECTORS_HEADER = struct.Struct("<8sQIQ")  # magic, row count, dimension, keys length
+_TOOL_VECTORS_ALIGNMENT = 64
+
+
+def _tool_vectors_offset(keys_length: int) -> int:
+    end = _TOOL_VECTORS_HEADER.size + keys_length
+    return -(-end // _TOOL_VECTORS_ALIGNMENT) * _TOOL_VECTORS_ALIGNMENT
+
+
+def write_tool_vectors_file(
+    path: Path,
+    keys: List[Tuple[str, str, str]],
+    vectors: np.ndarray,
+) -> None:
+    """
+    Write per-tool embeddings in the memory-mappable binary format.
+
+    Args:
+        keys: (server_path, tool_name, text_hash) for each row of vectors
+        vectors: float32 matrix of shape (len(keys), dimension)
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1.0)
+    keys_bytes = json.dumps([list(key) for key in keys], separators=(",", ":")).encode("utf-8")
+    matrix_offset = _tool_vectors_offset(len(keys_bytes))
+
+    with open(path, "wb") as f:
+        f.write(_TOOL_VECTORS_HEADER.pack(TOOL_VECTORS_FILE_MAGIC, len(keys), vectors.shape[1], len(keys_bytes)))
+        f.write(keys_bytes)
+        f.write(b"\0" * (matrix_offset - _TOOL_VECTORS_HEADER.size - len(keys_bytes)))
+        f.write(vectors.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class MappedToolVectors:
+    """
+    Read-only, memory-mapped view of a tool vectors file.
+
+    vectors is a (rows, dimension) float32 array backed by the mapping; rows are
+    looked up by server path, tool name and the hash of the text they embed.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, dimension, keys_length = _TOOL_VECTORS_HEADER.unpack_from(self._mmap, 0)
+        if magic != TOOL_VECTORS_FILE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a tool vectors file")
+        keys_start = _TOOL_VECTORS_HEADER.size
+        keys = json.loads(self._mmap[keys_start:keys_start + keys_length])
+        self._rows: Dict[Tuple[str, str], Tuple[int, str]] = {
+            (server_path, tool_name): (row, text_hash)
+            for row, (server_path, tool_name, text_hash) in enumerate(keys)
+        }
+        self.vectors = np.frombuffer(
+            self._mmap,
+            dtype=np.float32,
+            count=count * dimension,
+            offset=_tool_vectors_offset(keys_length),
+        ).reshape(count, dimension)
+
+    @property
+    def dimension(self) -> int:
+        return self.vectors.shape[1]
+
+    def row_for(self, server_path: str, tool_name: str, text_hash: Optional[str] = None) -> Optional[int]:
+        """Return the row for a tool, or None if it is missing or was embedded from other text."""
+        found = self._rows.get((server_path, tool_name))
+        if found is None or (text_hash is not None and found[1] != text_hash):
+            return None
+        return found[0]
+
+    def __len__(self) -> int:
+        return len(self._rows)
@@ -0,0 +1,70 @@
+import logging
+from pathlib import Path
+from typing import Optional
+
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+ONNX_QUANTIZATION_CONFIGS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+
+def quantized_model_file(quantization: str) -> str:
+    """Relative path sentence-transformers uses for a dynamically quantised ONNX export."""
+    return f"onnx/model_qint8_{quantization}.onnx"
+
+
+def load_onnx_sentence_transformer(
+    model_name_or_path: str,
+    quantization: str = "avx2",
+    export_dir: Optional[Path] = None,
+) -> SentenceTransformer:
+    """
+    Load a SentenceTransformer that runs on ONNX Runtime, int8-quantised by default.
+
+    The quantised model is exported once with dynamic (weight-only) int8 quantisation
+    and stored next to the model: inside model_name_or_path when that is a local
+    directory, otherwise in export_dir. Later loads reuse the exported file.
+    Requires the optional ``sentence-transformers[onnx]`` extras.
+
+    Args:
+        model_name_or_path: Local model directory or Hugging Face model name
+        quantization: One of ONNX_QUANTIZATION_CONFIGS, or empty for an fp32 ONNX model
+        export_dir: Where to keep the exported model when the source is not local
+
+    Raises:
+        ValueError: If the quantization config is not supported
+        ImportError: If ONNX Runtime / Optimum are not installed
+    """
+    if not quantization:
+        logger.info(f"Loading fp32 ONNX embedding model for {model_name_or_path}")
+        return SentenceTransformer(model_name_or_path, backend="onnx")
+
+    quantization = quantization.lower()
+    if quantization not in ONNX_QUANTIZATION_CONFIGS:
+        raise ValueError(
+            f"Unsupported ONNX quantization '{quantization}'. "
+            f"Expected one of {', '.join(ONNX_QUANTIZATION_CONFIGS)}."
+        )
+
+    file_name = quantized_model_file(quantization)
+    source_dir = Path(model_name_or_path)
+    target_dir = source_dir if source_dir.is_dir() else export_dir
+
+    if target_dir is not None and (target_dir / file_name).exists():
+        logger.info(f"Loading int8 ONNX embedding model from {target_dir / file_name}")
+        return SentenceTransformer(str(target_dir), backend="onnx", model_kwargs={"file_name": file_name})
+
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    # Exporting to ONNX happens on load when no ONNX file exists yet
+    model = SentenceTransformer(model_name_or_path, backend="onnx")
+    if target_dir is None:
+        logger.warning("No export directory for the quantised ONNX model. Using fp32 ONNX.")
+        return model
+
+    if target_dir != source_dir:
+        model.save(str(target_dir))
+    logger.info(f"Quantising ONNX embedding model ({quantization}) into {target_dir}")
+    export_dynamic_quantized_onnx_model(model, quantization, str(target_dir))
+    return SentenceTransformer(str(target_dir), backend="onnx", model_kwargs={"file_name": file_name})
@@ -0,0 +1,101 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple
+)
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU cache of query embeddings with a per-entry TTL.
+
+    Keys are normalised query strings. Case is only folded when fold_case is set,
+    i.e. when the loaded model lowercases its input anyway; a cased model embeds
+    "AWS" and "aws" differently. The cache is only touched from the event loop, so
+    it needs no locking.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, fold_case: bool = False):
+        self.max_size = max(0, max_size)
+        self.ttl_seconds = ttl_seconds
+        self.fold_case = fold_case
+        self._entries: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def normalize_query(self, query: str) -> str:
+        """Collapse whitespace, and case if the model is uncased."""
+        if self.fold_case:
+            query = query.lower()
+        return " ".join(query.split())
+
+    def get(self, query: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for a query, or None on a miss or expiry."""
+        if not self.enabled:
+            return None
+
+        key = self.normalize_query(query)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, embedding = entry
+        if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return embedding
+
+    def put(self, query: str, embedding: np.ndarray) -> None:
+        """Store an embedding, evicting the least recently used entry when full."""
+        if not self.enabled:
+            return
+
+        key = self.normalize_query(query)
+        # Cached arrays are shared between callers, so keep them read-only
+        stored = np.array(embedding, dtype=np.float32)
+        stored.flags.writeable = False
+        self._entries[key] = (time.monotonic(), stored)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries, e.g. after the embedding model changes. Counters are kept."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy for sizing the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
@@ -1,14 +1,19 @@
 import json
 import asyncio
+import hashlib
 import logging
+import os
+import time
 from datetime import datetime
 import re
 from pathlib import Path
 from typing import (
+    Callable,
     Dict,
     Any,
     Optional,
     List,
+    Set,
     Tuple
 )
 
@@ -20,9 +25,33 @@ from pydantic import HttpUrl
 from ..core.config import settings
 from ..core.schemas import ServerInfo
 from ..schemas.agent_models import AgentCard
+from .bm25_index import BM25Index, reciprocal_rank_fusion
+from .embedding_batcher import EmbeddingBatcher
+from .metadata_file import write_metadata_file, write_tool_vectors_file
+from .onnx_backend import load_onnx_sentence_transformer
+from .query_cache import QueryEmbeddingCache
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+# An IVF-PQ index falls back to flat only below this share of faiss_ivf_min_train_size,
+# so churn around the threshold does not retrain on every compaction
+IVFPQ_FALLBACK_RATIO = 0.8
+
+# FaissService.state values
+SEARCH_STATE_COLD = "cold"
+SEARCH_STATE_WARMING = "warming"
+SEARCH_STATE_READY = "ready"
+SEARCH_STATE_FAILED = "failed"
+
+
+# (entity_type, path, name) -> whether the caller may see the entity
+AccessFilter = Callable[[str, str, str], bool]
+
+
+class SearchWarmingError(RuntimeError):
+    """Raised by searches while the embedding model and index are still loading."""
+
 
 class _PydanticAwareJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder that handles Pydantic and standard types."""
@@ -44,14 +73,331 @@ class FaissService:
     
     def __init__(self):
         self.embedding_model: Optional[SentenceTransformer] = None
-        self.faiss_index: Optional[faiss.IndexIDMap] = None
+        self.faiss_index: Optional[faiss.Index] = None
+        self.index_type: str = "flat"
+        self.state: str = SEARCH_STATE_COLD
+        self._warmup_task: Optional[asyncio.Task] = None
+        # Removals requested before the index was loaded, applied once it is
+        self._pending_removals: Set[str] = set()
+        # Reverse maps from FAISS ID, kept in step with the metadata stores
+        self._id_to_path: Dict[int, str] = {}
+        self._tool_id_to_key: Dict[int, Tuple[str, str]] = {}
+        # BM25 keyword indexes over entities (by path) and tools (by (server_path, tool_name)),
+        # kept in step with the metadata store and fused with vector results at query time
+        self.lexical_index = BM25Index()
+        self.tool_lexical_index = BM25Index()
+        self._lexical_tool_names: Dict[str, List[str]] = {}
+        # Paths by entity type and enabled paths, so unfiltered searches skip the store scan
+        self._paths_by_type: Dict[str, Set[str]] = {}
+        self._enabled_paths: Set[str] = set()
         self.metadata_store: Dict[str, Dict[str, Any]] = {}
         self.next_id_counter: int = 0
+        # One vector per (server_path, tool_name): {server_path: {tool_name: {id, text_hash}}}
+        self.tool_index: Optional[faiss.Index] = None
+        self.tool_index_type: str = "flat"
+        self.tool_metadata_store: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.next_tool_id_counter: int = 0
+        self._compaction_task: Optional[asyncio.Task] = None
+        # Serialises index mutations, so compaction cannot renumber IDs under an update
+        self._index_lock = asyncio.Lock()
+        # Write-ahead log of metadata changes since the last snapshot
+        self._wal_lock = asyncio.Lock()
+        self._wal_seq: int = 0
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._last_change_at: float = 0.0
+        self._snapshot_deadline: Optional[float] = None
+        self.query_cache = QueryEmbeddingCache(
+            max_size=settings.search_query_cache_size,
+            ttl_seconds=settings.search_query_cache_ttl_seconds,
+        )
+        self.embedding_batcher = EmbeddingBatcher(
+            self._encode_texts,
+            max_batch_size=settings.embeddings_query_batch_max_size,
+            max_wait_ms=settings.embeddings_query_batch_max_wait_ms,
+        )
         
+    @property
+    def metadata_store(self) -> Dict[str, Dict[str, Any]]:
+        return self._metadata_store
+
+    @metadata_store.setter
+    def metadata_store(self, store: Dict[str, Dict[str, Any]]) -> None:
+        self._metadata_store = store
+        self._build_id_to_path()
+        self._build_lexical_indexes()
+        self._build_filter_sets()
+
+    @property
+    def tool_metadata_store(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return self._tool_metadata_store
+
+    @tool_metadata_store.setter
+    def tool_metadata_store(self, store: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        self._tool_metadata_store = store
+        self._build_tool_id_to_key()
+
+    def _build_id_to_path(self) -> None:
+        self._id_to_path = {
+            entry.get("id"): path
+            for path, entry in self._metadata_store.items()
+            if isinstance(entry, dict)
+        }
+
+    def _build_tool_id_to_key(self) -> None:
+        self._tool_id_to_key = {
+            entry.get("id"): (server_path, tool_name)
+            for server_path, tools in self._tool_metadata_store.items()
+            for tool_name, entry in tools.items()
+        }
+
+    def _build_filter_sets(self) -> None:
+        self._paths_by_type = {}
+        self._enabled_paths = set()
+        for path, entry in self._metadata_store.items():
+            if isinstance(entry, dict):
+                self._index_filters(path, entry)
+
+    def _ensure_filter_sets(self) -> None:
+        if sum(len(paths) for paths in self._paths_by_type.values()) != len(self._metadata_store):
+            # The store was modified without going through _set_entry/_pop_entry
+            logger.debug("Entity type and enabled sets out of step with metadata store. Rebuilding.")
+            self._build_filter_sets()
+
+    @staticmethod
+    def _entry_identity(entry: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str]:
+        """Return (entity_type, server info or agent card, name) for a metadata entry."""
+        entity_type = entry.get("entity_type", "mcp_server")
+        if entity_type == "a2a_agent":
+            info = entry.get("full_agent_card") or {}
+            return entity_type, info, info.get("name", "")
+        info = entry.get("full_server_info") or {}
+        return entity_type, info, info.get("server_name", "")
+
+    def _index_filters(self, path: str, entry: Dict[str, Any]) -> None:
+        entity_type, info, _ = self._entry_identity(entry)
+        self._paths_by_type.setdefault(entity_type, set()).add(path)
+        if info.get("is_enabled", False):
+            self._enabled_paths.add(path)
+
+    def _unindex_filters(self, path: str, entry: Dict[str, Any]) -> None:
+        entity_type, _, _ = self._entry_identity(entry)
+        paths = self._paths_by_type.get(entity_type)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del self._paths_by_type[entity_type]
+        self._enabled_paths.discard(path)
+
+    def _build_lexical_indexes(self) -> None:
+        self.lexical_index.clear()
+        self.tool_lexical_index.clear()
+        self._lexical_tool_names = {}
+        for path, entry in self._metadata_store.items():
+            if isinstance(entry, dict):
+                self._index_lexical(path, entry)
+
+    def _ensure_lexical_indexes(self) -> None:
+        if len(self._lexical_tool_names) != len(self._metadata_store):
+            # The store was modified without going through _set_entry/_pop_entry
+            logger.debug("BM25 indexes out of step with metadata store. Rebuilding.")
+            self._build_lexical_indexes()
+
+    def _index_lexical(self, path: str, entry: Dict[str, Any]) -> None:
+        """Add an entity and the tools it lists to the BM25 indexes."""
+        self.lexical_index.add(path, entry.get("text_for_embedding", ""))
+        tool_names: List[str] = []
+        server_info = entry.get("full_server_info") or {}
+        for tool in server_info.get("tool_list") or []:
+            tool_name = tool.get("name")
+            if not tool_name:
+                continue
+            parsed_description = tool.get("parsed_description", {}) or {}
+            tool_desc = parsed_description.get("main") or tool.get("description") or ""
+            self.tool_lexical_index.add(
+                (path, tool_name),
+                f"{tool_name} {tool_desc} {parsed_description.get('args', '')}",
+            )
+            tool_names.append(tool_name)
+        self._lexical_tool_names[path] = tool_names
+
+    def _unindex_lexical(self, path: str) -> None:
+        self.lexical_index.remove(path)
+        for tool_name in self._lexical_tool_names.pop(path, []):
+            self.tool_lexical_index.remove((path, tool_name))
+
+    def _path_for_id(self, faiss_id: int) -> Optional[str]:
+        """Resolve a FAISS ID to its entity path through the reverse map."""
+        path = self._id_to_path.get(faiss_id)
+        if path is not None and self._metadata_store.get(path, {}).get("id") == faiss_id:
+            return path
+        if len(self._id_to_path) != len(self._metadata_store):
+            # The store was modified without going through _set_entry/_pop_entry
+            logger.debug("FAISS reverse ID map out of step with metadata store. Rebuilding.")
+            self._build_id_to_path()
+            return self._id_to_path.get(faiss_id)
+        return None
+
+    def _set_entry(self, path: str, entry: Dict[str, Any]) -> None:
+        """Store a metadata entry and its reverse mapping together."""
+        self._pop_entry(path)
+        self._metadata_store[path] = entry
+        self._id_to_path[entry["id"]] = path
+        self._index_lexical(path, entry)
+        self._index_filters(path, entry)
+
+    def _pop_entry(self, path: str) -> Optional[Dict[str, Any]]:
+        """Remove a metadata entry and its reverse mapping together."""
+        entry = self._metadata_store.pop(path, None)
+        if entry is not None and self._id_to_path.get(entry.get("id")) == path:
+            del self._id_to_path[entry["id"]]
+        if entry is not None:
+            self._unindex_lexical(path)
+            self._unindex_filters(path, entry)
+        return entry
+
+    def _set_tool_entry(self, server_path: str, tool_name: str, entry: Dict[str, Any]) -> None:
+        """Store a tool metadata entry and its reverse mapping together."""
+        self._pop_tool_entry(server_path, tool_name)
+        self._tool_metadata_store.setdefault(server_path, {})[tool_name] = entry
+        self._tool_id_to_key[entry["id"]] = (server_path, tool_name)
+
+    def _pop_tool_entry(self, server_path: str, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Remove a tool metadata entry and its reverse mapping together."""
+        tools = self._tool_metadata_store.get(server_path)
+        if not tools or tool_name not in tools:
+            return None
+        entry = tools.pop(tool_name)
+        if not tools:
+            del self._tool_metadata_store[server_path]
+        if self._tool_id_to_key.get(entry.get("id")) == (server_path, tool_name):
+            del self._tool_id_to_key[entry["id"]]
+        return entry
+
+    def _verify_id_maps(self) -> int:
+        """
+        Rebuild the reverse maps from the loaded metadata and repair inconsistencies.
+
+        Entries sharing an ID get a fresh one, and entries whose vector is missing from a
+        flat or HNSW index have their text hash cleared; both are re-embedded by the next
+        index_many() pass. ID counters are raised past the highest ID in use.
+
+        Returns:
+            Number of entries repaired
+        """
+        repaired = 0
+        indexed_ids = self._indexed_ids(self.faiss_index)
+
+        self._id_to_path = {}
+        for path, entry in self._metadata_store.items():
+            if entry.get("id") in self._id_to_path:
+                logger.warning(
+                    f"FAISS ID {entry.get('id')} of '{path}' is also used by "
+                    f"'{self._id_to_path[entry.get('id')]}'. Assigning a new ID."
+                )
+                entry["id"] = max(self.next_id_counter, max(self._id_to_path) + 1)
+                entry["text_hash"] = None
+                repaired += 1
+            elif indexed_ids is not None and entry.get("id") not in indexed_ids and entry.get("text_hash"):
+                logger.warning(f"No FAISS vector for '{path}' (ID {entry.get('id')}). It will be re-embedded.")
+                entry["text_hash"] = None
+                repaired += 1
+            self._id_to_path[entry["id"]] = path
+        if self._id_to_path:
+            self.next_id_counter = max(self.next_id_counter, max(self._id_to_path) + 1)
+
+        indexed_tool_ids = self._indexed_ids(self.tool_index)
+        self._tool_id_to_key = {}
+        for server_path, tools in self._tool_metadata_store.items():
+            for tool_name, entry in tools.items():
+                if entry.get("id") in self._tool_id_to_key:
+                    entry["id"] = max(self.next_tool_id_counter, max(self._tool_id_to_key) + 1)
+                    entry["text_hash"] = None
+                    repaired += 1
+                elif indexed_tool_ids is not None and entry.get("id") not in indexed_tool_ids and entry.get("text_hash"):
+                    entry["text_hash"] = None
+                    repaired += 1
+                self._tool_id_to_key[entry["id"]] = (server_path, tool_name)
+        if self._tool_id_to_key:
+            self.next_tool_id_counter = max(self.next_tool_id_counter, max(self._tool_id_to_key) + 1)
+
+        if repaired:
+            logger.warning(f"Repaired {repaired} FAISS metadata entries while verifying ID maps.")
+        return repaired
+
+    @staticmethod
+    def _indexed_ids(index: Optional[faiss.Index]) -> Optional[set]:
+        """IDs held by an IndexIDMap, or None when they cannot be listed cheaply."""
+        try:
+            if isinstance(index, faiss.IndexIDMap):
+                return set(int(faiss_id) for faiss_id in faiss.vector_to_array(index.id_map))
+        except Exception as e:
+            logger.warning(f"Could not list FAISS index IDs for verification: {e}")
+        return None
+
     async def initialize(self):
         """Initialize the FAISS service - load model and index."""
         await self._load_embedding_model()
         await self._load_faiss_data()
+        if self.faiss_index is not None and self._needs_compaction():
+            await self.compact_index()
+        if self.embedding_model is not None and self.faiss_index is not None:
+            self.state = SEARCH_STATE_READY
+        else:
+            self.state = SEARCH_STATE_FAILED
+
+    def start_background_initialization(
+        self,
+        entities_provider: Callable[[], List[Tuple[str, Any, str, bool]]],
+    ) -> asyncio.Task:
+        """
+        Load the model and index in a background task, then bulk index all entities.
+
+        Searches raise SearchWarmingError until loading finishes. entities_provider is
+        called after the index is loaded, so entities registered while warming are
+        included; it returns index_many() tuples.
+        """
+        self.state = SEARCH_STATE_WARMING
+        self._warmup_task = asyncio.create_task(self._warm_up(entities_provider))
+        return self._warmup_task
+
+    async def _warm_up(self, entities_provider: Callable[[], List[Tuple[str, Any, str, bool]]]) -> None:
+        started = time.monotonic()
+        try:
+            await self.initialize()
+        except Exception as e:
+            logger.error(f"FAISS search service failed to initialize: {e}", exc_info=True)
+            self.state = SEARCH_STATE_FAILED
+            return
+        if self.state != SEARCH_STATE_READY:
+            logger.error("FAISS search service failed to initialize. Semantic search is unavailable.")
+            return
+        logger.info(f"FAISS search service ready after {time.monotonic() - started:.1f}s.")
+
+        for path in sorted(self._pending_removals):
+            if self.metadata_store.get(path, {}).get("entity_type") == "a2a_agent":
+                await self.remove_agent(path)
+            else:
+                await self.remove_service(path)
+        self._pending_removals.clear()
+
+        try:
+            counts = await self.index_many(entities_provider())
+            logger.info(f"FAISS startup indexing complete ({counts['embedded']} re-embedded).")
+        except Exception as e:
+            logger.error(f"Failed to bulk update FAISS index: {e}", exc_info=True)
+
+    def _is_loading(self) -> bool:
+        """True while the background warm-up has not loaded the index yet."""
+        return self.state == SEARCH_STATE_WARMING and self.faiss_index is None
+
+    async def shutdown(self):
+        """Stop background workers and flush pending changes to a snapshot."""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        await self.embedding_batcher.close()
+        if self._snapshot_task is not None and not self._snapshot_task.done():
+            self._snapshot_task.cancel()
+            await self.save_data()
         
     async def _load_embedding_model(self):
         """Load the sentence transformer model."""
@@ -75,10 +421,24 @@ class FaissService:
             
             if model_exists:
                 logger.info(f"Loading SentenceTransformer model from local path: {settings.embeddings_model_dir}")
-                self.embedding_model = SentenceTransformer(str(settings.embeddings_model_dir))
+                model_source = str(settings.embeddings_model_dir)
             else:
                 logger.info(f"Local model not found at {settings.embeddings_model_dir}, downloading from Hugging Face")
-                self.embedding_model = SentenceTransformer(str(settings.embeddings_model_name))
+                model_source = str(settings.embeddings_model_name)
+
+            self.embedding_model = None
+            if settings.embeddings_backend == "onnx":
+                try:
+                    self.embedding_model = await asyncio.to_thread(
+                        load_onnx_sentence_transformer,
+                        model_source,
+                        settings.embeddings_onnx_quantization,
+                        settings.embeddings_onnx_export_dir,
+                    )
+                except Exception as e:
+                    logger.warning(f"ONNX embedding backend unavailable ({e}). Falling back to PyTorch.")
+            if self.embedding_model is None:
+                self.embedding_model = SentenceTransformer(model_source)
             
             # Restore original environment variable
             if original_st_home:
@@ -86,11 +446,29 @@ class FaissService:
             else:
                 del os.environ['SENTENCE_TRANSFORMERS_HOME']
                 
+            # Embeddings from a previous model are not comparable with the new one
+            self.query_cache.clear()
+            self.query_cache.fold_case = self._model_folds_case(self.embedding_model)
             logger.info("SentenceTransformer model loaded successfully.")
         except Exception as e:
             logger.error(f"Failed to load SentenceTransformer model: {e}", exc_info=True)
             self.embedding_model = None
             
+    @staticmethod
+    def _model_folds_case(model: Any) -> bool:
+        """Whether the model lowercases its input, so queries differing only in case embed identically."""
+        tokenizer = getattr(model, "tokenizer", None)
+        if getattr(tokenizer, "do_lower_case", None) is True:
+            return True
+        init_kwargs = getattr(tokenizer, "init_kwargs", None)
+        if isinstance(init_kwargs, dict) and init_kwargs.get("do_lower_case") is True:
+            return True
+        try:
+            first_module = model[0]
+        except Exception:
+            return False
+        return getattr(first_module, "do_lower_case", None) is True
+
     async def _load_faiss_data(self):
         """Load existing FAISS index and metadata or create new ones."""
         if settings.faiss_index_path.exists() and settings.faiss_metadata_path.exists():
@@ -103,13 +481,25 @@ class FaissService:
                     loaded_metadata = json.load(f)
                     self.metadata_store = loaded_metadata.get("metadata", {})
                     self.next_id_counter = loaded_metadata.get("next_id", 0)
+                    # Indexes saved before index types were configurable are always flat
+                    self.index_type = loaded_metadata.get("index_type", "flat")
+                    tool_metadata = loaded_metadata.get("tool_metadata")
+                    self._wal_seq = loaded_metadata.get("wal_seq", 0)
                     
-                logger.info(f"FAISS data loaded. Index size: {self.faiss_index.ntotal if self.faiss_index else 0}. Next ID: {self.next_id_counter}")
+                self._apply_search_params(self.faiss_index, self.index_type)
+                self._load_tool_index(loaded_metadata, tool_metadata)
+                replayed = self._replay_wal()
+                if self._verify_id_maps() or replayed:
+                    await self.save_data()
+                logger.info(f"FAISS data loaded. Index type: {self.index_type}. Index size: {self.faiss_index.ntotal if self.faiss_index else 0}. Next ID: {self.next_id_counter}")
                 
                 # Check dimension compatibility
                 if self.faiss_index and self.faiss_index.d != settings.embeddings_model_dimensions:
                     logger.warning(f"Loaded FAISS index dimension ({self.faiss_index.d}) differs from expected ({settings.embeddings_model_dimensions}). Re-initializing.")
                     self._initialize_new_index()
+                elif self.faiss_index and self.faiss_index.metric_type != self._expected_metric_type():
+                    logger.warning(f"Loaded FAISS index metric does not match FAISS_METRIC={settings.faiss_metric}. Re-initializing.")
+                    self._initialize_new_index()
                     
             except Exception as e:
                 logger.error(f"Error loading FAISS data: {e}. Re-initializing.", exc_info=True)
@@ -118,35 +508,658 @@ class FaissService:
             logger.info("FAISS index or metadata not found. Initializing new.")
             self._initialize_new_index()
             
+    def _load_tool_index(
+        self,
+        loaded_metadata: Dict[str, Any],
+        tool_metadata: Optional[Dict[str, Dict[str, Dict[str, Any]]]],
+    ) -> None:
+        """Load the tool index saved next to the service index, or start an empty one."""
+        if tool_metadata is None or not settings.faiss_tool_index_path.exists():
+            logger.info("FAISS tool index not found. Tools will be embedded on the next index update.")
+            self._initialize_new_tool_index()
+            return
+
+        logger.info(f"Loading FAISS tool index from {settings.faiss_tool_index_path}")
+        self.tool_index = faiss.read_index(str(settings.faiss_tool_index_path))
+        self.tool_index_type = loaded_metadata.get("tool_index_type", "flat")
+        self.tool_metadata_store = tool_metadata
+        self.next_tool_id_counter = loaded_metadata.get("next_tool_id", 0)
+        if self.tool_index.metric_type != self._expected_metric_type():
+            logger.warning("FAISS tool index metric does not match settings. Tools will be re-embedded.")
+            self._initialize_new_tool_index()
+            return
+        self._apply_search_params(self.tool_index, self.tool_index_type)
+        logger.info(f"FAISS tool index loaded. Index type: {self.tool_index_type}. Index size: {self.tool_index.ntotal}")
+
+    def _replay_wal(self) -> int:
+        """
+        Apply metadata changes logged after the last snapshot.
+
+        Vectors are only persisted by snapshots, so replayed entries get their text
+        hash cleared and are re-embedded by the next index_many() pass. A truncated
+        final line from a crash mid-append ends the replay.
+
+        Returns:
+            Number of records applied
+        """
+        if not settings.faiss_wal_path.exists():
+            return 0
+
+        applied = 0
+        try:
+            with open(settings.faiss_wal_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Ignoring truncated record at end of {settings.faiss_wal_path}")
+                        break
+                    if record.get("seq", 0) <= self._wal_seq:
+                        continue
+                    self._apply_wal_record(record)
+                    self._wal_seq = record["seq"]
+                    applied += 1
+        except Exception as e:
+            logger.error(f"Error replaying FAISS write-ahead log: {e}", exc_info=True)
+
+        if applied:
+            logger.info(f"Replayed {applied} FAISS metadata change(s) from {settings.faiss_wal_path}")
+        return applied
+
+    def _apply_wal_record(self, record: Dict[str, Any]) -> None:
+        """Apply one write-ahead log record to the in-memory metadata."""
+        op = record.get("op")
+        path = record.get("path")
+        previous = self.metadata_store.get(path)
+
+        if op == "upsert":
+            entry = dict(record["entry"])
+            entry["text_hash"] = None
+            if previous and previous.get("id") != entry.get("id"):
+                self._remove_vector(previous["id"], path)
+            self._set_entry(path, entry)
+        elif op == "delete":
+            if previous:
+                self._remove_vector(previous["id"], path)
+            self._pop_entry(path)
+        elif op == "tools":
+            self._remove_tool_vectors(path)
+            for tool_name, entry in record.get("tools", {}).items():
+                self._set_tool_entry(path, tool_name, {**entry, "text_hash": None})
+        else:
+            logger.warning(f"Unknown FAISS write-ahead log operation '{op}' for '{path}'")
+            return
+
+        self.next_id_counter = max(self.next_id_counter, record.get("next_id", 0))
+        self.next_tool_id_counter = max(self.next_tool_id_counter, record.get("next_tool_id", 0))
+
+    def _target_index_type(self, num_vectors: int, current_type: Optional[str] = None) -> str:
+        """
+        Return the configured index type, staying on flat until IVF-PQ can be trained.
+
+        An index that is already IVF-PQ keeps that type until the vector count drops
+        below IVFPQ_FALLBACK_RATIO of the training threshold.
+        """
+        index_type = settings.faiss_index_type.lower()
+        if index_type not in SUPPORTED_INDEX_TYPES:
+            logger.warning(f"Unknown FAISS index type '{settings.faiss_index_type}'. Using flat index.")
+            return "flat"
+        if index_type == "ivfpq":
+            min_vectors = settings.faiss_ivf_min_train_size
+            if current_type == "ivfpq":
+                min_vectors = int(min_vectors * IVFPQ_FALLBACK_RATIO)
+            if num_vectors < min_vectors:
+                return "flat"
+        return index_type
+
+    def _create_empty_index(
+        self,
+        dimension: Optional[int] = None,
+        index_type: str = "flat",
+        num_train: int = 0,
+    ) -> faiss.Index:
+        """
+        Create an empty FAISS index of the given type.
+
+        Flat and HNSW indexes are wrapped in IndexIDMap. IVF-PQ supports IDs natively and
+        uses a hashtable direct map so vectors can be removed and reconstructed by ID; it
+        must be trained before vectors are added. With settings.faiss_metric "cosine",
+        every index type uses inner product over L2-normalised vectors.
+        """
+        dimension = dimension or settings.embeddings_model_dimensions
+        metric = self._expected_metric_type()
+        if index_type == "hnsw":
+            hnsw_index = faiss.IndexHNSWFlat(dimension, settings.faiss_hnsw_m, metric)
+            hnsw_index.hnsw.efConstruction = settings.faiss_hnsw_ef_construction
+            return faiss.IndexIDMap(hnsw_index)
+        if index_type == "ivfpq":
+            # Faiss wants roughly 39 training points per coarse centroid
+            nlist = max(1, min(settings.faiss_ivf_nlist, num_train // 39))
+            quantizer = faiss.IndexFlat(dimension, metric)
+            ivf_index = faiss.IndexIVFPQ(quantizer, dimension, nlist, settings.faiss_pq_m, 8, metric)
+            ivf_index.set_direct_map_type(faiss.DirectMap.Hashtable)
+            return ivf_index
+        return faiss.IndexIDMap(faiss.IndexFlat(dimension, metric))
+
+    def _expected_metric_type(self) -> int:
+        """FAISS metric for settings.faiss_metric: inner product for cosine, L2 otherwise."""
+        return faiss.METRIC_INNER_PRODUCT if self._uses_cosine() else faiss.METRIC_L2
+
+    def _apply_search_params(self, index: Optional[faiss.Index], index_type: str) -> None:
+        """Apply query-time parameters (efSearch / nprobe) for approximate indexes."""
+        if index is None:
+            return
+        if index_type == "hnsw":
+            faiss.downcast_index(index.index).hnsw.efSearch = settings.faiss_hnsw_ef_search
+        elif index_type == "ivfpq":
+            index.nprobe = settings.faiss_ivf_nprobe
+
+    def _build_index(
+        self,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        dimension: int,
+        current_type: Optional[str] = None,
+    ) -> Tuple[faiss.Index, str]:
+        """Build (and train, if required) an index of the target type holding the given vectors."""
+        index_type = self._target_index_type(len(ids), current_type)
+        index = self._create_empty_index(dimension, index_type, num_train=len(ids))
+        if not index.is_trained:
+            logger.info(f"Training {index_type} FAISS index on {len(ids)} vectors.")
+            index.train(vectors)
+        if len(ids):
+            index.add_with_ids(vectors, ids)
+        self._apply_search_params(index, index_type)
+        return index, index_type
+
+    def _index_supports_removal(self, index_type: Optional[str] = None) -> bool:
+        """HNSW graphs cannot delete vectors; stale ones stay as tombstones until compaction."""
+        return (index_type or self.index_type) != "hnsw"
+
+    def _extract_vectors(
+        self,
+        index: faiss.Index,
+        index_type: str,
+        live_ids: List[int],
+    ) -> Dict[int, np.ndarray]:
+        """Return the vectors stored in an index, keyed by FAISS ID."""
+        if index.ntotal == 0:
+            return {}
+
+        if index_type == "ivfpq":
+            # IVF lists are not enumerable in ID order; reconstruct live IDs via the direct map.
+            # PQ reconstruction is approximate; rebuilds prefer re-embedding (_rebuild_dense).
+            vectors_by_id: Dict[int, np.ndarray] = {}
+            for faiss_id in live_ids:
+                try:
+                    vectors_by_id[faiss_id] = index.reconstruct(int(faiss_id))
+                except RuntimeError:
+                    continue
+            return vectors_by_id
+
+        id_map = faiss.vector_to_array(index.id_map)
+        vectors = index.index.reconstruct_n(0, index.ntotal)
+        return {int(faiss_id): vectors[position] for position, faiss_id in enumerate(id_map)}
+
     def _initialize_new_index(self):
         """Initialize a new FAISS index."""
-        self.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(settings.embeddings_model_dimensions))
+        self.index_type = self._target_index_type(0)
+        self.faiss_index = self._create_empty_index(index_type=self.index_type)
+        self._apply_search_params(self.faiss_index, self.index_type)
         self.metadata_store = {}
         self.next_id_counter = 0
-        
+        self._initialize_new_tool_index()
+
+    def _initialize_new_tool_index(self):
+        """Initialize a new, empty tool-level FAISS index."""
+        self.tool_index_type = self._target_index_type(0)
+        self.tool_index = self._create_empty_index(index_type=self.tool_index_type)
+        self._apply_search_params(self.tool_index, self.tool_index_type)
+        self.tool_metadata_store = {}
+        self.next_tool_id_counter = 0
+
+    def _remove_vector(self, faiss_id: int, entity_path: str) -> None:
+        """Remove a single vector from the FAISS index by its ID."""
+        if not self._index_supports_removal():
+            logger.info(f"FAISS ID {faiss_id} ({entity_path}) left as tombstone until the next compaction.")
+            return
+        try:
+            num_removed = self.faiss_index.remove_ids(np.array([faiss_id], dtype=np.int64))
+            logger.info(f"Removed {num_removed} vector(s) for FAISS ID {faiss_id} ({entity_path}).")
+        except Exception as e:
+            logger.warning(f"Issue removing FAISS ID {faiss_id} for {entity_path}: {e}")
+
+    def get_tombstone_count(self) -> int:
+        """Return the number of allocated FAISS IDs no longer backed by a metadata entry."""
+        return max(0, self.next_id_counter - len(self.metadata_store))
+
+    def _tool_count(self) -> int:
+        """Return the number of tools tracked in the tool index."""
+        return sum(len(tools) for tools in self.tool_metadata_store.values())
+
+    def get_tool_tombstone_count(self) -> int:
+        """Return the number of allocated tool IDs no longer backed by a tool entry."""
+        return max(0, self.next_tool_id_counter - self._tool_count())
+
+    def _index_needs_rebuild(self, index_type: str, live: int, allocated: int) -> bool:
+        """Check whether freed IDs passed the threshold or the index type must change."""
+        if index_type != self._target_index_type(live, index_type):
+            return True
+        tombstones = allocated - live
+        if tombstones < settings.faiss_compaction_min_tombstones or allocated == 0:
+            return False
+        return tombstones / allocated >= settings.faiss_compaction_tombstone_ratio
+
+    def _needs_compaction(self) -> bool:
+        """Check whether the service index or the tool index should be rebuilt."""
+        if self._index_needs_rebuild(self.index_type, len(self.metadata_store), self.next_id_counter):
+            return True
+        return self.tool_index is not None and self._index_needs_rebuild(
+            self.tool_index_type, self._tool_count(), self.next_tool_id_counter
+        )
+
+    def _schedule_compaction_if_needed(self) -> None:
+        """Start a background compaction if the tombstone threshold is exceeded."""
+        if not self._needs_compaction():
+            return
+        if self._compaction_task and not self._compaction_task.done():
+            return
+        logger.info(
+            f"FAISS index needs compaction (type {self.index_type}, "
+            f"tombstones {self.get_tombstone_count()}/{self.next_id_counter}, "
+            f"tool tombstones {self.get_tool_tombstone_count()}/{self.next_tool_id_counter}). "
+            "Scheduling background compaction."
+        )
+        self._compaction_task = asyncio.create_task(self.compact_index())
+
+    def _rebuild_dense(
+        self,
+        index: faiss.Index,
+        index_type: str,
+        entries: List[Tuple[str, Dict[str, Any]]],
+        texts: Optional[List[Optional[str]]] = None,
+        reembedded: Optional[Dict[str, Tuple[str, np.ndarray]]] = None,
+    ) -> Tuple[faiss.Index, str, Set[int]]:
+        """
+        Copy the vectors of the given entries into a freshly built index.
+
+        Entries keep their order and are given IDs from zero; the entries themselves are
+        not modified, so this can run on a worker thread while searches use the old index.
+        PQ codes only approximate the original vectors, so rebuilding from them would
+        compound quantisation error on every compaction; entries of an IVF-PQ index are
+        re-embedded from texts instead, falling back to reconstruction where the text is
+        None or encoding fails. Vectors in reembedded (see _reembed_entries) are reused
+        while their text is unchanged, so only entries edited since then are encoded here.
+
+        Returns:
+            Tuple of (new index, new index type, positions of entries without a vector)
+        """
+        dimension = index.d
+        vectors_by_id: Dict[int, np.ndarray] = {}
+        if index_type == "ivfpq" and texts is not None:
+            reembedded = reembedded or {}
+            stale_labels: List[str] = []
+            stale_texts: List[Optional[str]] = []
+            for (label, entry), text in zip(entries, texts):
+                cached = reembedded.get(label)
+                if text and cached is not None and cached[0] == self._hash_text(text):
+                    vectors_by_id[entry.get("id")] = cached[1]
+                else:
+                    stale_labels.append(label)
+                    stale_texts.append(text)
+            ids_by_label = {label: entry.get("id") for label, entry in entries}
+            for label, (_, vector) in self._reembed_entries(stale_labels, stale_texts).items():
+                vectors_by_id[ids_by_label[label]] = vector
+        vectors_by_id.update(self._extract_vectors(
+            index,
+            index_type,
+            [entry.get("id") for _, entry in entries if entry.get("id") not in vectors_by_id],
+        ))
+
+        new_vectors: List[np.ndarray] = []
+        new_ids: List[int] = []
+        missing: Set[int] = set()
+        for new_id, (label, entry) in enumerate(entries):
+            vector = vectors_by_id.get(entry.get("id"))
+            if vector is None:
+                logger.warning(f"No FAISS vector found for '{label}' during compaction.")
+                missing.add(new_id)
+                continue
+            new_vectors.append(vector)
+            new_ids.append(new_id)
+
+        new_index, new_type = self._build_index(
+            np.array(new_vectors, dtype=np.float32).reshape(-1, dimension),
+            np.array(new_ids, dtype=np.int64),
+            dimension,
+            index_type,
+        )
+        return new_index, new_type, missing
+
+    def _reembed_entries(
+        self,
+        labels: List[str],
+        texts: List[Optional[str]],
+    ) -> Dict[str, Tuple[str, np.ndarray]]:
+        """Encode entries from their embedding text on the calling thread, keyed by label with the text hash."""
+        if self.embedding_model is None:
+            return {}
+        pending = [(label, text) for label, text in zip(labels, texts) if text]
+        batch_size = max(1, settings.embeddings_batch_size)
+        reembedded: Dict[str, Tuple[str, np.ndarray]] = {}
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                embeddings = self._encode_texts([text for _, text in batch])
+            except Exception as e:
+                logger.warning(f"Re-embedding {len(batch)} entries for the rebuild failed: {e}. Using PQ reconstructions.")
+                continue
+            for (label, text), embedding in zip(batch, embeddings):
+                reembedded[label] = (self._hash_text(text), np.asarray(embedding, dtype=np.float32))
+        return reembedded
+
+    def _service_rebuild_entries(self) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[List[Optional[str]]]]:
+        """Service entries in rebuild order, with their embedding texts if the index is IVF-PQ."""
+        entries = list(self.metadata_store.items())
+        if self.index_type != "ivfpq":
+            return entries, None
+        return entries, [
+            entry.get("text_for_embedding") if self._stored_text_hash(entry) else None
+            for _, entry in entries
+        ]
+
+    def _tool_rebuild_entries(self) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[List[Optional[str]]]]:
+        """Tool entries labelled "path::name" in rebuild order, with texts if the tool index is IVF-PQ."""
+        tool_keys = [
+            (server_path, tool_name, entry)
+            for server_path, tools in self.tool_metadata_store.items()
+            for tool_name, entry in tools.items()
+        ]
+        entries = [(f"{server_path}::{tool_name}", entry) for server_path, tool_name, entry in tool_keys]
+        if self.tool_index_type != "ivfpq":
+            return entries, None
+        return entries, [self._stored_tool_text(*key) for key in tool_keys]
+
+    def _stored_tool_text(self, server_path: str, tool_name: str, entry: Dict[str, Any]) -> Optional[str]:
+        """Text a tool vector was embedded from, or None if the stored tool list no longer produces it."""
+        server_info = self._metadata_store.get(server_path, {}).get("full_server_info") or {}
+        for tool in server_info.get("tool_list") or []:
+            if tool.get("name") == tool_name:
+                tool_text = self._get_text_for_tool(server_info.get("server_name", server_path.strip("/")), tool)
+                return tool_text if self._hash_text(tool_text) == entry.get("text_hash") else None
+        return None
+
+    @staticmethod
+    def _renumber_entries(entries: List[Tuple[str, Dict[str, Any]]], missing: Set[int]) -> None:
+        """Apply the IDs assigned by _rebuild_dense; entries without a vector are flagged for re-embedding."""
+        for new_id, (_, entry) in enumerate(entries):
+            entry["id"] = new_id
+            if new_id in missing:
+                entry["text_hash"] = ""
+
+    async def compact_index(self, force: bool = False) -> Dict[str, int]:
+        """
+        Rebuild dense service and tool indexes and renumber IDs from zero.
+
+        Live vectors are copied out of the current indexes (IVF-PQ entries are
+        re-embedded instead, see _rebuild_dense), vectors without a metadata entry
+        are dropped, and the ID counters are reset to the number of live entries.
+        The rebuild uses the configured index type, training IVF-PQ on the live
+        vectors, so this also migrates between backends.
+
+        Re-embedding a large IVF-PQ index takes a while, so it runs on a worker thread
+        from a snapshot of the embedding texts before the index lock is taken, and
+        updates keep going meanwhile. The rebuild itself then runs on a worker thread
+        under the lock, encoding only entries added or edited since the snapshot, so no
+        update can allocate IDs meanwhile; the swap happens without yielding to the
+        event loop.
+
+        Args:
+            force: Compact even if the tombstone threshold has not been reached
+
+        Returns:
+            Dict with "live", "dropped" and "tombstones_cleared" counts for the service
+            index and the same counts prefixed with "tool_" for the tool index
+        """
+        if self.faiss_index is None:
+            raise RuntimeError("FAISS search service is not initialized")
+
+        reembedded: Dict[str, Tuple[str, np.ndarray]] = {}
+        tool_reembedded: Dict[str, Tuple[str, np.ndarray]] = {}
+        if force or self._needs_compaction():
+            entries, texts = self._service_rebuild_entries()
+            if texts is not None:
+                reembedded = await asyncio.to_thread(
+                    self._reembed_entries, [label for label, _ in entries], texts
+                )
+            if self.tool_index is not None:
+                tool_entries, tool_texts = self._tool_rebuild_entries()
+                if tool_texts is not None:
+                    tool_reembedded = await asyncio.to_thread(
+                        self._reembed_entries, [label for label, _ in tool_entries], tool_texts
+                    )
+
+        async with self._index_lock:
+            tombstones = self.get_tombstone_count()
+            tool_tombstones = self.get_tool_tombstone_count()
+            if not force and not self._needs_compaction():
+                return {
+                    "live": len(self.metadata_store),
+                    "dropped": 0,
+                    "tombstones_cleared": 0,
+                    "tool_live": self._tool_count(),
+                    "tool_dropped": 0,
+                    "tool_tombstones_cleared": 0,
+                }
+
+            previous_type = self.index_type
+            entries, texts = self._service_rebuild_entries()
+            new_index, new_type, missing = await asyncio.to_thread(
+                self._rebuild_dense, self.faiss_index, self.index_type, entries, texts, reembedded
+            )
+            dropped = self.faiss_index.ntotal - new_index.ntotal
+            self._renumber_entries(entries, missing)
+            self.faiss_index, self.index_type = new_index, new_type
+            self.next_id_counter = len(entries)
+            self._build_id_to_path()
+            logger.info(
+                f"FAISS index compacted ({previous_type} -> {self.index_type}): {self.faiss_index.ntotal} live vectors, "
+                f"{dropped} stale vectors dropped, {tombstones} tombstones cleared."
+            )
+
+            tool_dropped = 0
+            if self.tool_index is not None:
+                tool_entries, tool_texts = self._tool_rebuild_entries()
+                new_tool_index, new_tool_type, tool_missing = await asyncio.to_thread(
+                    self._rebuild_dense,
+                    self.tool_index,
+                    self.tool_index_type,
+                    tool_entries,
+                    tool_texts,
+                    tool_reembedded,
+                )
+                tool_dropped = self.tool_index.ntotal - new_tool_index.ntotal
+                self._renumber_entries(tool_entries, tool_missing)
+                self.tool_index, self.tool_index_type = new_tool_index, new_tool_type
+                self.next_tool_id_counter = len(tool_entries)
+                self._build_tool_id_to_key()
+                logger.info(
+                    f"FAISS tool index compacted ({self.tool_index_type}): {self.tool_index.ntotal} live vectors, "
+                    f"{tool_dropped} stale vectors dropped, {tool_tombstones} tombstones cleared."
+                )
+
+            await self.save_data()
+            return {
+                "live": self.faiss_index.ntotal,
+                "dropped": dropped,
+                "tombstones_cleared": tombstones,
+                "tool_live": self.tool_index.ntotal if self.tool_index is not None else 0,
+                "tool_dropped": tool_dropped,
+                "tool_tombstones_cleared": tool_tombstones,
+            }
+
     async def save_data(self):
-        """Save FAISS index and metadata to disk."""
+        """
+        Snapshot the FAISS indexes and metadata to disk.
+
+        Every file is first written to a temp file next to its target and then moved into
+        place with os.replace, so a crash never leaves a half-written index or metadata
+        file. The metadata file is replaced last; the write-ahead log is cleared once the
+        snapshot is complete. A binary copy of the entity metadata and the live tool
+        vectors are written alongside for read-only processes (mcpgw) that memory-map
+        them together with the index.
+        """
         if self.faiss_index is None:
             logger.error("FAISS index is not initialized. Cannot save.")
             return
-            
-        try:
-            # Ensure directory exists
-            settings.servers_dir.mkdir(parents=True, exist_ok=True)
-            
-            logger.info(f"Saving FAISS index to {settings.faiss_index_path} (Size: {self.faiss_index.ntotal})")
-            faiss.write_index(self.faiss_index, str(settings.faiss_index_path))
-            
-            logger.info(f"Saving FAISS metadata to {settings.faiss_metadata_path}")
-            with open(settings.faiss_metadata_path, "w") as f:
-                json.dump({
-                    "metadata": self.metadata_store,
-                    "next_id": self.next_id_counter
-                }, f, indent=2, cls=_PydanticAwareJSONEncoder)
-                
-            logger.info("FAISS data saved successfully.")
-        except Exception as e:
-            logger.error(f"Error saving FAISS data: {e}", exc_info=True)
+
+        async with self._wal_lock:
+            try:
+                # Ensure directory exists
+                settings.servers_dir.mkdir(parents=True, exist_ok=True)
+                staged: List[Tuple[Path, Path]] = []
+
+                logger.info(f"Saving FAISS index to {settings.faiss_index_path} (Size: {self.faiss_index.ntotal})")
+                index_tmp = self._temp_path(settings.faiss_index_path)
+                faiss.write_index(self.faiss_index, str(index_tmp))
+                staged.append((index_tmp, settings.faiss_index_path))
+
+                if self.tool_index is not None:
+                    logger.info(f"Saving FAISS tool index to {settings.faiss_tool_index_path} (Size: {self.tool_index.ntotal})")
+                    tool_index_tmp = self._temp_path(settings.faiss_tool_index_path)
+                    faiss.write_index(self.tool_index, str(tool_index_tmp))
+                    staged.append((tool_index_tmp, settings.faiss_tool_index_path))
+
+                if self.tool_index is not None:
+                    tool_keys, tool_vectors = self._live_tool_vectors()
+                    tool_vectors_tmp = self._temp_path(settings.faiss_tool_vectors_path)
+                    write_tool_vectors_file(tool_vectors_tmp, tool_keys, tool_vectors)
+                    staged.append((tool_vectors_tmp, settings.faiss_tool_vectors_path))
+
+                binary_tmp = self._temp_path(settings.faiss_metadata_binary_path)
+                write_metadata_file(binary_tmp, self.metadata_store, json_encoder=_PydanticAwareJSONEncoder)
+                staged.append((binary_tmp, settings.faiss_metadata_binary_path))
+
+                logger.info(f"Saving FAISS metadata to {settings.faiss_metadata_path}")
+                metadata_tmp = self._temp_path(settings.faiss_metadata_path)
+                with open(metadata_tmp, "w") as f:
+                    json.dump({
+                        "metadata": self.metadata_store,
+                        "next_id": self.next_id_counter,
+                        "index_type": self.index_type,
+                        "tool_metadata": self.tool_metadata_store,
+                        "next_tool_id": self.next_tool_id_counter,
+                        "tool_index_type": self.tool_index_type,
+                        "wal_seq": self._wal_seq,
+                    }, f, separators=(",", ":"), cls=_PydanticAwareJSONEncoder)
+                    f.flush()
+                    os.fsync(f.fileno())
+                staged.append((metadata_tmp, settings.faiss_metadata_path))
+
+                for tmp_path, final_path in staged:
+                    os.replace(tmp_path, final_path)
+
+                # Records up to wal_seq are now covered by the snapshot
+                settings.faiss_wal_path.unlink(missing_ok=True)
+                self._snapshot_deadline = None
+                logger.info("FAISS data saved successfully.")
+            except Exception as e:
+                logger.error(f"Error saving FAISS data: {e}", exc_info=True)
+
+    def _live_tool_vectors(self) -> Tuple[List[Tuple[str, str, str]], np.ndarray]:
+        """
+        Return (server_path, tool_name, text_hash) keys and the matching tool vectors.
+
+        Tombstoned vectors are left out. IVF-PQ vectors are reconstructed from their
+        codes, so they are approximate.
+        """
+        entries = [
+            (server_path, tool_name, entry)
+            for server_path, tools in self.tool_metadata_store.items()
+            for tool_name, entry in tools.items()
+        ]
+        vectors_by_id = self._extract_vectors(
+            self.tool_index, self.tool_index_type, [entry["id"] for _, _, entry in entries]
+        )
+        keys: List[Tuple[str, str, str]] = []
+        vectors: List[np.ndarray] = []
+        for server_path, tool_name, entry in entries:
+            vector = vectors_by_id.get(entry["id"])
+            if vector is not None:
+                keys.append((server_path, tool_name, entry.get("text_hash", "")))
+                vectors.append(vector)
+        if not vectors:
+            return [], np.zeros((0, self.tool_index.d), dtype=np.float32)
+        return keys, np.array(vectors, dtype=np.float32)
+
+    @staticmethod
+    def _temp_path(path: Path) -> Path:
+        """Temp file in the target's directory so os.replace stays on one filesystem."""
+        return path.with_name(f"{path.name}.tmp")
+
+    async def _record_changes(self, paths: List[str], tool_paths: Optional[List[str]] = None) -> None:
+        """
+        Append metadata changes for the given paths to the write-ahead log and schedule
+        a debounced snapshot.
+
+        Each record carries the entry's current state (or a delete), so a burst of
+        registrations costs a few small appends and a single snapshot.
+        """
+        records: List[Dict[str, Any]] = []
+        for path in paths:
+            entry = self.metadata_store.get(path)
+            if entry is None:
+                records.append({"op": "delete", "path": path})
+            else:
+                records.append({"op": "upsert", "path": path, "entry": entry})
+        for path in tool_paths or []:
+            records.append({"op": "tools", "path": path, "tools": self.tool_metadata_store.get(path, {})})
+
+        async with self._wal_lock:
+            lines = []
+            for record in records:
+                self._wal_seq += 1
+                record.update(
+                    seq=self._wal_seq,
+                    next_id=self.next_id_counter,
+                    next_tool_id=self.next_tool_id_counter,
+                )
+                lines.append(json.dumps(record, separators=(",", ":"), cls=_PydanticAwareJSONEncoder))
+            try:
+                await asyncio.to_thread(self._append_wal, lines)
+            except Exception as e:
+                logger.error(f"Error appending to FAISS write-ahead log: {e}", exc_info=True)
+
+        self._schedule_snapshot()
+
+    @staticmethod
+    def _append_wal(lines: List[str]) -> None:
+        settings.servers_dir.mkdir(parents=True, exist_ok=True)
+        with open(settings.faiss_wal_path, "a") as f:
+            f.write("".join(f"{line}\n" for line in lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _schedule_snapshot(self) -> None:
+        """Snapshot once changes go quiet for the debounce period, or at the max delay."""
+        now = time.monotonic()
+        self._last_change_at = now
+        if self._snapshot_deadline is None:
+            self._snapshot_deadline = now + settings.faiss_snapshot_max_delay_seconds
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = asyncio.create_task(self._debounced_snapshot())
+
+    async def _debounced_snapshot(self) -> None:
+        while True:
+            due = min(
+                self._last_change_at + settings.faiss_snapshot_debounce_seconds,
+                self._snapshot_deadline or 0.0,
+            )
+            delay = due - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        await self.save_data()
             
     def _get_text_for_embedding(self, server_info: Dict[str, Any]) -> str:
         """Prepare text string from server info (including tools) for embedding."""
@@ -203,112 +1216,402 @@ class FaissService:
 
         return "\n".join(text_parts)
 
-        
+    @staticmethod
+    def _hash_text(text: str) -> str:
+        """Return a stable hash of an embedding text for change detection."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _stored_text_hash(self, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Return the text hash for a metadata entry, computing it for legacy entries.
+
+        Entries flagged for re-embedding (text_hash None or "") return None, so they
+        never match a freshly computed hash.
+        """
+        if "text_hash" not in entry:
+            return self._hash_text(entry.get("text_for_embedding", ""))
+        return entry["text_hash"] or None
+
+    def _build_metadata_entry(
+        self,
+        entity_info: Any,
+        entity_type: str,
+        is_enabled: bool,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the embedding text and metadata entry (without ID) for an entity.
+
+        Produces the same entry shape as add_or_update_service/add_or_update_agent.
+        """
+        if entity_type == "a2a_agent":
+            agent_card = entity_info if isinstance(entity_info, AgentCard) else AgentCard(**entity_info)
+            text_to_embed = self._get_text_for_agent(agent_card)
+            return text_to_embed, {
+                "entity_type": "a2a_agent",
+                "text_for_embedding": text_to_embed,
+                "text_hash": self._hash_text(text_to_embed),
+                "full_agent_card": agent_card.model_dump(),
+            }
+
+        text_to_embed = self._get_text_for_embedding(entity_info)
+        enriched_server_info = entity_info.copy()
+        enriched_server_info["is_enabled"] = is_enabled
+        return text_to_embed, {
+            "text_for_embedding": text_to_embed,
+            "text_hash": self._hash_text(text_to_embed),
+            "full_server_info": enriched_server_info,
+            "entity_type": entity_info.get("entity_type", "mcp_server"),
+        }
+
+    def _get_text_for_tool(self, server_name: str, tool: Dict[str, Any]) -> str:
+        """Prepare text string for a single tool in the tool-level index."""
+        parsed_description = tool.get("parsed_description", {}) or {}
+        tool_desc = parsed_description.get("main") or tool.get("description") or "No description."
+        return f"Service: {server_name}. Tool: {tool.get('name', '')}. Description: {tool_desc}"
+
+    async def _encode_in_batches(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Encode texts in batches of settings.embeddings_batch_size; failed batches yield None."""
+        batch_size = max(1, settings.embeddings_batch_size)
+        embeddings: List[Optional[np.ndarray]] = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            try:
+                batch_embeddings = await asyncio.to_thread(
+                    self.embedding_model.encode,
+                    batch,
+                    batch_size=batch_size,
+                )
+                embeddings.extend(self._normalize_embeddings(batch_embeddings))
+            except Exception as e:
+                logger.error(f"Error encoding batch of {len(batch)} texts: {e}", exc_info=True)
+                embeddings.extend([None] * len(batch))
+        return embeddings
+
+    async def _sync_tool_vectors(self, servers: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        """
+        Bring the tool index in line with the tool lists of the given servers.
+
+        Tools whose text hash is unchanged are skipped, tools no longer listed are
+        removed, and new or changed tools are encoded in batches.
+
+        Returns:
+            True if the tool index or tool metadata changed
+        """
+        if self.tool_index is None:
+            return False
+
+        changed = False
+        supports_removal = self._index_supports_removal(self.tool_index_type)
+        stale_ids: List[int] = []
+        pending: List[Tuple[str, str, str, str]] = []
+
+        for server_path, server_info in servers:
+            server_name = server_info.get("server_name", server_path.strip("/"))
+            existing_tools = self.tool_metadata_store.get(server_path, {})
+            desired_tools: Dict[str, Tuple[str, str]] = {}
+            for tool in server_info.get("tool_list") or []:
+                tool_name = tool.get("name")
+                if tool_name:
+                    tool_text = self._get_text_for_tool(server_name, tool)
+                    desired_tools[tool_name] = (tool_text, self._hash_text(tool_text))
+
+            for tool_name in [name for name in existing_tools if name not in desired_tools]:
+                stale_ids.append(self._pop_tool_entry(server_path, tool_name)["id"])
+                changed = True
+
+            for tool_name, (tool_text, text_hash) in desired_tools.items():
+                existing_tool = existing_tools.get(tool_name)
+                if existing_tool and existing_tool.get("text_hash") == text_hash:
+                    continue
+                pending.append((server_path, tool_name, tool_text, text_hash))
+
+        embeddings = await self._encode_in_batches([tool_text for _, _, tool_text, _ in pending])
+
+        new_entries: List[Tuple[str, str, Dict[str, Any]]] = []
+        new_vectors: List[np.ndarray] = []
+        for (server_path, tool_name, _, text_hash), embedding in zip(pending, embeddings):
+            if embedding is None:
+                continue
+            existing_tool = self.tool_metadata_store.get(server_path, {}).get(tool_name)
+            if existing_tool and supports_removal:
+                tool_id = existing_tool["id"]
+                stale_ids.append(tool_id)
+            else:
+                # New tool, or HNSW where the old vector stays behind as a tombstone
+                tool_id = self.next_tool_id_counter
+                self.next_tool_id_counter += 1
+            new_entries.append((server_path, tool_name, {"id": tool_id, "text_hash": text_hash}))
+            new_vectors.append(embedding)
+
+        if stale_ids and supports_removal:
+            try:
+                self.tool_index.remove_ids(np.array(stale_ids, dtype=np.int64))
+            except Exception as e_remove:
+                logger.warning(f"Issue removing {len(stale_ids)} old tool vectors: {e_remove}. Proceeding to add.")
+
+        if new_entries:
+            try:
+                self.tool_index.add_with_ids(
+                    np.array(new_vectors, dtype=np.float32),
+                    np.array([entry["id"] for _, _, entry in new_entries], dtype=np.int64),
+                )
+            except Exception as e:
+                logger.error(f"Error adding {len(new_entries)} tool vectors to FAISS tool index: {e}", exc_info=True)
+                return changed
+            for server_path, tool_name, entry in new_entries:
+                self._set_tool_entry(server_path, tool_name, entry)
+            changed = True
+            logger.info(f"Embedded {len(new_entries)} tool(s) into the FAISS tool index.")
+
+        return changed
+
+    def _remove_tool_vectors(self, service_path: str) -> None:
+        """Remove all tool vectors belonging to a service."""
+        tools = {
+            tool_name: self._pop_tool_entry(service_path, tool_name)
+            for tool_name in list(self.tool_metadata_store.get(service_path, {}))
+        }
+        if not tools or self.tool_index is None or not self._index_supports_removal(self.tool_index_type):
+            return
+        try:
+            self.tool_index.remove_ids(np.array([entry["id"] for entry in tools.values()], dtype=np.int64))
+        except Exception as e:
+            logger.warning(f"Issue removing tool vectors for {service_path}: {e}")
+
+    async def index_many(
+        self,
+        entities: List[Tuple[str, Any, str, bool]],
+    ) -> Dict[str, int]:
+        """
+        Bulk add or update entities in the FAISS index.
+
+        Only entities whose embedding text hash changed are re-encoded, in batches of
+        settings.embeddings_batch_size. Vectors are swapped with a single remove_ids/
+        add_with_ids pair and data is written to disk once at the end.
+
+        Args:
+            entities: List of (entity_path, entity_info, entity_type, is_enabled) tuples.
+                entity_info is a server info dict for "mcp_server" and an AgentCard
+                (or its dict form) for "a2a_agent".
+
+        Returns:
+            Dict with "embedded", "updated" and "unchanged" counts
+        """
+        counts = {"embedded": 0, "updated": 0, "unchanged": 0}
+        if self.embedding_model is None or self.faiss_index is None:
+            logger.error("Embedding model or FAISS index not initialized. Cannot bulk index entities.")
+            return counts
+
+        async with self._index_lock:
+            metadata_changed = False
+            pending: List[Tuple[str, str, Dict[str, Any]]] = []
+
+            for entity_path, entity_info, entity_type, is_enabled in entities:
+                try:
+                    text_to_embed, new_entry = self._build_metadata_entry(
+                        entity_info, entity_type, is_enabled
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to prepare '{entity_path}' for FAISS indexing: {e}", exc_info=True)
+                    continue
+
+                existing_entry = self.metadata_store.get(entity_path)
+                if existing_entry and self._stored_text_hash(existing_entry) == new_entry["text_hash"]:
+                    new_entry["id"] = existing_entry["id"]
+                    if existing_entry != new_entry:
+                        self._set_entry(entity_path, new_entry)
+                        metadata_changed = True
+                        counts["updated"] += 1
+                    else:
+                        counts["unchanged"] += 1
+                    continue
+
+                pending.append((entity_path, text_to_embed, new_entry))
+
+            logger.info(f"Bulk indexing {len(entities)} entities: {len(pending)} need embedding.")
+
+            embeddings = await self._encode_in_batches([text for _, text, _ in pending])
+            embedded: List[Tuple[str, Dict[str, Any], np.ndarray]] = [
+                (entity_path, new_entry, embedding)
+                for (entity_path, _, new_entry), embedding in zip(pending, embeddings)
+                if embedding is not None
+            ]
+
+            if embedded:
+                ids_to_remove = [
+                    self.metadata_store[entity_path]["id"]
+                    for entity_path, _, _ in embedded
+                    if entity_path in self.metadata_store
+                ]
+                if ids_to_remove and self._index_supports_removal():
+                    try:
+                        num_removed = self.faiss_index.remove_ids(np.array(ids_to_remove, dtype=np.int64))
+                        logger.info(f"Removed {num_removed} old vector(s) before bulk re-indexing.")
+                    except Exception as e_remove:
+                        logger.warning(f"Issue removing {len(ids_to_remove)} old FAISS IDs: {e_remove}. Proceeding to add.")
+
+                new_ids: List[int] = []
+                for entity_path, new_entry, _ in embedded:
+                    existing_entry = self.metadata_store.get(entity_path)
+                    if existing_entry and self._index_supports_removal():
+                        new_entry["id"] = existing_entry["id"]
+                    else:
+                        # New entity, or HNSW where the old vector stays behind as a tombstone
+                        new_entry["id"] = self.next_id_counter
+                        self.next_id_counter += 1
+                    new_ids.append(new_entry["id"])
+
+                try:
+                    embedding_np = np.array([embedding for _, _, embedding in embedded], dtype=np.float32)
+                    self.faiss_index.add_with_ids(embedding_np, np.array(new_ids, dtype=np.int64))
+                except Exception as e:
+                    logger.error(f"Error adding {len(embedded)} vectors to FAISS index: {e}", exc_info=True)
+                    return counts
+
+                for entity_path, new_entry, _ in embedded:
+                    self._set_entry(entity_path, new_entry)
+                metadata_changed = True
+                counts["embedded"] = len(embedded)
+
+            servers_with_tools = [
+                (entity_path, entity_info)
+                for entity_path, entity_info, entity_type, _ in entities
+                if entity_type == "mcp_server" and entity_path in self.metadata_store
+            ]
+            if await self._sync_tool_vectors(servers_with_tools):
+                metadata_changed = True
+
+            if metadata_changed:
+                await self.save_data()
+                self._schedule_compaction_if_needed()
+
+            logger.info(
+                f"Bulk indexing complete: {counts['embedded']} embedded, "
+                f"{counts['updated']} metadata-only updates, {counts['unchanged']} unchanged."
+            )
+            return counts
+
     async def add_or_update_service(self, service_path: str, server_info: Dict[str, Any], is_enabled: bool = False):
         """Add or update a service in the FAISS index."""
+        if self._is_loading():
+            logger.info(f"FAISS search is warming up. '{service_path}' will be indexed once loading completes.")
+            return
         if self.embedding_model is None or self.faiss_index is None:
             logger.error("Embedding model or FAISS index not initialized. Cannot add/update service in FAISS.")
             return
             
-        logger.info(f"Attempting to add/update service '{service_path}' in FAISS.")
-        text_to_embed = self._get_text_for_embedding(server_info)
+        async with self._index_lock:
+            logger.info(f"Attempting to add/update service '{service_path}' in FAISS.")
+            text_to_embed = self._get_text_for_embedding(server_info)
         
-        current_faiss_id = -1
-        needs_new_embedding = True
+            current_faiss_id = -1
+            needs_new_embedding = True
         
-        existing_entry = self.metadata_store.get(service_path)
+            existing_entry = self.metadata_store.get(service_path)
         
-        if existing_entry:
-            current_faiss_id = existing_entry["id"]
-            if existing_entry.get("text_for_embedding") == text_to_embed:
-                needs_new_embedding = False
-                logger.info(f"Text for embedding for '{service_path}' has not changed. Will update metadata store only if server_info differs.")
+            if existing_entry:
+                current_faiss_id = existing_entry["id"]
+                if self._stored_text_hash(existing_entry) == self._hash_text(text_to_embed):
+                    needs_new_embedding = False
+                    logger.info(f"Text for embedding for '{service_path}' has not changed. Will update metadata store only if server_info differs.")
+                else:
+                    logger.info(f"Text for embedding for '{service_path}' has changed. Re-embedding required.")
             else:
-                logger.info(f"Text for embedding for '{service_path}' has changed. Re-embedding required.")
-        else:
-            # New service
-            current_faiss_id = self.next_id_counter
-            self.next_id_counter += 1
-            logger.info(f"New service '{service_path}'. Assigning new FAISS ID: {current_faiss_id}.")
-            needs_new_embedding = True
+                # New service
+                current_faiss_id = self.next_id_counter
+                self.next_id_counter += 1
+                logger.info(f"New service '{service_path}'. Assigning new FAISS ID: {current_faiss_id}.")
+                needs_new_embedding = True
             
-        if needs_new_embedding:
-            try:
-                # Run model encoding in a separate thread
-                embedding = await asyncio.to_thread(self.embedding_model.encode, [text_to_embed])
-                embedding_np = np.array([embedding[0]], dtype=np.float32)
+            if needs_new_embedding:
+                try:
+                    # Run model encoding in a separate thread
+                    embedding = self._normalize_embeddings(
+                        await asyncio.to_thread(self.embedding_model.encode, [text_to_embed])
+                    )
+                    embedding_np = np.array([embedding[0]], dtype=np.float32)
                 
-                ids_to_remove = np.array([current_faiss_id])
-                if existing_entry:
-                    try:
-                        num_removed = self.faiss_index.remove_ids(ids_to_remove)
-                        if num_removed > 0:
-                            logger.info(f"Removed {num_removed} old vector(s) for FAISS ID {current_faiss_id} ({service_path}).")
-                        else:
-                            logger.info(f"No old vector found for FAISS ID {current_faiss_id} ({service_path}) during update, or ID not in index.")
-                    except Exception as e_remove:
-                        logger.warning(f"Issue removing FAISS ID {current_faiss_id} for {service_path}: {e_remove}. Proceeding to add.")
+                    if existing_entry and not self._index_supports_removal():
+                        # HNSW cannot delete vectors; keep the old one as a tombstone and use a fresh ID
+                        current_faiss_id = self.next_id_counter
+                        self.next_id_counter += 1
+                    elif existing_entry:
+                        ids_to_remove = np.array([current_faiss_id])
+                        try:
+                            num_removed = self.faiss_index.remove_ids(ids_to_remove)
+                            if num_removed > 0:
+                                logger.info(f"Removed {num_removed} old vector(s) for FAISS ID {current_faiss_id} ({service_path}).")
+                            else:
+                                logger.info(f"No old vector found for FAISS ID {current_faiss_id} ({service_path}) during update, or ID not in index.")
+                        except Exception as e_remove:
+                            logger.warning(f"Issue removing FAISS ID {current_faiss_id} for {service_path}: {e_remove}. Proceeding to add.")
                 
-                self.faiss_index.add_with_ids(embedding_np, np.array([current_faiss_id]))
-                logger.info(f"Added/Updated vector for '{service_path}' with FAISS ID {current_faiss_id}.")
-            except Exception as e:
-                logger.error(f"Error encoding or adding embedding for '{service_path}': {e}", exc_info=True)
-                return
+                    self.faiss_index.add_with_ids(embedding_np, np.array([current_faiss_id]))
+                    logger.info(f"Added/Updated vector for '{service_path}' with FAISS ID {current_faiss_id}.")
+                except Exception as e:
+                    logger.error(f"Error encoding or adding embedding for '{service_path}': {e}", exc_info=True)
+                    return
                 
-        # Update metadata store
-        enriched_server_info = server_info.copy()
-        enriched_server_info["is_enabled"] = is_enabled
-
-        if (
-            existing_entry is None
-            or needs_new_embedding
-            or existing_entry.get("full_server_info") != enriched_server_info
-        ):
-
-            self.metadata_store[service_path] = {
-                "id": current_faiss_id,
-                "text_for_embedding": text_to_embed,
-                "full_server_info": enriched_server_info,
-                "entity_type": server_info.get("entity_type", "mcp_server")
-            }
-            logger.debug(f"Updated faiss_metadata_store for '{service_path}'.")
-            await self.save_data()
-        else:
-            logger.debug(
-                f"No changes to FAISS vector or enriched full_server_info for '{service_path}'. Skipping save."
-            )
+            # Update metadata store
+            enriched_server_info = server_info.copy()
+            enriched_server_info["is_enabled"] = is_enabled
+
+            tools_changed = await self._sync_tool_vectors([(service_path, server_info)])
+
+            if (
+                existing_entry is None
+                or needs_new_embedding
+                or tools_changed
+                or existing_entry.get("full_server_info") != enriched_server_info
+            ):
+
+                self._set_entry(service_path, {
+                    "id": current_faiss_id,
+                    "text_for_embedding": text_to_embed,
+                    "text_hash": self._hash_text(text_to_embed),
+                    "full_server_info": enriched_server_info,
+                    "entity_type": server_info.get("entity_type", "mcp_server")
+                })
+                logger.debug(f"Updated faiss_metadata_store for '{service_path}'.")
+                await self._record_changes([service_path], [service_path] if tools_changed else None)
+                self._schedule_compaction_if_needed()
+            else:
+                logger.debug(
+                    f"No changes to FAISS vector or enriched full_server_info for '{service_path}'. Skipping save."
+                )
 
 
     async def remove_service(self, service_path: str):
         """Remove a service from the FAISS index and metadata store."""
-        try:
-            # Check if service exists in metadata
-            if service_path not in self.metadata_store:
-                logger.warning(f"Service '{service_path}' not found in FAISS metadata store")
-                return
-
-            # Get the FAISS ID for this service
-            service_id = self.metadata_store[service_path].get("id")
-            if service_id is not None and self.faiss_index:
-                # Remove from FAISS index
-                # Note: FAISS doesn't support direct removal, but we can remove from metadata
-                # The vector will remain in the index but won't be accessible via metadata
-                logger.info(
-                    f"Removing service '{service_path}' with FAISS ID {service_id} from index"
-                )
+        if self._is_loading():
+            self._pending_removals.add(service_path)
+            return
+        async with self._index_lock:
+            try:
+                # Check if service exists in metadata
+                if service_path not in self.metadata_store:
+                    logger.warning(f"Service '{service_path}' not found in FAISS metadata store")
+                    return
 
-            # Remove from metadata store
-            del self.metadata_store[service_path]
-            logger.info(f"Removed service '{service_path}' from FAISS metadata store")
+                # Get the FAISS ID for this service
+                service_id = self.metadata_store[service_path].get("id")
+                if service_id is not None and self.faiss_index:
+                    self._remove_vector(service_id, service_path)
+                self._remove_tool_vectors(service_path)
 
-            # Save the updated metadata
-            await self.save_data()
+                # Remove from metadata store
+                self._pop_entry(service_path)
+                logger.info(f"Removed service '{service_path}' from FAISS metadata store")
 
-        except Exception as e:
-            logger.error(
-                f"Failed to remove service '{service_path}' from FAISS: {e}",
-                exc_info=True,
-            )
+                # Log the removal; the snapshot follows once changes go quiet
+                await self._record_changes([service_path], [service_path])
+                self._schedule_compaction_if_needed()
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to remove service '{service_path}' from FAISS: {e}",
+                    exc_info=True,
+                )
 
     async def add_or_update_agent(
         self,
@@ -317,131 +1620,146 @@ class FaissService:
         is_enabled: bool = False,
     ) -> None:
         """Add or update an agent in the FAISS index."""
+        if self._is_loading():
+            logger.info(f"FAISS search is warming up. '{agent_path}' will be indexed once loading completes.")
+            return
         if self.embedding_model is None or self.faiss_index is None:
             logger.error(
                 "Embedding model or FAISS index not initialized. Cannot add/update agent in FAISS."
             )
             return
 
-        logger.info(f"Attempting to add/update agent '{agent_path}' in FAISS.")
-        text_to_embed = self._get_text_for_agent(agent_card)
+        async with self._index_lock:
+            logger.info(f"Attempting to add/update agent '{agent_path}' in FAISS.")
+            text_to_embed = self._get_text_for_agent(agent_card)
 
-        current_faiss_id = -1
-        needs_new_embedding = True
+            current_faiss_id = -1
+            needs_new_embedding = True
 
-        existing_entry = self.metadata_store.get(agent_path)
+            existing_entry = self.metadata_store.get(agent_path)
 
-        if existing_entry:
-            current_faiss_id = existing_entry["id"]
-            if existing_entry.get("text_for_embedding") == text_to_embed:
-                needs_new_embedding = False
-                logger.info(
-                    f"Text for embedding for '{agent_path}' has not changed. Will update metadata store only if agent_card differs."
-                )
+            if existing_entry:
+                current_faiss_id = existing_entry["id"]
+                if self._stored_text_hash(existing_entry) == self._hash_text(text_to_embed):
+                    needs_new_embedding = False
+                    logger.info(
+                        f"Text for embedding for '{agent_path}' has not changed. Will update metadata store only if agent_card differs."
+                    )
+                else:
+                    logger.info(
+                        f"Text for embedding for '{agent_path}' has changed. Re-embedding required."
+                    )
             else:
+                # New agent
+                current_faiss_id = self.next_id_counter
+                self.next_id_counter += 1
                 logger.info(
-                    f"Text for embedding for '{agent_path}' has changed. Re-embedding required."
+                    f"New agent '{agent_path}'. Assigning new FAISS ID: {current_faiss_id}."
                 )
-        else:
-            # New agent
-            current_faiss_id = self.next_id_counter
-            self.next_id_counter += 1
-            logger.info(
-                f"New agent '{agent_path}'. Assigning new FAISS ID: {current_faiss_id}."
-            )
-            needs_new_embedding = True
-
-        if needs_new_embedding:
-            try:
-                # Run model encoding in a separate thread
-                embedding = await asyncio.to_thread(
-                    self.embedding_model.encode,
-                    [text_to_embed],
-                )
-                embedding_np = np.array([embedding[0]], dtype=np.float32)
-
-                ids_to_remove = np.array([current_faiss_id])
-                if existing_entry:
-                    try:
-                        num_removed = self.faiss_index.remove_ids(ids_to_remove)
-                        if num_removed > 0:
-                            logger.info(
-                                f"Removed {num_removed} old vector(s) for FAISS ID {current_faiss_id} ({agent_path})."
-                            )
-                        else:
-                            logger.info(
-                                f"No old vector found for FAISS ID {current_faiss_id} ({agent_path}) during update, or ID not in index."
-                            )
-                    except Exception as e_remove:
-                        logger.warning(
-                            f"Issue removing FAISS ID {current_faiss_id} for {agent_path}: {e_remove}. Proceeding to add."
+                needs_new_embedding = True
+
+            if needs_new_embedding:
+                try:
+                    # Run model encoding in a separate thread
+                    embedding = self._normalize_embeddings(
+                        await asyncio.to_thread(
+                            self.embedding_model.encode,
+                            [text_to_embed],
                         )
+                    )
+                    embedding_np = np.array([embedding[0]], dtype=np.float32)
+
+                    if existing_entry and not self._index_supports_removal():
+                        # HNSW cannot delete vectors; keep the old one as a tombstone and use a fresh ID
+                        current_faiss_id = self.next_id_counter
+                        self.next_id_counter += 1
+                    elif existing_entry:
+                        ids_to_remove = np.array([current_faiss_id])
+                        try:
+                            num_removed = self.faiss_index.remove_ids(ids_to_remove)
+                            if num_removed > 0:
+                                logger.info(
+                                    f"Removed {num_removed} old vector(s) for FAISS ID {current_faiss_id} ({agent_path})."
+                                )
+                            else:
+                                logger.info(
+                                    f"No old vector found for FAISS ID {current_faiss_id} ({agent_path}) during update, or ID not in index."
+                                )
+                        except Exception as e_remove:
+                            logger.warning(
+                                f"Issue removing FAISS ID {current_faiss_id} for {agent_path}: {e_remove}. Proceeding to add."
+                            )
 
-                self.faiss_index.add_with_ids(
-                    embedding_np,
-                    np.array([current_faiss_id]),
-                )
-                logger.info(
-                    f"Added/Updated vector for '{agent_path}' with FAISS ID {current_faiss_id}."
-                )
-            except Exception as e:
-                logger.error(
-                    f"Error encoding or adding embedding for '{agent_path}': {e}",
-                    exc_info=True,
+                    self.faiss_index.add_with_ids(
+                        embedding_np,
+                        np.array([current_faiss_id]),
+                    )
+                    logger.info(
+                        f"Added/Updated vector for '{agent_path}' with FAISS ID {current_faiss_id}."
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Error encoding or adding embedding for '{agent_path}': {e}",
+                        exc_info=True,
+                    )
+                    return
+
+            # Update metadata store
+            agent_card_dict = agent_card.model_dump()
+
+            if (
+                existing_entry is None
+                or needs_new_embedding
+                or existing_entry.get("full_agent_card") != agent_card_dict
+            ):
+
+                self._set_entry(agent_path, {
+                    "id": current_faiss_id,
+                    "entity_type": "a2a_agent",
+                    "text_for_embedding": text_to_embed,
+                    "text_hash": self._hash_text(text_to_embed),
+                    "full_agent_card": agent_card_dict,
+                })
+                logger.debug(f"Updated faiss_metadata_store for agent '{agent_path}'.")
+                await self._record_changes([agent_path])
+                self._schedule_compaction_if_needed()
+            else:
+                logger.debug(
+                    f"No changes to FAISS vector or agent card for '{agent_path}'. Skipping save."
                 )
-                return
-
-        # Update metadata store
-        agent_card_dict = agent_card.model_dump()
-
-        if (
-            existing_entry is None
-            or needs_new_embedding
-            or existing_entry.get("full_agent_card") != agent_card_dict
-        ):
-
-            self.metadata_store[agent_path] = {
-                "id": current_faiss_id,
-                "entity_type": "a2a_agent",
-                "text_for_embedding": text_to_embed,
-                "full_agent_card": agent_card_dict,
-            }
-            logger.debug(f"Updated faiss_metadata_store for agent '{agent_path}'.")
-            await self.save_data()
-        else:
-            logger.debug(
-                f"No changes to FAISS vector or agent card for '{agent_path}'. Skipping save."
-            )
 
     async def remove_agent(self, agent_path: str) -> None:
         """Remove an agent from the FAISS index and metadata store."""
-        try:
-            # Check if agent exists in metadata
-            if agent_path not in self.metadata_store:
-                logger.warning(
-                    f"Agent '{agent_path}' not found in FAISS metadata store"
-                )
-                return
+        if self._is_loading():
+            self._pending_removals.add(agent_path)
+            return
+        async with self._index_lock:
+            try:
+                # Check if agent exists in metadata
+                if agent_path not in self.metadata_store:
+                    logger.warning(
+                        f"Agent '{agent_path}' not found in FAISS metadata store"
+                    )
+                    return
 
-            # Get the FAISS ID for this agent
-            agent_id = self.metadata_store[agent_path].get("id")
-            if agent_id is not None and self.faiss_index:
-                logger.info(
-                    f"Removing agent '{agent_path}' with FAISS ID {agent_id} from index"
-                )
+                # Get the FAISS ID for this agent
+                agent_id = self.metadata_store[agent_path].get("id")
+                if agent_id is not None and self.faiss_index:
+                    self._remove_vector(agent_id, agent_path)
 
-            # Remove from metadata store
-            del self.metadata_store[agent_path]
-            logger.info(f"Removed agent '{agent_path}' from FAISS metadata store")
+                # Remove from metadata store
+                self._pop_entry(agent_path)
+                logger.info(f"Removed agent '{agent_path}' from FAISS metadata store")
 
-            # Save the updated metadata
-            await self.save_data()
+                # Log the removal; the snapshot follows once changes go quiet
+                await self._record_changes([agent_path])
+                self._schedule_compaction_if_needed()
 
-        except Exception as e:
-            logger.error(
-                f"Failed to remove agent '{agent_path}' from FAISS: {e}",
-                exc_info=True,
-            )
+            except Exception as e:
+                logger.error(
+                    f"Failed to remove agent '{agent_path}' from FAISS: {e}",
+                    exc_info=True,
+                )
 
     async def search_agents(
         self,
@@ -500,6 +1818,7 @@ class FaissService:
         entity_types: Optional[List[str]] = None,
         enabled_only: bool = False,
         max_results: int = 10,
+        access_filter: Optional[AccessFilter] = None,
     ) -> List[Dict[str, Any]]:
         """
         Wrapper method for searching entities.
@@ -513,6 +1832,8 @@ class FaissService:
             query=query,
             entity_types=entity_types,
             max_results=max_results,
+            enabled_only=enabled_only,
+            access_filter=access_filter,
         )
 
         combined: List[Dict[str, Any]] = []
@@ -537,9 +1858,17 @@ class FaissService:
 
 
     def _distance_to_relevance(self, distance: float) -> float:
-        """Convert FAISS L2 distance to a normalized relevance score (0-1)."""
+        """
+        Convert a FAISS score to a relevance score (0-1).
+
+        Cosine indexes return the cosine similarity itself (clamped at 0); L2
+        distances are mapped through 1 / (1 + d).
+        """
         try:
-            relevance = 1.0 / (1.0 + float(distance))
+            if self._uses_cosine():
+                relevance = float(distance)
+            else:
+                relevance = 1.0 / (1.0 + float(distance))
             return max(0.0, min(1.0, relevance))
         except Exception:
             return 0.0
@@ -590,19 +1919,265 @@ class FaissService:
         matches.sort(key=lambda item: item[0], reverse=True)
         return [match for _, match in matches]
 
+    def _visible_paths(
+        self,
+        entity_types: Set[str],
+        enabled_only: bool,
+        access_filter: Optional[AccessFilter],
+    ) -> Optional[Set[str]]:
+        """
+        Paths of the given entity types passing the enabled/access filters, or None
+        when there is nothing to filter.
+
+        Only the access filter needs a per-entry check; types and enabled state come
+        from the sets kept by _set_entry/_pop_entry.
+        """
+        if not enabled_only and access_filter is None:
+            return None
+        self._ensure_filter_sets()
+        candidates: Set[str] = set().union(
+            *(self._paths_by_type.get(entity_type, set()) for entity_type in entity_types)
+        )
+        if enabled_only:
+            candidates &= self._enabled_paths
+        if access_filter is None:
+            return candidates
+        visible: Set[str] = set()
+        for path in candidates:
+            entity_type, _, name = self._entry_identity(self._metadata_store[path])
+            if access_filter(entity_type, path, name):
+                visible.add(path)
+        return visible
+
+    def _allowed_entity_ids(
+        self,
+        entity_types: Set[str],
+        visible: Optional[Set[str]],
+    ) -> Tuple[Optional[Set[str]], Optional[List[int]]]:
+        """
+        Paths and FAISS IDs of entities of the given types within visible.
+
+        Returns (None, None) when every indexed entity qualifies, so the search
+        can skip the ID selector.
+        """
+        self._ensure_filter_sets()
+        if visible is None and entity_types.issuperset(self._paths_by_type):
+            return None, None
+        paths: Set[str] = set().union(
+            *(self._paths_by_type.get(entity_type, set()) for entity_type in entity_types)
+        )
+        if visible is not None:
+            paths &= visible
+        if len(paths) == len(self._metadata_store):
+            return None, None
+        return paths, [self._metadata_store[path]["id"] for path in paths]
+
+    def _allowed_tool_ids(self, visible: Optional[Set[str]]) -> Optional[List[int]]:
+        """FAISS tool IDs belonging to visible servers, or None when all are visible."""
+        if visible is None:
+            return None
+        return [
+            entry["id"]
+            for server_path in visible
+            for entry in self.tool_metadata_store.get(server_path, {}).values()
+        ]
+
+    def _filtered_search(
+        self,
+        index: faiss.Index,
+        index_type: str,
+        query_np: np.ndarray,
+        k: int,
+        allowed_ids: Optional[List[int]],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        kNN search restricted to allowed_ids with a FAISS ID selector.
+
+        Non-matching vectors are skipped inside the index scan, so k matches come
+        back without over-fetching. Approximate indexes can still return fewer than
+        k when few vectors qualify; efSearch / nprobe are then doubled until k are
+        found or the search is exhaustive.
+        """
+        if allowed_ids is None:
+            return index.search(query_np, min(k, index.ntotal))
+        k = min(k, len(allowed_ids))
+        if k == 0:
+            return np.empty((1, 0), dtype=np.float32), np.empty((1, 0), dtype=np.int64)
+
+        selector = faiss.IDSelectorBatch(np.array(allowed_ids, dtype=np.int64))
+        widen = 1
+        while True:
+            if index_type == "hnsw":
+                ef_search = max(k, settings.faiss_hnsw_ef_search * widen)
+                params = faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search)
+                exhaustive = ef_search >= index.ntotal
+            elif index_type == "ivfpq":
+                nprobe = min(index.nlist, settings.faiss_ivf_nprobe * widen)
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+                exhaustive = nprobe >= index.nlist
+            else:
+                params = faiss.SearchParameters(sel=selector)
+                exhaustive = True
+
+            distances, indices = index.search(query_np, k, params=params)
+            if exhaustive or int((indices[0] != -1).sum()) >= k:
+                return distances, indices
+            widen *= 2
+
+    def _relevance_for_ids(
+        self,
+        index: faiss.Index,
+        index_type: str,
+        query_np: np.ndarray,
+        keys_by_id: Dict[int, Any],
+    ) -> Dict[Any, float]:
+        """Vector relevance of specific entries, for keyword hits the kNN search did not return."""
+        if not keys_by_id:
+            return {}
+        distances, indices = self._filtered_search(
+            index, index_type, query_np, len(keys_by_id), list(keys_by_id)
+        )
+        return {
+            keys_by_id[int(faiss_id)]: self._distance_to_relevance(distance)
+            for distance, faiss_id in zip(distances[0], indices[0])
+            if int(faiss_id) in keys_by_id
+        }
+
+    def _search_tools(
+        self,
+        query_np: np.ndarray,
+        k: int,
+        allowed_ids: Optional[List[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run a kNN lookup against the tool index and resolve hits to tool details."""
+        distances, indices = self._filtered_search(
+            self.tool_index, self.tool_index_type, query_np, k, allowed_ids
+        )
+
+        tool_hits: List[Dict[str, Any]] = []
+        for distance, tool_id in zip(distances[0], indices[0]):
+            if tool_id == -1:
+                continue
+            tool_key = self._tool_id_to_key.get(int(tool_id))
+            if not tool_key:
+                continue
+
+            server_path, tool_name = tool_key
+            if self.tool_metadata_store.get(server_path, {}).get(tool_name, {}).get("id") != int(tool_id):
+                continue
+            tool_hit = self._build_tool_hit(server_path, tool_name, self._distance_to_relevance(distance))
+            if tool_hit is not None:
+                tool_hits.append(tool_hit)
+        return tool_hits
+
+    def _search_tools_lexical(
+        self,
+        query: str,
+        k: int,
+        visible: Optional[Set[str]] = None,
+    ) -> List[Tuple[str, str]]:
+        """Return up to k (server_path, tool_name) keys ranked by BM25 score."""
+        allowed = None
+        if visible is not None:
+            allowed = {
+                (server_path, tool_name)
+                for server_path in visible
+                for tool_name in self._lexical_tool_names.get(server_path, [])
+            }
+        return [key for key, _ in self.tool_lexical_index.search(query, k, allowed=allowed)]
+
+    def _build_tool_hit(self, server_path: str, tool_name: str, relevance: float) -> Optional[Dict[str, Any]]:
+        """Resolve a tool to its result entry, or None if the server no longer lists it."""
+        server_info = self.metadata_store.get(server_path, {}).get("full_server_info")
+        if not server_info:
+            return None
+        tool = next(
+            (t for t in server_info.get("tool_list") or [] if t.get("name") == tool_name),
+            None,
+        )
+        if tool is None:
+            return None
+
+        parsed_description = tool.get("parsed_description", {}) or {}
+        tool_desc = (
+            parsed_description.get("main")
+            or tool.get("description")
+            or parsed_description.get("summary")
+            or ""
+        )
+        tool_args = parsed_description.get("args", "")
+        return {
+            "entity_type": "tool",
+            "server_path": server_path,
+            "server_name": server_info.get("server_name", server_path.strip("/")),
+            "tool_name": tool_name,
+            "description": tool_desc,
+            "match_context": (tool_desc or tool_args or "")[:180],
+            "relevance_score": relevance,
+        }
+
+    async def _encode_query(self, query: str) -> np.ndarray:
+        """Encode a search query as a (1, d) array, reusing cached embeddings."""
+        cached = self.query_cache.get(query)
+        if cached is not None:
+            return cached
+
+        # Concurrent queries share one batched forward pass
+        query_embedding = await self.embedding_batcher.encode([query.strip()])
+        query_np = np.array([query_embedding[0]], dtype=np.float32)
+        self.query_cache.put(query, query_np)
+        return query_np
+
+    def _encode_texts(self, texts: List[str]) -> Any:
+        """Encode texts with the current embedding model (runs on a worker thread)."""
+        return self._normalize_embeddings(self.embedding_model.encode(texts))
+
+    @staticmethod
+    def _uses_cosine() -> bool:
+        return settings.faiss_metric == "cosine"
+
+    def _normalize_embeddings(self, embeddings: Any) -> Any:
+        """L2-normalise embeddings for cosine indexes, so inner product is cosine similarity."""
+        if not self._uses_cosine():
+            return embeddings
+        vectors = np.array(embeddings, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Return query embedding cache counters."""
+        return self.query_cache.stats()
+
+    def get_embedding_batcher_stats(self) -> Dict[str, Any]:
+        """Return batch size and queue wait metrics for query encoding."""
+        return self.embedding_batcher.stats()
+
     async def search_mixed(
         self,
         query: str,
         entity_types: Optional[List[str]] = None,
         max_results: int = 20,
+        enabled_only: bool = False,
+        access_filter: Optional[AccessFilter] = None,
+        min_score: float = 0.0,
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Run a semantic search across MCP servers, their tools, and A2A agents.
 
+        With settings.search_hybrid_enabled, the FAISS neighbours are fused with
+        BM25 keyword matches by reciprocal rank fusion, so exact tool names and
+        identifiers rank well. Results are ordered by the fused rank, while
+        relevance_score stays the vector similarity of each result.
+
         Args:
             query: Natural language query text
             entity_types: Optional list of entity filters ("mcp_server", "tool", "a2a_agent")
             max_results: Maximum results to return per entity collection
+            enabled_only: Only return enabled servers and agents (and tools of enabled servers)
+            access_filter: Optional (entity_type, path, name) predicate; entities it rejects,
+                and tools of servers it rejects, are excluded before the kNN search
+            min_score: Drop results (and matching tools) with a lower vector similarity;
+                applied before fusion, so keyword matches cannot lift weak results back in
 
         Returns:
             Dict with "servers", "tools", and "agents" result lists
@@ -610,6 +2185,8 @@ class FaissService:
         if not query or not query.strip():
             raise ValueError("Query text is required for semantic search")
 
+        if self._is_loading():
+            raise SearchWarmingError("FAISS search service is still loading")
         if self.embedding_model is None or self.faiss_index is None:
             raise RuntimeError("FAISS search service is not initialized")
 
@@ -624,35 +2201,123 @@ class FaissService:
         if total_vectors == 0:
             return {"servers": [], "tools": [], "agents": []}
 
-        top_k = min(max_results, total_vectors)
-        query_embedding = await asyncio.to_thread(
-            self.embedding_model.encode, [query.strip()]
+        hybrid = settings.search_hybrid_enabled
+        # Fusion needs a deeper candidate list from each retriever
+        candidate_k = max_results * 2 if hybrid else max_results
+        query_np = await self._encode_query(query)
+        if hybrid:
+            self._ensure_lexical_indexes()
+
+        # Tool matches come from the tool-level index when it is populated, fused
+        # with BM25 tool matches in hybrid mode; older indexes without tool
+        # vectors fall back to keyword matching per server hit.
+        use_tool_index = (
+            "tool" in entity_filter
+            and self.tool_index is not None
+            and self.tool_index.ntotal > 0
+        )
+        use_tool_hits = use_tool_index or (hybrid and "tool" in entity_filter)
+
+        # Filters are applied inside the kNN search, so k results come back even
+        # when the caller can see only a few entities
+        searched_types = entity_filter & {"mcp_server", "a2a_agent"}
+        if "tool" in entity_filter and not use_tool_hits:
+            searched_types.add("mcp_server")
+        # Tools are visible through the servers that list them
+        visible = self._visible_paths(
+            searched_types | ({"mcp_server"} if "tool" in entity_filter else set()),
+            enabled_only,
+            access_filter,
         )
-        query_np = np.array([query_embedding[0]], dtype=np.float32)
 
-        distances, indices = self.faiss_index.search(query_np, top_k)
-        distance_row = distances[0]
-        id_row = indices[0]
+        ranked_entities: List[Tuple[str, float]] = []
+        if searched_types:
+            allowed_paths, allowed_ids = self._allowed_entity_ids(searched_types, visible)
+            distances, indices = self._filtered_search(
+                self.faiss_index, self.index_type, query_np, candidate_k, allowed_ids
+            )
 
-        id_to_path = {
-            entry.get("id"): path for path, entry in self.metadata_store.items()
-        }
+            # Vector hits in rank order, path -> relevance
+            vector_hits: Dict[str, float] = {}
+            for distance, faiss_id in zip(distances[0], indices[0]):
+                if faiss_id == -1:
+                    continue
+                path = self._path_for_id(int(faiss_id))
+                if path and path not in vector_hits:
+                    vector_hits[path] = self._distance_to_relevance(distance)
+            vector_hits = {path: score for path, score in vector_hits.items() if score >= min_score}
+
+            if hybrid:
+                lexical_paths = [
+                    path
+                    for path, _ in self.lexical_index.search(query, candidate_k, allowed=allowed_paths)
+                ]
+                # Keyword-only hits are scored against the query vector too
+                relevance = {
+                    **self._relevance_for_ids(
+                        self.faiss_index,
+                        self.index_type,
+                        query_np,
+                        {
+                            self._metadata_store[path]["id"]: path
+                            for path in lexical_paths
+                            if path not in vector_hits
+                        },
+                    ),
+                    **vector_hits,
+                }
+                lexical_paths = [path for path in lexical_paths if relevance.get(path, 0.0) >= min_score]
+                ranked_entities = [
+                    (path, relevance.get(path, 0.0))
+                    for path, _ in reciprocal_rank_fusion(
+                        [list(vector_hits), lexical_paths], k=settings.search_rrf_k
+                    )
+                ]
+            else:
+                ranked_entities = list(vector_hits.items())
+
+        tool_hits_by_server: Dict[str, List[Dict[str, Any]]] = {}
+        tool_hits: List[Dict[str, Any]] = []
+        if use_tool_index:
+            # Over-fetch to absorb hits on stale IDs
+            tool_hits = self._search_tools(query_np, max_results * 2, self._allowed_tool_ids(visible))
+            tool_hits = [hit for hit in tool_hits if hit["relevance_score"] >= min_score]
+        if use_tool_hits and hybrid:
+            tool_relevance = {(hit["server_path"], hit["tool_name"]): hit["relevance_score"] for hit in tool_hits}
+            lexical_tools = self._search_tools_lexical(query, max_results * 2, visible)
+            if use_tool_index:
+                tool_ids = {
+                    self.tool_metadata_store[server_path][tool_name]["id"]: (server_path, tool_name)
+                    for server_path, tool_name in lexical_tools
+                    if (server_path, tool_name) not in tool_relevance
+                    and tool_name in self.tool_metadata_store.get(server_path, {})
+                }
+                tool_relevance = {
+                    **self._relevance_for_ids(self.tool_index, self.tool_index_type, query_np, tool_ids),
+                    **tool_relevance,
+                }
+            lexical_tools = [key for key in lexical_tools if tool_relevance.get(key, 0.0) >= min_score]
+            fused_tools = reciprocal_rank_fusion(
+                [[(hit["server_path"], hit["tool_name"]) for hit in tool_hits], lexical_tools],
+                k=settings.search_rrf_k,
+            )
+            tool_hits = []
+            for (server_path, tool_name), _ in fused_tools:
+                tool_hit = self._build_tool_hit(
+                    server_path, tool_name, tool_relevance.get((server_path, tool_name), 0.0)
+                )
+                if tool_hit is not None:
+                    tool_hits.append(tool_hit)
+        for tool_hit in tool_hits:
+            tool_hits_by_server.setdefault(tool_hit["server_path"], []).append(tool_hit)
 
         server_results: List[Dict[str, Any]] = []
         tool_results: List[Dict[str, Any]] = []
         agent_results: List[Dict[str, Any]] = []
 
-        for distance, faiss_id in zip(distance_row, id_row):
-            if faiss_id == -1:
-                continue
-
-            path = id_to_path.get(int(faiss_id))
-            if not path:
-                continue
-
+        for path, relevance in ranked_entities:
             metadata_entry = self.metadata_store.get(path, {})
             entity_type = metadata_entry.get("entity_type", "mcp_server")
-            relevance = self._distance_to_relevance(distance)
 
             if entity_type == "mcp_server":
                 server_info = metadata_entry.get("full_server_info", {})
@@ -666,7 +2331,9 @@ class FaissService:
                 )
 
                 matching_tools: List[Dict[str, Any]] = []
-                if "tool" in entity_filter:
+                if use_tool_hits:
+                    matching_tools = tool_hits_by_server.get(path, [])[:5]
+                elif "tool" in entity_filter:
                     matching_tools = self._extract_matching_tools(query, server_info)[:5]
 
                 if "mcp_server" in entity_filter:
@@ -685,8 +2352,9 @@ class FaissService:
                                 {
                                     "tool_name": tool.get("tool_name", ""),
                                     "description": tool.get("description", ""),
-                                    "relevance_score": min(
-                                        1.0, (relevance + tool.get("raw_score", 0)) / 2
+                                    "relevance_score": tool.get(
+                                        "relevance_score",
+                                        min(1.0, (relevance + tool.get("raw_score", 0)) / 2),
                                     ),
                                     "match_context": tool.get("match_context", ""),
                                 }
@@ -695,7 +2363,7 @@ class FaissService:
                         }
                     )
 
-                if "tool" in entity_filter and matching_tools:
+                if "tool" in entity_filter and matching_tools and not use_tool_hits:
                     for tool in matching_tools:
                         tool_results.append(
                             {
@@ -747,9 +2415,13 @@ class FaissService:
                     }
                 )
 
-        server_results.sort(key=lambda item: item["relevance_score"], reverse=True)
-        tool_results.sort(key=lambda item: item["relevance_score"], reverse=True)
-        agent_results.sort(key=lambda item: item["relevance_score"], reverse=True)
+        # Servers, agents and indexed tool hits are already in rank order (fused in
+        # hybrid mode, so not necessarily by relevance_score)
+        if use_tool_hits:
+            tool_results = tool_hits
+        else:
+            tool_results = [tool for tool in tool_results if tool["relevance_score"] >= min_score]
+            tool_results.sort(key=lambda item: item["relevance_score"], reverse=True)
 
         return {
             "servers": server_results[:max_results],
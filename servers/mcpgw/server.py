@@ -7,18 +7,24 @@ import httpx # Use httpx for async requests
 import argparse
 import asyncio # Added for locking
 import logging
+import hashlib
+import importlib.util
 import json
+import mmap
+import struct
 import websockets # For WebSocket connections
+from collections import deque
+from collections.abc import Mapping
 from pathlib import Path # Added Path
 from pydantic import BaseModel, Field
 from fastmcp import FastMCP, Context  # Updated import for FastMCP 2.0
 from fastmcp.server.dependencies import get_http_request  # New dependency function for HTTP access
-from typing import Dict, Any, Optional, ClassVar, List
+from typing import Dict, Any, Optional, ClassVar, List, Callable, FrozenSet, Iterable, Iterator, NamedTuple, Tuple
+import time
 from dotenv import load_dotenv
 import os
 from sentence_transformers import SentenceTransformer # Added
 import numpy as np # Added
-from sklearn.metrics.pairwise import cosine_similarity # Added
 import faiss # Added
 import yaml # Added for scopes.yml parsing
 
@@ -39,6 +45,7 @@ if not REGISTRY_BASE_URL:
 
 # Global variable to cache loaded scopes
 _scopes_config = None
+_compiled_scopes: Optional["CompiledScopes"] = None
 
 
 # --- Scopes Management Helper Functions ---
@@ -76,6 +83,72 @@ async def load_scopes_config() -> Dict[str, Any]:
         return {}
 
 
+class CompiledScopes:
+    """
+    scopes.yml compiled into scope -> server -> allowed tool set.
+
+    Built once per loaded configuration. A user's scopes, including those granted
+    through group_mappings, resolve to per-server tool sets in a single pass; the
+    result is memoised per frozen scope set, since few distinct sets are seen.
+    """
+
+    _MEMO_MAX_SIZE = 1024
+
+    def __init__(self, scopes_config: Dict[str, Any]):
+        self.source = scopes_config
+        self._tools_by_scope: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        for scope, scope_data in (scopes_config or {}).items():
+            if not isinstance(scope_data, list):
+                continue
+            servers: Dict[str, set] = {}
+            for server_config in scope_data:
+                if not isinstance(server_config, dict) or "server" not in server_config:
+                    continue
+                tools = server_config.get("tools") or []
+                if isinstance(tools, str):
+                    tools = [tools]
+                # Normalize server names by stripping trailing slashes for comparison
+                servers.setdefault(str(server_config["server"]).rstrip("/"), set()).update(tools)
+            self._tools_by_scope[scope] = {server: frozenset(tools) for server, tools in servers.items()}
+
+        group_mappings = (scopes_config or {}).get("group_mappings") or {}
+        self._group_scopes: Dict[str, Tuple[str, ...]] = {
+            group: tuple(mapped_scopes or []) for group, mapped_scopes in group_mappings.items()
+        }
+        self._memo: Dict[FrozenSet[str], Dict[str, FrozenSet[str]]] = {}
+
+    def _tools_by_server(self, user_scopes: FrozenSet[str]) -> Dict[str, FrozenSet[str]]:
+        access = self._memo.get(user_scopes)
+        if access is not None:
+            return access
+
+        effective_scopes = set(user_scopes)
+        for group in user_scopes:
+            effective_scopes.update(self._group_scopes.get(group, ()))
+        merged: Dict[str, set] = {}
+        for scope in effective_scopes:
+            for server, tools in self._tools_by_scope.get(scope, {}).items():
+                merged.setdefault(server, set()).update(tools)
+        access = {server: frozenset(tools) for server, tools in merged.items()}
+
+        if len(self._memo) >= self._MEMO_MAX_SIZE:
+            self._memo.clear()
+        self._memo[user_scopes] = access
+        return access
+
+    def allowed_tools(self, user_scopes: Iterable[str], server_name: str) -> FrozenSet[str]:
+        """Return the tools the given scopes grant on a server (empty if none)."""
+        return self._tools_by_server(frozenset(user_scopes)).get(server_name.rstrip("/"), frozenset())
+
+
+def get_compiled_scopes(scopes_config: Dict[str, Any]) -> CompiledScopes:
+    """Return the compiled form of scopes_config, recompiling only when the config object changes."""
+    global _compiled_scopes
+    if _compiled_scopes is None or _compiled_scopes.source is not scopes_config:
+        _compiled_scopes = CompiledScopes(scopes_config)
+    return _compiled_scopes
+
+
 def extract_user_scopes_from_headers(headers: Dict[str, str]) -> List[str]:
     """
     Extract user scopes from HTTP headers.
@@ -121,51 +194,12 @@ def check_tool_access(server_name: str, tool_name: str, user_scopes: List[str],
     if not scopes_config or not user_scopes:
         logger.warning(f"Access denied: {server_name}.{tool_name} - no scopes config or user scopes")
         return False
-    
-    logger.info(f"Checking access for {server_name}.{tool_name} with user scopes: {user_scopes}")
-    logger.info(f"Available scope keys in config: {list(scopes_config.keys())}")
-    
-    # Check direct scope access
-    for user_scope in user_scopes:
-        logger.info(f"Checking user scope: {user_scope}")
-        if user_scope in scopes_config:
-            scope_data = scopes_config[user_scope]
-            logger.info(f"Found scope data for {user_scope}: {type(scope_data)}")
-            if isinstance(scope_data, list):
-                # This is a server scope (like mcp-servers-unrestricted/read)
-                for server_config in scope_data:
-                    logger.info(f"Checking server config: {server_config.get('server')} vs {server_name}")
-                    # Normalize server names by stripping trailing slashes for comparison
-                    config_server_name = server_config.get('server', '').rstrip('/')
-                    normalized_server_name = server_name.rstrip('/')
-                    if config_server_name == normalized_server_name:
-                        tools = server_config.get('tools', [])
-                        logger.info(f"Available tools for {server_name}: {tools}")
-                        if tool_name in tools:
-                            logger.info(f"Access granted: {server_name}.{tool_name} via scope {user_scope}")
-                            return True
-    
-    # Check group mappings for additional access
-    group_mappings = scopes_config.get('group_mappings', {})
-    logger.debug(f"Checking group mappings: {group_mappings}")
-    for group, mapped_scopes in group_mappings.items():
-        if group in user_scopes:
-            logger.debug(f"User is in group {group}, checking mapped scopes: {mapped_scopes}")
-            # User is in this group, check the mapped scopes
-            for mapped_scope in mapped_scopes:
-                if mapped_scope in scopes_config:
-                    scope_data = scopes_config[mapped_scope]
-                    if isinstance(scope_data, list):
-                        for server_config in scope_data:
-                            # Normalize server names by stripping trailing slashes for comparison
-                            config_server_name = server_config.get('server', '').rstrip('/')
-                            normalized_server_name = server_name.rstrip('/')
-                            if config_server_name == normalized_server_name:
-                                tools = server_config.get('tools', [])
-                                if tool_name in tools:
-                                    logger.info(f"Access granted: {server_name}.{tool_name} via group {group} -> {mapped_scope}")
-                                    return True
-    
+
+    # Direct scopes and scopes mapped from the user's groups, precompiled per config
+    if tool_name in get_compiled_scopes(scopes_config).allowed_tools(user_scopes, server_name):
+        logger.debug(f"Access granted: {server_name}.{tool_name} for scopes {user_scopes}")
+        return True
+
     logger.warning(f"Access denied: {server_name}.{tool_name} for scopes {user_scopes}")
     return False
 
@@ -360,25 +394,25 @@ async def validate_session_cookie_with_auth_server(session_cookie: str, auth_ser
         Dict containing user context information including username, groups, scopes, etc.
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Call the auth server to validate the session cookie
-            response = await client.post(
-                f"{auth_server_url}/validate",
-                headers={
-                    "Cookie": f"mcp_gateway_session={session_cookie}",
-                    "Content-Type": "application/json"
-                },
-                json={"action": "validate_session"}  # Indicate we want session validation
-            )
+        # Call the auth server to validate the session cookie
+        response = await _http_client_mcpgw.post(
+            f"{auth_server_url}/validate",
+            headers={
+                "Cookie": f"mcp_gateway_session={session_cookie}",
+                "Content-Type": "application/json"
+            },
+            json={"action": "validate_session"},  # Indicate we want session validation
+            timeout=10.0
+        )
+        
+        if response.status_code == 200:
+            user_context = response.json()
+            logger.info(f"Session validation successful for user: {user_context.get('username', 'unknown')}")
+            return user_context
+        else:
+            logger.warning(f"Session validation failed: HTTP {response.status_code}")
+            return {"valid": False, "error": f"HTTP {response.status_code}"}
             
-            if response.status_code == 200:
-                user_context = response.json()
-                logger.info(f"Session validation successful for user: {user_context.get('username', 'unknown')}")
-                return user_context
-            else:
-                logger.warning(f"Session validation failed: HTTP {response.status_code}")
-                return {"valid": False, "error": f"HTTP {response.status_code}"}
-                
     except Exception as e:
         logger.error(f"Error validating session cookie: {e}")
         return {"valid": False, "error": str(e)}
@@ -501,119 +535,478 @@ async def check_user_permission_for_tool(auth_context: Dict[str, Any], tool_name
 
 
 # --- FAISS and Sentence Transformer Integration for mcpgw --- START
-_faiss_data_lock = asyncio.Lock()
+
+
+class FaissSnapshotMcpgw(NamedTuple):
+    """Index, metadata and tool vectors loaded together; replaced as a whole, never mutated."""
+    index: Optional[faiss.Index]
+    index_mtime: Optional[float]
+    metadata: Optional[Dict[str, Any]]  # {"metadata": {service_path: {id, text, full_server_info}}}
+    metadata_mtime: Optional[float]
+    tool_vectors: Optional["MappedToolVectors"]  # Per-tool embeddings precomputed by the registry
+    tool_vectors_mtime: Optional[float]
+    tag_index: Optional["TagIndex"]  # Built from metadata whenever it is (re)loaded
+
+
+_EMPTY_FAISS_SNAPSHOT_MCPGW = FaissSnapshotMcpgw(None, None, None, None, None, None, None)
+
+_faiss_data_lock = asyncio.Lock()  # Serialises loaders only; readers take the published snapshot without locking
 _embedding_model_mcpgw: Optional[SentenceTransformer] = None
-_faiss_index_mcpgw: Optional[faiss.Index] = None
-_faiss_metadata_mcpgw: Optional[Dict[str, Any]] = None # This will store the content of service_index_metadata.json
-_last_faiss_index_mtime: Optional[float] = None
-_last_faiss_metadata_mtime: Optional[float] = None
-_last_faiss_check_time: Optional[float] = None  # Track when we last checked for file updates
-_faiss_check_interval: float = 5.0  # Only check for file updates every 5 seconds
+_faiss_snapshot_mcpgw: Optional[FaissSnapshotMcpgw] = None  # None until the first load has finished
+_faiss_watcher_task: Optional[asyncio.Task] = None
+_faiss_check_interval: float = 5.0  # How often the background watcher checks the registry files
 
 # Determine base path for mcpgw server to find registry's server data
 # When running in Docker, server.py is at /app/server.py and registry files are at /app/registry/servers/
 _registry_server_data_path = Path(__file__).resolve().parent / "registry" / "servers"
 FAISS_INDEX_PATH_MCPGW = _registry_server_data_path / "service_index.faiss"
 FAISS_METADATA_PATH_MCPGW = _registry_server_data_path / "service_index_metadata.json"
+# Binary copy of the metadata written by the registry; memory-mapped instead of parsed
+FAISS_METADATA_BIN_PATH_MCPGW = _registry_server_data_path / "service_index_metadata.bin"
+# Normalised per-tool embeddings written by the registry, so tools are not re-encoded per query
+FAISS_TOOL_VECTORS_PATH_MCPGW = _registry_server_data_path / "service_index_tool_vectors.bin"
+# Map the index read-only so processes share page cache instead of private copies
+FAISS_READ_FLAGS_MCPGW = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
 EMBEDDING_DIMENSION_MCPGW = 384 # Should match the one used in main registry
 
 # Get configuration from environment variables
 EMBEDDINGS_MODEL_NAME = os.environ.get('EMBEDDINGS_MODEL_NAME', 'all-MiniLM-L6-v2')
 EMBEDDINGS_MODEL_DIR = _registry_server_data_path.parent / "models" / EMBEDDINGS_MODEL_NAME
+# torch, or onnx for an int8-quantised ONNX Runtime model (needs sentence-transformers[onnx])
+EMBEDDINGS_BACKEND = os.environ.get('EMBEDDINGS_BACKEND', 'torch').lower()
+EMBEDDINGS_ONNX_QUANTIZATION = os.environ.get('EMBEDDINGS_ONNX_QUANTIZATION', 'avx2').lower()
+EMBEDDINGS_ONNX_EXPORT_DIR = EMBEDDINGS_MODEL_DIR.with_name(f"{EMBEDDINGS_MODEL_NAME}-onnx")
+
+
+def _load_sentence_transformer_mcpgw(model_source: str) -> SentenceTransformer:
+    """Load the embedding model with the configured backend, falling back to PyTorch.
+
+    Mirrors registry/search/onnx_backend.py; the registry normally exports the
+    quantised model first, so mcpgw usually just loads the existing file.
+    """
+    if EMBEDDINGS_BACKEND != "onnx":
+        return SentenceTransformer(model_source)
+
+    try:
+        if not EMBEDDINGS_ONNX_QUANTIZATION:
+            return SentenceTransformer(model_source, backend="onnx")
+
+        file_name = f"onnx/model_qint8_{EMBEDDINGS_ONNX_QUANTIZATION}.onnx"
+        source_dir = Path(model_source)
+        target_dir = source_dir if source_dir.is_dir() else EMBEDDINGS_ONNX_EXPORT_DIR
+        if not (target_dir / file_name).exists():
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+            model = SentenceTransformer(model_source, backend="onnx")
+            if target_dir != source_dir:
+                model.save(str(target_dir))
+            export_dynamic_quantized_onnx_model(model, EMBEDDINGS_ONNX_QUANTIZATION, str(target_dir))
+        return SentenceTransformer(str(target_dir), backend="onnx", model_kwargs={"file_name": file_name})
+    except Exception as e:
+        logger.warning(f"MCPGW: ONNX embedding backend unavailable ({e}). Falling back to PyTorch.")
+        return SentenceTransformer(model_source)
+
+# Micro-batching of query/tool encodes. Mirrors registry/search/embedding_batcher.py;
+# mcpgw is packaged separately and cannot import from the registry.
+EMBEDDING_BATCH_MAX_SIZE = int(os.environ.get('MCPGW_EMBEDDING_BATCH_MAX_SIZE', '32'))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.environ.get('MCPGW_EMBEDDING_BATCH_MAX_WAIT_MS', '5'))
+EMBEDDING_BATCH_STATS_LOG_EVERY = 100  # Log batching metrics every N batches
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent encode requests into one batched encode call on a worker thread."""
+
+    def __init__(self, encode_fn: Callable[[List[str]], Any], max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.max_batch_texts = 0
+        self.total_queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts as part of the next batch and return their (n, d) embeddings."""
+        if not texts:
+            raise ValueError("encode() requires at least one text")
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((list(texts), future, time.monotonic()))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            batch, batch_texts = [first], len(first[0])
+            deadline = time.monotonic() + self.max_wait_seconds
+            while batch_texts < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if batch_texts + len(item[0]) > self.max_batch_size:
+                    await self._dispatch(batch)
+                    batch, batch_texts = [item], len(item[0])
+                    deadline = time.monotonic() + self.max_wait_seconds
+                    continue
+                batch.append(item)
+                batch_texts += len(item[0])
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch) -> None:
+        started = time.monotonic()
+        all_texts: List[str] = []
+        for texts, _, enqueued_at in batch:
+            all_texts.extend(texts)
+            wait = started - enqueued_at
+            self.total_queue_wait_seconds += wait
+            self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, wait)
+        self.batches += 1
+        self.requests += len(batch)
+        self.texts += len(all_texts)
+        self.max_batch_texts = max(self.max_batch_texts, len(all_texts))
+        if self.batches % EMBEDDING_BATCH_STATS_LOG_EVERY == 0:
+            logger.info(f"MCPGW: Embedding batcher stats: {self.stats()}")
+
+        try:
+            embeddings = np.asarray(await asyncio.to_thread(self._encode_fn, all_texts), dtype=np.float32)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for texts, future, _ in batch:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(texts)])
+            offset += len(texts)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch size and queue wait metrics."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "avg_batch_size": (self.texts / self.batches) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_texts,
+            "avg_queue_wait_ms": (self.total_queue_wait_seconds / self.requests * 1000.0) if self.requests else 0.0,
+            "max_queue_wait_ms": self.max_queue_wait_seconds * 1000.0,
+        }
+
+
+_embedding_batcher_mcpgw = EmbeddingBatcher(
+    lambda texts: _embedding_model_mcpgw.encode(texts),
+    max_batch_size=EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=EMBEDDING_BATCH_MAX_WAIT_MS,
+)
+
+
+# Reader for the binary metadata file. Mirrors registry/search/metadata_file.py;
+# layout: header | ID table sorted by FAISS ID | (path length, path, JSON entry) records.
+_METADATA_FILE_MAGIC = b"MCPGWMD1"
+_METADATA_HEADER = struct.Struct("<8sQ")
+_METADATA_PATH_LENGTH = struct.Struct("<I")
+_METADATA_ID_TABLE_DTYPE = np.dtype([("id", "<i8"), ("offset", "<u8"), ("length", "<u8")])
+
+
+class MappedMetadata(Mapping):
+    """Read-only, memory-mapped view of the registry metadata, keyed by service path."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _METADATA_HEADER.unpack_from(self._mmap, 0)
+        if magic != _METADATA_FILE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a metadata file")
+        self._table = np.frombuffer(
+            self._mmap, dtype=_METADATA_ID_TABLE_DTYPE, count=count, offset=_METADATA_HEADER.size
+        )
+        self._rows_by_path = {self._read_path(row)[0]: row for row in range(count)}
+        self._decoded: Dict[int, Dict[str, Any]] = {}
+
+    def _read_path(self, row: int) -> Tuple[str, int]:
+        offset = int(self._table[row]["offset"])
+        (path_length,) = _METADATA_PATH_LENGTH.unpack_from(self._mmap, offset)
+        start = offset + _METADATA_PATH_LENGTH.size
+        return self._mmap[start:start + path_length].decode("utf-8"), start + path_length
+
+    def _entry(self, row: int) -> Dict[str, Any]:
+        entry = self._decoded.get(row)
+        if entry is None:
+            _, body_start = self._read_path(row)
+            end = int(self._table[row]["offset"]) + int(self._table[row]["length"])
+            entry = json.loads(self._mmap[body_start:end])
+            self._decoded[row] = entry
+        return entry
+
+    def path_for_id(self, faiss_id: int) -> Optional[str]:
+        ids = self._table["id"]
+        row = int(np.searchsorted(ids, faiss_id))
+        if row < len(ids) and ids[row] == faiss_id:
+            return self._read_path(row)[0]
+        return None
+
+    def __getitem__(self, path: str) -> Dict[str, Any]:
+        return self._entry(self._rows_by_path[path])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows_by_path)
+
+    def __len__(self) -> int:
+        return len(self._rows_by_path)
+
+
+# Reader for the tool vectors file. Mirrors registry/search/metadata_file.py;
+# layout: header | [server_path, tool_name, text_hash] keys as JSON | padding | float32 rows.
+_TOOL_VECTORS_FILE_MAGIC = b"MCPGWTV1"
+_TOOL_VECTORS_HEADER = struct.Struct("<8sQIQ")
+_TOOL_VECTORS_ALIGNMENT = 64
+
+
+class MappedToolVectors:
+    """Read-only, memory-mapped view of the registry's L2-normalised tool embeddings."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, dimension, keys_length = _TOOL_VECTORS_HEADER.unpack_from(self._mmap, 0)
+        if magic != _TOOL_VECTORS_FILE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a tool vectors file")
+        keys_start = _TOOL_VECTORS_HEADER.size
+        keys = json.loads(self._mmap[keys_start:keys_start + keys_length])
+        self._rows = {
+            (server_path, tool_name): (row, text_hash)
+            for row, (server_path, tool_name, text_hash) in enumerate(keys)
+        }
+        matrix_offset = -(-(keys_start + keys_length) // _TOOL_VECTORS_ALIGNMENT) * _TOOL_VECTORS_ALIGNMENT
+        self.vectors = np.frombuffer(
+            self._mmap, dtype=np.float32, count=count * dimension, offset=matrix_offset
+        ).reshape(count, dimension)
+
+    def row_for(self, server_path: str, tool_name: str, text_hash: Optional[str] = None) -> Optional[int]:
+        found = self._rows.get((server_path, tool_name))
+        if found is None or (text_hash is not None and found[1] != text_hash):
+            return None
+        return found[0]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def _normalize_server_tags_mcpgw(server_tags: Any) -> List[str]:
+    """Lowercase, stripped tags from a comma-separated string or a list."""
+    if isinstance(server_tags, str):
+        return [tag.strip().lower() for tag in server_tags.split(",") if tag.strip()]
+    return [str(tag).lower().strip() for tag in server_tags] if server_tags else []
+
+
+class TagIndex:
+    """
+    Normalised tag -> service path posting lists, built once per metadata load.
+
+    An AND-of-tags query is the intersection of its posting lists, smallest first;
+    matches come back in metadata order, as the full scan returned them.
+    """
+
+    def __init__(self, metadata: Mapping):
+        postings: Dict[str, set] = {}
+        self._order: Dict[str, int] = {}
+        for rank, (service_path, entry) in enumerate(metadata.items()):
+            self._order[service_path] = rank
+            full_server_info = entry.get("full_server_info") if isinstance(entry, dict) else None
+            if not full_server_info:
+                continue
+            for tag in _normalize_server_tags_mcpgw(full_server_info.get("tags", "")):
+                postings.setdefault(tag, set()).add(service_path)
+        self._postings: Dict[str, FrozenSet[str]] = {tag: frozenset(paths) for tag, paths in postings.items()}
+
+    def services_with_all_tags(self, tags: Iterable[str]) -> List[str]:
+        """Return the services carrying every one of the (normalised) tags."""
+        posting_lists = sorted((self._postings.get(tag, frozenset()) for tag in set(tags)), key=len)
+        if not posting_lists:
+            return []
+        matches = set(posting_lists[0])
+        for posting_list in posting_lists[1:]:
+            if not matches:
+                break
+            matches &= posting_list
+        return sorted(matches, key=self._order.__getitem__)
+
+
+def _tool_text_for_embedding_mcpgw(server_name: str, tool_info: Dict[str, Any]) -> str:
+    """Tool text as embedded by the registry (FaissService._get_text_for_tool)."""
+    parsed_description = tool_info.get("parsed_description", {}) or {}
+    tool_desc = parsed_description.get("main") or tool_info.get("description") or "No description."
+    return f"Service: {server_name}. Tool: {tool_info.get('name', '')}. Description: {tool_desc}"
+
+async def _load_embedding_model_mcpgw() -> None:
+    """Load the embedding model if not already loaded (model doesn't change on disk typically)."""
+    global _embedding_model_mcpgw
+    if _embedding_model_mcpgw is not None:
+        return
+    try:
+        model_cache_path = _registry_server_data_path.parent / ".cache"
+        model_cache_path.mkdir(parents=True, exist_ok=True)
+        
+        # Set SENTENCE_TRANSFORMERS_HOME to use the defined cache path
+        original_st_home = os.environ.get('SENTENCE_TRANSFORMERS_HOME')
+        os.environ['SENTENCE_TRANSFORMERS_HOME'] = str(model_cache_path)
+        
+        # Check if the model path exists and is not empty
+        model_path = Path(EMBEDDINGS_MODEL_DIR)
+        model_exists = model_path.exists() and any(model_path.iterdir()) if model_path.exists() else False
+        
+        if model_exists:
+            logger.info(f"MCPGW: Loading SentenceTransformer model from local path: {EMBEDDINGS_MODEL_DIR}")
+            _embedding_model_mcpgw = await asyncio.to_thread(_load_sentence_transformer_mcpgw, str(EMBEDDINGS_MODEL_DIR))
+        else:
+            logger.info(f"MCPGW: Local model not found at {EMBEDDINGS_MODEL_DIR}, downloading from Hugging Face")
+            _embedding_model_mcpgw = await asyncio.to_thread(_load_sentence_transformer_mcpgw, str(EMBEDDINGS_MODEL_NAME))
+        
+        # Restore original environment variable if it was set
+        if original_st_home:
+            os.environ['SENTENCE_TRANSFORMERS_HOME'] = original_st_home
+        else:
+            del os.environ['SENTENCE_TRANSFORMERS_HOME'] # Remove if not originally set
+            
+        logger.info("MCPGW: SentenceTransformer model loaded successfully.")
+    except Exception as e:
+        logger.error(f"MCPGW: Failed to load SentenceTransformer model: {e}", exc_info=True)
+
+
+async def _file_mtime_mcpgw(path: Path) -> Optional[float]:
+    try:
+        return await asyncio.to_thread(os.path.getmtime, path)
+    except OSError:
+        return None
+
+
+async def _build_faiss_snapshot_mcpgw(current: FaissSnapshotMcpgw) -> FaissSnapshotMcpgw:
+    """
+    Build the next snapshot from the registry files, reusing parts of current whose files are unchanged.
+
+    Everything is loaded into locals, so requests keep using current until the caller publishes
+    the result.
+    """
+    index, index_mtime = current.index, current.index_mtime
+    metadata, metadata_mtime = current.metadata, current.metadata_mtime
+    tool_vectors, tool_vectors_mtime = current.tool_vectors, current.tool_vectors_mtime
+    tag_index = current.tag_index
+
+    # Check FAISS index file
+    index_file_changed = False
+    current_index_mtime = await _file_mtime_mcpgw(FAISS_INDEX_PATH_MCPGW)
+    if current_index_mtime is None:
+        logger.warning(f"MCPGW: FAISS index file {FAISS_INDEX_PATH_MCPGW} does not exist.")
+        index, index_mtime = None, None
+    elif index is None or index_mtime is None or current_index_mtime > index_mtime:
+        try:
+            logger.info(f"MCPGW: FAISS index file {FAISS_INDEX_PATH_MCPGW} has changed or not loaded. Reloading...")
+            index = await asyncio.to_thread(faiss.read_index, str(FAISS_INDEX_PATH_MCPGW), FAISS_READ_FLAGS_MCPGW)
+            index_mtime = current_index_mtime
+            index_file_changed = True # Mark that it was reloaded
+            logger.info(f"MCPGW: FAISS index loaded. Total vectors: {index.ntotal}")
+            if index.d != EMBEDDING_DIMENSION_MCPGW:
+                logger.warning(f"MCPGW: Loaded FAISS index dimension ({index.d}) differs from expected ({EMBEDDING_DIMENSION_MCPGW}). Search might be compromised.")
+        except Exception as e:
+            logger.error(f"MCPGW: Failed to load FAISS index: {e}", exc_info=True)
+            index, index_mtime = None, None
+    else:
+        logger.debug("MCPGW: FAISS index file unchanged since last load.")
+
+    # Check FAISS metadata file, preferring the memory-mapped binary copy
+    binary_mtime = await _file_mtime_mcpgw(FAISS_METADATA_BIN_PATH_MCPGW)
+    json_mtime = await _file_mtime_mcpgw(FAISS_METADATA_PATH_MCPGW) if binary_mtime is None else None
+    current_metadata_mtime = binary_mtime if binary_mtime is not None else json_mtime
+    if current_metadata_mtime is None:
+        logger.warning(f"MCPGW: FAISS metadata file {FAISS_METADATA_PATH_MCPGW} does not exist.")
+        metadata, metadata_mtime, tag_index = None, None, None
+    elif metadata is None or metadata_mtime is None or current_metadata_mtime > metadata_mtime or index_file_changed:
+        try:
+            if binary_mtime is not None:
+                logger.info(f"MCPGW: Mapping FAISS metadata file {FAISS_METADATA_BIN_PATH_MCPGW}...")
+                metadata = {"metadata": await asyncio.to_thread(MappedMetadata, FAISS_METADATA_BIN_PATH_MCPGW)}
+            else:
+                logger.info(f"MCPGW: FAISS metadata file {FAISS_METADATA_PATH_MCPGW} has changed, not loaded, or index changed. Reloading...")
+                content = await asyncio.to_thread(FAISS_METADATA_PATH_MCPGW.read_text)
+                metadata = await asyncio.to_thread(json.loads, content)
+            metadata_mtime = current_metadata_mtime
+            tag_index = await asyncio.to_thread(TagIndex, metadata.get("metadata", {}))
+            logger.info(f"MCPGW: FAISS metadata loaded. Paths: {len(metadata.get('metadata', {}))}")
+        except Exception as e:
+            logger.error(f"MCPGW: Failed to load FAISS metadata: {e}", exc_info=True)
+            metadata, metadata_mtime, tag_index = None, None, None
+    else:
+        logger.debug("MCPGW: FAISS metadata file unchanged since last load.")
+
+    # Check the precomputed tool vectors; without them tools are encoded per query
+    current_vectors_mtime = await _file_mtime_mcpgw(FAISS_TOOL_VECTORS_PATH_MCPGW)
+    if current_vectors_mtime is None:
+        tool_vectors, tool_vectors_mtime = None, None
+    elif tool_vectors is None or tool_vectors_mtime is None or current_vectors_mtime > tool_vectors_mtime:
+        try:
+            tool_vectors = await asyncio.to_thread(MappedToolVectors, FAISS_TOOL_VECTORS_PATH_MCPGW)
+            tool_vectors_mtime = current_vectors_mtime
+            logger.info(f"MCPGW: Tool vectors mapped. Tools: {len(tool_vectors)}")
+        except Exception as e:
+            logger.error(f"MCPGW: Failed to map tool vectors: {e}", exc_info=True)
+            tool_vectors, tool_vectors_mtime = None, None
+
+    return FaissSnapshotMcpgw(
+        index, index_mtime, metadata, metadata_mtime, tool_vectors, tool_vectors_mtime, tag_index
+    )
+
 
 async def load_faiss_data_for_mcpgw():
     """Loads the FAISS index, metadata, and embedding model for the mcpgw server.
        Reloads data if underlying files have changed since last load.
+
+       The new data is published by swapping a single snapshot reference, so requests
+       never wait for a reload and never see an index paired with stale metadata.
     """
-    global _embedding_model_mcpgw, _faiss_index_mcpgw, _faiss_metadata_mcpgw
-    global _last_faiss_index_mtime, _last_faiss_metadata_mtime
+    global _faiss_snapshot_mcpgw
     
     async with _faiss_data_lock:
-        # Load embedding model if not already loaded (model doesn't change on disk typically)
+        await _load_embedding_model_mcpgw()
         if _embedding_model_mcpgw is None:
-            try:
-                model_cache_path = _registry_server_data_path.parent / ".cache"
-                model_cache_path.mkdir(parents=True, exist_ok=True)
-                
-                # Set SENTENCE_TRANSFORMERS_HOME to use the defined cache path
-                original_st_home = os.environ.get('SENTENCE_TRANSFORMERS_HOME')
-                os.environ['SENTENCE_TRANSFORMERS_HOME'] = str(model_cache_path)
-                
-                # Check if the model path exists and is not empty
-                model_path = Path(EMBEDDINGS_MODEL_DIR)
-                model_exists = model_path.exists() and any(model_path.iterdir()) if model_path.exists() else False
-                
-                if model_exists:
-                    logger.info(f"MCPGW: Loading SentenceTransformer model from local path: {EMBEDDINGS_MODEL_DIR}")
-                    _embedding_model_mcpgw = await asyncio.to_thread(SentenceTransformer, str(EMBEDDINGS_MODEL_DIR))
-                else:
-                    logger.info(f"MCPGW: Local model not found at {EMBEDDINGS_MODEL_DIR}, downloading from Hugging Face")
-                    _embedding_model_mcpgw = await asyncio.to_thread(SentenceTransformer, str(EMBEDDINGS_MODEL_NAME))
-                
-                # Restore original environment variable if it was set
-                if original_st_home:
-                    os.environ['SENTENCE_TRANSFORMERS_HOME'] = original_st_home
-                else:
-                    del os.environ['SENTENCE_TRANSFORMERS_HOME'] # Remove if not originally set
-                    
-                logger.info("MCPGW: SentenceTransformer model loaded successfully.")
-            except Exception as e:
-                logger.error(f"MCPGW: Failed to load SentenceTransformer model: {e}", exc_info=True)
-                return # Cannot proceed without the model for subsequent logic
+            return # Cannot proceed without the model for subsequent logic
+        _faiss_snapshot_mcpgw = await _build_faiss_snapshot_mcpgw(_faiss_snapshot_mcpgw or _EMPTY_FAISS_SNAPSHOT_MCPGW)
 
-        # Check FAISS index file
-        index_file_changed = False
-        if FAISS_INDEX_PATH_MCPGW.exists():
-            try:
-                current_index_mtime = await asyncio.to_thread(os.path.getmtime, FAISS_INDEX_PATH_MCPGW)
-                if _faiss_index_mcpgw is None or _last_faiss_index_mtime is None or current_index_mtime > _last_faiss_index_mtime:
-                    logger.info(f"MCPGW: FAISS index file {FAISS_INDEX_PATH_MCPGW} has changed or not loaded. Reloading...")
-                    _faiss_index_mcpgw = await asyncio.to_thread(faiss.read_index, str(FAISS_INDEX_PATH_MCPGW))
-                    _last_faiss_index_mtime = current_index_mtime
-                    index_file_changed = True # Mark that it was reloaded
-                    logger.info(f"MCPGW: FAISS index loaded. Total vectors: {_faiss_index_mcpgw.ntotal}")
-                    if _faiss_index_mcpgw.d != EMBEDDING_DIMENSION_MCPGW:
-                        logger.warning(f"MCPGW: Loaded FAISS index dimension ({_faiss_index_mcpgw.d}) differs from expected ({EMBEDDING_DIMENSION_MCPGW}). Search might be compromised.")
-                else:
-                    logger.debug("MCPGW: FAISS index file unchanged since last load.")
-            except Exception as e:
-                logger.error(f"MCPGW: Failed to load or check FAISS index: {e}", exc_info=True)
-                _faiss_index_mcpgw = None # Ensure it's None on error
-        else:
-            logger.warning(f"MCPGW: FAISS index file {FAISS_INDEX_PATH_MCPGW} does not exist.")
-            _faiss_index_mcpgw = None
-            _last_faiss_index_mtime = None
 
-        # Check FAISS metadata file
-        metadata_file_changed = False
-        if FAISS_METADATA_PATH_MCPGW.exists():
-            try:
-                logger.info(f"MCPGW: Checking FAISS metadata file {FAISS_METADATA_PATH_MCPGW} for changes...")
-                current_metadata_mtime = await asyncio.to_thread(os.path.getmtime, FAISS_METADATA_PATH_MCPGW)
-                if _faiss_metadata_mcpgw is None or _last_faiss_metadata_mtime is None or current_metadata_mtime > _last_faiss_metadata_mtime or index_file_changed:
-                    logger.info(f"MCPGW: FAISS metadata file {FAISS_METADATA_PATH_MCPGW} has changed, not loaded, or index changed. Reloading...")
-                    with open(FAISS_METADATA_PATH_MCPGW, "r") as f:
-                        content = await asyncio.to_thread(f.read)
-                        _faiss_metadata_mcpgw = await asyncio.to_thread(json.loads, content)
-                    _last_faiss_metadata_mtime = current_metadata_mtime
-                    metadata_file_changed = True
-                    logger.info(f"MCPGW: FAISS metadata loaded. Paths: {len(_faiss_metadata_mcpgw.get('metadata', {})) if _faiss_metadata_mcpgw else 'N/A'}")
-                    logger.info(f"MCPGW: FAISS metadata _faiss_metadata_mcpgw {_faiss_metadata_mcpgw.get('metadata')}")
-                else:
-                    logger.debug("MCPGW: FAISS metadata file unchanged since last load.")
-            except Exception as e:
-                logger.error(f"MCPGW: Failed to load or check FAISS metadata: {e}", exc_info=True)
-                _faiss_metadata_mcpgw = None # Ensure it's None on error
-        else:
-            logger.warning(f"MCPGW: FAISS metadata file {FAISS_METADATA_PATH_MCPGW} does not exist.")
-            _faiss_metadata_mcpgw = None
-            _last_faiss_metadata_mtime = None
+async def _watch_faiss_files_mcpgw() -> None:
+    """Reload FAISS data in the background whenever the registry rewrites its files."""
+    while True:
+        await asyncio.sleep(_faiss_check_interval)
+        try:
+            await load_faiss_data_for_mcpgw()
+        except Exception as e:
+            logger.error(f"MCPGW: Background FAISS reload failed: {e}", exc_info=True)
+
+
+def _ensure_faiss_watcher_mcpgw() -> None:
+    """Start the background watcher on the running event loop, once."""
+    global _faiss_watcher_task
+    if _faiss_watcher_task is None or _faiss_watcher_task.done():
+        _faiss_watcher_task = asyncio.create_task(_watch_faiss_files_mcpgw())
+
 
-# Call it once at startup, but allow lazy loading if it fails initially
-# This direct call might be problematic if server.py is imported elsewhere before app runs.
-# A better approach would be a startup event if FastMCP supports it.
-# For now, it will attempt to load on first tool call if still None.
-# asyncio.create_task(load_faiss_data_for_mcpgw()) # Consider FastMCP startup hook
+# The first tool call loads the data and starts the watcher; after that, reloads
+# happen in the background and tool calls only read the published snapshot.
 
 # --- FAISS and Sentence Transformer Integration for mcpgw --- END
 
@@ -665,6 +1058,162 @@ logger.info(f"Environment variables - MCP_TRANSPORT: {os.environ.get('MCP_TRANSP
 mcp = FastMCP("MCPGateway")
 
 
+# --- Shared HTTP client for registry and auth server calls ---
+REGISTRY_HTTP_MAX_CONNECTIONS = int(os.environ.get('MCPGW_HTTP_MAX_CONNECTIONS', '100'))
+REGISTRY_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('MCPGW_HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+REGISTRY_HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get('MCPGW_HTTP_KEEPALIVE_EXPIRY_SECONDS', '30'))
+REGISTRY_HTTP_STATS_EVERY = 500  # Log (and report) client metrics every N requests
+REGISTRY_HTTP_LATENCY_WINDOW = 1000  # Recent requests kept for latency percentiles
+METRICS_SERVICE_URL = os.environ.get('METRICS_SERVICE_URL', 'http://localhost:8890')
+METRICS_API_KEY = os.environ.get('METRICS_API_KEY', '')
+
+
+class PooledHttpClient:
+    """
+    Long-lived httpx.AsyncClient shared by every outbound call, with pool metrics.
+
+    Connections are kept alive between tool calls instead of paying TCP/TLS setup
+    per call; HTTP/2 is used when the h2 package is installed. The client is bound
+    to the event loop that first uses it, like the embedding batcher, and is
+    replaced (closing the old one) if that loop changes. Per-call timeouts override
+    the default. main() closes it when the server shuts down.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 15.0,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = importlib.util.find_spec("h2") is not None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics_tasks: set = set()
+        self.requests = 0
+        self.errors = 0
+        self.connections_opened = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._latencies_ms: deque = deque(maxlen=REGISTRY_HTTP_LATENCY_WINDOW)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            previous = self._client
+            self._loop = loop
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+            if previous is not None and not previous.is_closed:
+                await self._close_client(previous)
+        return self._client
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient) -> None:
+        # A client left behind by a finished loop still holds its pooled sockets;
+        # closing them reports the dead loop, but the sockets are released
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"MCPGW: Error closing previous registry HTTP client: {e}")
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        # httpcore reports each new TCP connection; requests without one reused the pool
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the shared pool; accepts httpx request kwargs such as timeout."""
+        client = await self._get_client()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            return await client.request(method, url, extensions={"trace": self._trace}, **kwargs)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            self.requests += 1
+            if self.requests % REGISTRY_HTTP_STATS_EVERY == 0:
+                self._report_stats()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool utilisation, connection reuse and latency metrics."""
+        latencies = sorted(self._latencies_ms)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "connections_opened": self.connections_opened,
+            "connection_reuse_ratio": (1.0 - self.connections_opened / self.requests) if self.requests else 0.0,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "pool_utilisation": self.in_flight / self.limits.max_connections,
+            "peak_pool_utilisation": self.max_in_flight / self.limits.max_connections,
+            "latency_p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+            "latency_p95_ms": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            "http2": self.http2,
+        }
+
+    def _report_stats(self) -> None:
+        """Log the metrics and, when configured, send them to the metrics service."""
+        stats = self.stats()
+        logger.info(f"MCPGW: Registry HTTP client stats: {stats}")
+        if not METRICS_API_KEY:
+            return
+        task = asyncio.get_running_loop().create_task(self._emit_stats(stats))
+        self._metrics_tasks.add(task)
+        task.add_done_callback(self._metrics_tasks.discard)
+
+    async def _emit_stats(self, stats: Dict[str, Any]) -> None:
+        # Same payload shape as registry/metrics/client.py MetricsClient.emit_custom_metric
+        payload = {
+            "service": "mcpgw",
+            "version": "1.0.0",
+            "metrics": [{
+                "type": "custom",
+                "value": stats["peak_pool_utilisation"],
+                "duration_ms": stats["latency_p50_ms"],
+                "dimensions": {"metric_name": "registry_http_client"},
+                "metadata": stats,
+            }],
+        }
+        try:
+            client = await self._get_client()
+            await client.post(
+                f"{METRICS_SERVICE_URL}/metrics", json=payload, headers={"X-API-Key": METRICS_API_KEY}, timeout=5.0
+            )
+        except Exception as e:
+            logger.debug(f"MCPGW: Failed to emit registry HTTP client metrics: {e}")
+
+    async def aclose(self) -> None:
+        """Close the pooled connections; called once at server shutdown."""
+        if self._client is not None:
+            client, self._client, self._loop = self._client, None, None
+            await self._close_client(client)
+
+
+_http_client_mcpgw = PooledHttpClient(
+    max_connections=REGISTRY_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=REGISTRY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=REGISTRY_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    timeout=Constants.REQUEST_TIMEOUT,
+)
+
+
 # --- Helper function for making requests to the registry ---
 async def _call_registry_api(method: str, endpoint: str, ctx: Context = None, **kwargs) -> Dict[str, Any]:
     """
@@ -711,37 +1260,39 @@ async def _call_registry_api(method: str, endpoint: str, ctx: Context = None, **
     else:
         kwargs['headers'] = auth_headers
 
-    # Use a single client instance for potential connection pooling benefits
     # Get admin credentials from environment for registry API authentication
     registry_username = os.environ.get("REGISTRY_USERNAME")
     registry_password = os.environ.get("REGISTRY_PASSWORD")
     auth = httpx.BasicAuth(registry_username, registry_password) if registry_username and registry_password else None
 
-    async with httpx.AsyncClient(timeout=Constants.REQUEST_TIMEOUT, auth=auth) as client:
+    if auth is not None:
+        kwargs.setdefault('auth', auth)
+
+    # Requests go through the shared connection pool; callers may pass timeout= per call
+    try:
+        logger.info(f"Calling Registry API: {method} {url}") # Log the actual call
+        response = await _http_client_mcpgw.request(method, url, **kwargs)
+        response.raise_for_status() # Raise HTTPStatusError for bad responses (4xx or 5xx)
+
+        # Handle cases where response might be empty (e.g., 204 No Content)
+        if response.status_code == 204:
+            return {"status": "success", "message": "Operation successful, no content returned."}
+        return response.json()
+
+    except httpx.HTTPStatusError as e:
+        # Handle HTTP errors
+        error_detail = "No specific error detail provided."
         try:
-            logger.info(f"Calling Registry API: {method} {url}") # Log the actual call
-            response = await client.request(method, url, **kwargs)
-            response.raise_for_status() # Raise HTTPStatusError for bad responses (4xx or 5xx)
-
-            # Handle cases where response might be empty (e.g., 204 No Content)
-            if response.status_code == 204:
-                return {"status": "success", "message": "Operation successful, no content returned."}
-            return response.json()
-
-        except httpx.HTTPStatusError as e:
-            # Handle HTTP errors
-            error_detail = "No specific error detail provided."
-            try:
-                error_detail = e.response.json().get("detail", error_detail)
-            except Exception as json_error:
-                # Log that we couldn't get detailed error from JSON, but continue with existing error info
-                logger.debug(f"MCPGW: Could not extract detailed error from response: {json_error}")
-            raise Exception(f"Registry API Error ({e.response.status_code}): {error_detail} for {method} {url}") from e
-        except httpx.RequestError as e:
-            # Network or connection error during the API call
-            raise Exception(f"Registry API Request Error: Failed to connect or communicate with {url}. Details: {e}") from e
-        except Exception as e: # Catch other potential errors during API call
-             raise Exception(f"An unexpected error occurred while calling the Registry API at {url}: {e}") from e
+            error_detail = e.response.json().get("detail", error_detail)
+        except Exception as json_error:
+            # Log that we couldn't get detailed error from JSON, but continue with existing error info
+            logger.debug(f"MCPGW: Could not extract detailed error from response: {json_error}")
+        raise Exception(f"Registry API Error ({e.response.status_code}): {error_detail} for {method} {url}") from e
+    except httpx.RequestError as e:
+        # Network or connection error during the API call
+        raise Exception(f"Registry API Request Error: Failed to connect or communicate with {url}. Details: {e}") from e
+    except Exception as e: # Catch other potential errors during API call
+         raise Exception(f"An unexpected error occurred while calling the Registry API at {url}: {e}") from e
 
 
 # --- MCP Tools ---
@@ -1090,30 +1641,63 @@ async def register_service(
     return await _call_registry_api("POST", endpoint, ctx, data=form_data)
 
 
+# Fields list_services returns unless others are requested; tool_list is left out
+# because it dominates the payload and intelligent_tool_finder serves tool lookups.
+LIST_SERVICES_DEFAULT_FIELDS = [
+    "server_name", "path", "description", "is_enabled", "tags", "num_tools", "health_status",
+]
+LIST_SERVICES_DEFAULT_LIMIT = 50
+
+
 @mcp.tool()
 async def list_services(
+    cursor: Optional[str] = Field(None, description="Pagination cursor: the next_cursor value from the previous page."),
+    limit: Optional[int] = Field(LIST_SERVICES_DEFAULT_LIMIT, description="Maximum number of services per page (1-1000)."),
+    fields: Optional[List[str]] = Field(
+        None,
+        description=(
+            "Fields to return for each service. Defaults to server_name, path, description, is_enabled, tags, "
+            "num_tools and health_status. Also available: proxy_pass_url, num_stars, is_python, license, "
+            "last_checked_iso and tool_list."
+        ),
+    ),
     ctx: Context = None
 ) -> Dict[str, Any]:
     """
-    Lists all registered MCP services in the gateway.
+    Lists registered MCP services in the gateway, one page at a time.
+
+    Args:
+        cursor: next_cursor from the previous page; omit for the first page.
+        limit: Maximum number of services per page.
+        fields: Fields to include for each service; tool_list is only returned when requested.
 
     Returns:
         A dictionary containing:
-        - services: List of service information with details like name, path, status, etc.
+        - services: List of service information with the requested fields
         - total_count: Total number of services
+        - next_cursor: Cursor for the next page, or None on the last page
 
     Example:
         services_info = await list_services()
-        for service in services_info["services"]:
-            print(f"Service: {service['server_name']} at {service['path']}")
+        while True:
+            for service in services_info["services"]:
+                print(f"Service: {service['server_name']} at {service['path']}")
+            if not services_info["next_cursor"]:
+                break
+            services_info = await list_services(cursor=services_info["next_cursor"])
     """
-    logger.info("MCPGW: list_services tool called")
+    logger.info(f"MCPGW: list_services tool called (cursor={cursor}, limit={limit}, fields={fields})")
 
-    # Call the registry's internal list endpoint
+    # Call the registry's internal list endpoint; paging and projection happen registry-side
     endpoint = "/api/internal/list"
+    params = {"fields": ",".join(fields or LIST_SERVICES_DEFAULT_FIELDS)}
+    if cursor:
+        params["cursor"] = cursor
+    if limit:
+        params["limit"] = limit
 
     try:
-        result = await _call_registry_api("GET", endpoint, ctx)
+        result = await _call_registry_api("GET", endpoint, ctx, params=params)
 
         if isinstance(result, dict) and "services" in result:
             logger.info(f"MCPGW: Successfully retrieved {result.get('total_count', len(result['services']))} services")
@@ -1123,6 +1707,7 @@ async def list_services(
             return {
                 "services": [],
                 "total_count": 0,
+                "next_cursor": None,
                 "error": "Unexpected response format from registry"
             }
 
@@ -1131,6 +1716,7 @@ async def list_services(
         return {
             "services": [],
             "total_count": 0,
+            "next_cursor": None,
             "error": f"Failed to retrieve services: {str(e)}"
         }
 
@@ -1226,16 +1812,15 @@ async def healthcheck(ctx: Context = None) -> Dict[str, Any]:
 
         logger.info(f"Calling internal health check endpoint: {healthcheck_url}")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(healthcheck_url, headers=headers)
+        response = await _http_client_mcpgw.post(healthcheck_url, headers=headers, timeout=5.0)
 
-            if response.status_code == 200:
-                health_data = response.json()
-                logger.info(f"Retrieved health status data for {len(health_data)} servers")
-                return health_data
-            else:
-                logger.error(f"Health check API returned status {response.status_code}: {response.text}")
-                raise Exception(f"Health check API call failed with status {response.status_code}")
+        if response.status_code == 200:
+            health_data = response.json()
+            logger.info(f"Retrieved health status data for {len(health_data)} servers")
+            return health_data
+        else:
+            logger.error(f"Health check API returned status {response.status_code}: {response.text}")
+            raise Exception(f"Health check API call failed with status {response.status_code}")
 
     except Exception as e:
         logger.error(f"Error retrieving health status: {e}")
@@ -1305,6 +1890,7 @@ async def intelligent_tool_finder(
     if not user_scopes:
         logger.warning("No user scopes found - user may not have access to any tools")
         return []
+    compiled_scopes = get_compiled_scopes(scopes_config)
 
     # Input validation - at least one of query or tags must be provided
     if not natural_language_query and not tags:
@@ -1315,31 +1901,25 @@ async def intelligent_tool_finder(
     if normalized_tags:
         logger.info(f"MCPGW: Filtering by tags: {normalized_tags}")
 
-    global _embedding_model_mcpgw, _faiss_index_mcpgw, _faiss_metadata_mcpgw, _last_faiss_check_time
-    import time
-
-    # Check for FAISS data updates, but only if enough time has passed since last check
-    current_time = time.time()
-    should_check_for_updates = (
-        _embedding_model_mcpgw is None or 
-        _faiss_index_mcpgw is None or 
-        _faiss_metadata_mcpgw is None or
-        _last_faiss_check_time is None or
-        (current_time - _last_faiss_check_time) >= _faiss_check_interval
-    )
-    
-    if should_check_for_updates:
+    # Reloads happen in the background; only a cold start waits for the first load
+    _ensure_faiss_watcher_mcpgw()
+    if _embedding_model_mcpgw is None or _faiss_snapshot_mcpgw is None:
         await load_faiss_data_for_mcpgw()
-        _last_faiss_check_time = current_time
 
+    # Read the snapshot once so this request sees one consistent index and metadata
+    snapshot = _faiss_snapshot_mcpgw
     if _embedding_model_mcpgw is None:
         raise Exception("MCPGW: Sentence embedding model is not available. Cannot perform intelligent search.")
-    if _faiss_index_mcpgw is None:
+    if snapshot is None or snapshot.index is None:
         raise Exception("MCPGW: FAISS index is not available. Cannot perform intelligent search.")
-    if _faiss_metadata_mcpgw is None or "metadata" not in _faiss_metadata_mcpgw:
+    if snapshot.metadata is None or "metadata" not in snapshot.metadata:
         raise Exception("MCPGW: FAISS metadata is not available or in unexpected format. Cannot perform intelligent search.")
 
-    registry_faiss_metadata = _faiss_metadata_mcpgw["metadata"] # This is {service_path: {id, text, full_server_info}}
+    faiss_index = snapshot.index
+    registry_faiss_metadata = snapshot.metadata["metadata"] # This is {service_path: {id, text, full_server_info}}
+    # Services carrying every requested tag: one set intersection over the posting lists
+    tag_index = snapshot.tag_index or TagIndex(registry_faiss_metadata)
+    services_matching_tags = tag_index.services_with_all_tags(normalized_tags) if normalized_tags else []
 
     # Determine which services to process based on whether we're doing semantic search
     services_to_process = []
@@ -1349,8 +1929,11 @@ async def intelligent_tool_finder(
         use_semantic_ranking = True
         # 1. Embed the natural language query
         try:
-            query_embedding = await asyncio.to_thread(_embedding_model_mcpgw.encode, [natural_language_query])
+            query_embedding = await _embedding_batcher_mcpgw.encode([natural_language_query])
             query_embedding_np = np.array(query_embedding, dtype=np.float32)
+            if faiss_index.metric_type == faiss.METRIC_INNER_PRODUCT:
+                # The registry stores normalised vectors in cosine mode
+                faiss.normalize_L2(query_embedding_np)
         except Exception as e:
             logger.error(f"MCPGW: Error encoding natural language query: {e}", exc_info=True)
             raise Exception(f"MCPGW: Error encoding query: {e}")
@@ -1359,25 +1942,30 @@ async def intelligent_tool_finder(
         # The FAISS index in registry/main.py stores SERVICE embeddings.
         try:
             logger.info(f"MCPGW: Searching FAISS index for top {top_k_services} services matching query.")
-            distances, faiss_ids = await asyncio.to_thread(_faiss_index_mcpgw.search, query_embedding_np, top_k_services)
+            distances, faiss_ids = await asyncio.to_thread(faiss_index.search, query_embedding_np, top_k_services)
         except Exception as e:
             logger.error(f"MCPGW: Error searching FAISS index: {e}", exc_info=True)
             raise Exception(f"MCPGW: Error searching FAISS index: {e}")
 
-        # Create a reverse map from FAISS internal ID to service_path for quick lookup
-        id_to_service_path_map = {}
-        for Svc_path, meta_item in registry_faiss_metadata.items():
-            if "id" in meta_item:
-                id_to_service_path_map[meta_item["id"]] = Svc_path
-            else:
-                logger.warning(f"MCPGW: Metadata for service {Svc_path} missing 'id' field. Skipping.")
+        if isinstance(registry_faiss_metadata, MappedMetadata):
+            # The mapped file carries a sorted ID table; no need to decode every entry
+            path_for_id = registry_faiss_metadata.path_for_id
+        else:
+            # Create a reverse map from FAISS internal ID to service_path for quick lookup
+            id_to_service_path_map = {}
+            for Svc_path, meta_item in registry_faiss_metadata.items():
+                if "id" in meta_item:
+                    id_to_service_path_map[meta_item["id"]] = Svc_path
+                else:
+                    logger.warning(f"MCPGW: Metadata for service {Svc_path} missing 'id' field. Skipping.")
+            path_for_id = id_to_service_path_map.get
 
         # Extract service paths from FAISS results
         for i in range(len(faiss_ids[0])):
             faiss_id = faiss_ids[0][i]
             if faiss_id == -1: # FAISS uses -1 for no more results or if k > ntotal
                 continue
-            service_path = id_to_service_path_map.get(faiss_id)
+            service_path = path_for_id(int(faiss_id))
             if service_path:
                 services_to_process.append(service_path)
                 logger.debug(f"MCPGW: Found service_path {service_path} for FAISS ID {faiss_id}")
@@ -1386,12 +1974,13 @@ async def intelligent_tool_finder(
 
         logger.info(f"MCPGW: Processing {len(services_to_process)} services from FAISS search results.")
     else:
-        # Tags-only mode: process all services
-        services_to_process = list(registry_faiss_metadata.keys())
-        logger.info(f"MCPGW: Tags-only mode - processing all {len(services_to_process)} services")
+        # Tags-only mode: only the services the tag index matched
+        services_to_process = services_matching_tags
+        logger.info(f"MCPGW: Tags-only mode - {len(services_to_process)} services match tags {normalized_tags}")
 
     candidate_tools = []
     tools_before_scope_filter = 0
+    matching_tag_set = set(services_matching_tags)
 
     # 3. Filter and Collect Tools from services
     for service_path in services_to_process:
@@ -1408,43 +1997,34 @@ async def intelligent_tool_finder(
             logger.info(f"MCPGW: Service {service_path} is disabled. Skipping its tools.")
             continue
 
-        # Apply tag filtering if tags are specified
-        if normalized_tags:
-            server_tags = full_server_info.get("tags", "")
-            if isinstance(server_tags, str):
-                server_tags_list = [tag.strip().lower() for tag in server_tags.split(",") if tag.strip()]
-            else:
-                server_tags_list = [str(tag).lower().strip() for tag in server_tags] if server_tags else []
-
-            # Check if all required tags are present (AND logic)
-            if not all(tag in server_tags_list for tag in normalized_tags):
-                logger.info(f"MCPGW: Service {service_path} does not match required tags {normalized_tags}, has tags {server_tags_list}. Skipping.")
-                continue
-            else:
-                logger.info(f"MCPGW: Service {service_path} matches required tags {normalized_tags}")
+        # Apply tag filtering if tags are specified (AND logic, resolved by the tag index)
+        if normalized_tags and service_path not in matching_tag_set:
+            logger.info(f"MCPGW: Service {service_path} does not match required tags {normalized_tags}. Skipping.")
+            continue
         logger.info(f"MCPGW: Processing service {service_path} with full_server_info: {full_server_info}")
         service_name = full_server_info.get("server_name", "Unknown Service")
         tool_list = full_server_info.get("tool_list", [])
         supported_transports = full_server_info.get("supported_transports", ["streamable-http"])
         auth_provider = full_server_info.get("auth_provider", None)
         logger.info(f"MCPGW: Found {len(tool_list)} tools for service {service_name} at path {service_path}, supported_transports: {supported_transports}") 
+        # Map service_path to server name for scope checking; resolved once per service
+        server_name = service_path.lstrip('/') if service_path.startswith('/') else service_path
+        allowed_tools = compiled_scopes.allowed_tools(user_scopes, server_name)
         for tool_info in tool_list:
             tool_name = tool_info.get("name", "Unknown Tool")
             parsed_desc = tool_info.get("parsed_description", {})
-            main_desc = parsed_desc.get("main", "No description.")
             
             tools_before_scope_filter += 1
             
             # Check if user has access to this tool based on scopes
-            # Map service_path to server name for scope checking
-            server_name = service_path.lstrip('/') if service_path.startswith('/') else service_path
-            logger.info(f"MCPGW: Checking access for user to tool {server_name}.{tool_name} with scopes {user_scopes}")
-            if not check_tool_access(server_name, tool_name, user_scopes, scopes_config):
-                logger.warning(f"User does not have access to tool {server_name}.{tool_name}, skipping")
+            if tool_name not in allowed_tools:
+                logger.debug(f"User does not have access to tool {server_name}.{tool_name}, skipping")
                 continue
             
-            # Create descriptive text for this specific tool
-            tool_text_for_embedding = f"Service: {service_name}. Tool: {tool_name}. Description: {main_desc}"
+            # Same text the registry embeds, so its precomputed vector can be reused
+            tool_text_for_embedding = _tool_text_for_embedding_mcpgw(
+                full_server_info.get("server_name", service_path.strip("/")), tool_info
+            )
             
             candidate_tools.append({
                 "text_for_embedding": tool_text_for_embedding,
@@ -1465,18 +2045,43 @@ async def intelligent_tool_finder(
 
     # Apply semantic ranking if we have a natural language query
     if use_semantic_ranking:
-        # 4. Embed all candidate tool descriptions
-        logger.info(f"MCPGW: Embedding {len(candidate_tools)} candidate tools (after scope filtering) for secondary ranking.")
-        try:
-            tool_texts = [tool["text_for_embedding"] for tool in candidate_tools]
-            tool_embeddings = await asyncio.to_thread(_embedding_model_mcpgw.encode, tool_texts)
-            tool_embeddings_np = np.array(tool_embeddings, dtype=np.float32)
-        except Exception as e:
-            logger.error(f"MCPGW: Error encoding tool descriptions: {e}", exc_info=True)
-            raise Exception(f"MCPGW: Error encoding tool descriptions: {e}")
+        # 4. Gather normalised tool vectors, reusing the registry's precomputed ones
+        query_vector = query_embedding_np[0] / max(float(np.linalg.norm(query_embedding_np[0])), 1e-12)
+        tool_vectors = snapshot.tool_vectors
+        if tool_vectors is not None and tool_vectors.vectors.shape[1] != query_vector.shape[0]:
+            logger.warning("MCPGW: Precomputed tool vectors do not match the model dimension. Re-encoding tools.")
+            tool_vectors = None
+        cached_rows = [
+            tool_vectors.row_for(
+                tool["service_path"],
+                tool["tool_name"],
+                hashlib.sha256(tool["text_for_embedding"].encode("utf-8")).hexdigest(),
+            ) if tool_vectors is not None else None
+            for tool in candidate_tools
+        ]
+        tool_embeddings_np = np.empty((len(candidate_tools), query_vector.shape[0]), dtype=np.float32)
+        cached_positions = [i for i, row in enumerate(cached_rows) if row is not None]
+        if cached_positions:
+            tool_embeddings_np[cached_positions] = tool_vectors.vectors[[cached_rows[i] for i in cached_positions]]
+
+        # Tools registered or changed since the registry's last snapshot are encoded here
+        missing_positions = [i for i, row in enumerate(cached_rows) if row is None]
+        logger.info(
+            f"MCPGW: Ranking {len(candidate_tools)} candidate tools (after scope filtering): "
+            f"{len(cached_positions)} precomputed, {len(missing_positions)} to encode."
+        )
+        if missing_positions:
+            try:
+                tool_texts = [candidate_tools[i]["text_for_embedding"] for i in missing_positions]
+                encoded = np.array(await _embedding_batcher_mcpgw.encode(tool_texts), dtype=np.float32)
+                faiss.normalize_L2(encoded)
+                tool_embeddings_np[missing_positions] = encoded
+            except Exception as e:
+                logger.error(f"MCPGW: Error encoding tool descriptions: {e}", exc_info=True)
+                raise Exception(f"MCPGW: Error encoding tool descriptions: {e}")
 
-        # 5. Calculate cosine similarity between query and each tool embedding
-        similarities = cosine_similarity(query_embedding_np, tool_embeddings_np)[0] # Get the first row (query vs all tools)
+        # 5. Cosine similarity of unit vectors is a single matrix-vector product
+        similarities = tool_embeddings_np @ query_vector
 
         # 6. Add similarity score to each tool and sort
         ranked_tools = []
@@ -1557,13 +2162,12 @@ async def add_server_to_scopes_groups(
         }
 
         # Make request to internal API
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{REGISTRY_BASE_URL}/api/internal/add-to-groups",
-                data=form_data,
-                headers=headers,
-                timeout=30.0
-            )
+        response = await _http_client_mcpgw.post(
+            f"{REGISTRY_BASE_URL}/api/internal/add-to-groups",
+            data=form_data,
+            headers=headers,
+            timeout=30.0
+        )
 
         if response.status_code == 200:
             result = response.json()
@@ -1640,13 +2244,12 @@ async def remove_server_from_scopes_groups(
         }
 
         # Make request to internal API
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{REGISTRY_BASE_URL}/api/internal/remove-from-groups",
-                data=form_data,
-                headers=headers,
-                timeout=30.0
-            )
+        response = await _http_client_mcpgw.post(
+            f"{REGISTRY_BASE_URL}/api/internal/remove-from-groups",
+            data=form_data,
+            headers=headers,
+            timeout=30.0
+        )
 
         if response.status_code == 200:
             result = response.json()
@@ -1730,13 +2333,12 @@ async def create_group(
         }
 
         # Make request to internal API
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{REGISTRY_BASE_URL}/api/internal/create-group",
-                data=form_data,
-                headers=headers,
-                timeout=30.0
-            )
+        response = await _http_client_mcpgw.post(
+            f"{REGISTRY_BASE_URL}/api/internal/create-group",
+            data=form_data,
+            headers=headers,
+            timeout=30.0
+        )
 
         if response.status_code == 200:
             result = response.json()
@@ -1814,13 +2416,12 @@ async def delete_group(
         }
 
         # Make request to internal API
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{REGISTRY_BASE_URL}/api/internal/delete-group",
-                data=form_data,
-                headers=headers,
-                timeout=30.0
-            )
+        response = await _http_client_mcpgw.post(
+            f"{REGISTRY_BASE_URL}/api/internal/delete-group",
+            data=form_data,
+            headers=headers,
+            timeout=30.0
+        )
 
         if response.status_code == 200:
             result = response.json()
@@ -1892,12 +2493,11 @@ async def list_groups(ctx: Context = None) -> Dict[str, Any]:
         }
 
         # Make request to internal API
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{REGISTRY_BASE_URL}/api/internal/list-groups",
-                headers=headers,
-                timeout=30.0
-            )
+        response = await _http_client_mcpgw.get(
+            f"{REGISTRY_BASE_URL}/api/internal/list-groups",
+            headers=headers,
+            timeout=30.0
+        )
 
         if response.status_code == 200:
             result = response.json()
@@ -1936,6 +2536,14 @@ async def list_groups(ctx: Context = None) -> Dict[str, Any]:
 
 # --- Main Execution ---
 
+async def _run_server() -> None:
+    """Serve until shutdown, then close the shared registry HTTP client on the same loop."""
+    try:
+        await mcp.run_async(transport=args.transport, host="0.0.0.0", port=int(args.port))
+    finally:
+        await _http_client_mcpgw.aclose()
+
+
 def main():
     # Log transport and endpoint information
     endpoint = "/mcp"  # streamable-http always uses /mcp endpoint
@@ -1943,6 +2551,6 @@ def main():
     logger.info(f"Server will be available at: http://localhost:{args.port}{endpoint}")
     
     # Run the server with the specified transport from command line args
-    mcp.run(transport=args.transport, host="0.0.0.0", port=int(args.port))
+    asyncio.run(_run_server())
 if __name__ == "__main__":
     main()
\ No newline at end of file
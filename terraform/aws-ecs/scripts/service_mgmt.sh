@@ -104,13 +104,66 @@ run_mcp_command() {
     fi
 }
 
+extract_next_cursor() {
+    local json_output="$1"
+
+    # Write output to temp file to avoid shell escaping issues
+    local temp_file=$(mktemp)
+    echo "$json_output" > "$temp_file"
+
+    # Print the page's next_cursor as a JSON string, or nothing on the last page
+    python3 -c "
+import json
+
+with open('$temp_file', 'r') as f:
+    output = f.read()
+
+try:
+    data, _ = json.JSONDecoder().raw_decode(output, output.find('{'))
+except ValueError:
+    data = {}
+
+if isinstance(data, dict):
+    data = data.get('structuredContent', data)
+next_cursor = data.get('next_cursor') if isinstance(data, dict) else None
+if next_cursor:
+    print(json.dumps(next_cursor))
+"
+
+    rm -f "$temp_file"
+}
+
 verify_server_in_list() {
     local service_name="$1"
     local should_exist="$2"  # "true" or "false"
 
     print_info "Checking server in service list..."
 
-    if output=$(cd "$PROJECT_ROOT" && uv run cli/mcp_client.py --url "${GATEWAY_URL}/mcpgw/mcp" call --tool list_services --args '{}' 2>&1); then
+    # list_services is paginated; collect every page before searching
+    local output=""
+    local page
+    local cursor=""
+    local args
+    local list_ok=true
+    while true; do
+        args='{"limit": 1000, "fields": ["server_name", "path"]'
+        if [ -n "$cursor" ]; then
+            args="${args}, \"cursor\": ${cursor}"
+        fi
+        args="${args}}"
+        if ! page=$(cd "$PROJECT_ROOT" && uv run cli/mcp_client.py --url "${GATEWAY_URL}/mcpgw/mcp" call --tool list_services --args "$args" 2>&1); then
+            list_ok=false
+            output="$page"
+            break
+        fi
+        output="${output}${page}"$'\n'
+        cursor=$(extract_next_cursor "$page")
+        if [ -z "$cursor" ]; then
+            break
+        fi
+    done
+
+    if [ "$list_ok" = "true" ]; then
         if echo "$output" | grep -q "$service_name"; then
             if [ "$should_exist" = "true" ]; then
                 print_success "Server found in service list"
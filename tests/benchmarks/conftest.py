@@ -0,0 +1,6 @@
+"""
+Shared fixtures for benchmarks.
+
+The mcpgw_server fixture lives in tests/conftest.py, next to the unit tests that
+also load the mcpgw module.
+"""
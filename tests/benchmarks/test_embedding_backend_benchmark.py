@@ -0,0 +1,95 @@
+"""
+Latency/memory benchmark for the embedding inference backends.
+
+Compares the PyTorch SentenceTransformer with the int8-quantised ONNX export.
+Each backend runs in a fresh interpreter so import cost and RSS are measured
+in isolation. Needs the embedding model on disk and sentence-transformers[onnx].
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import json
+import shutil
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from registry.core.config import settings
+
+
+NUM_QUERIES = 200
+
+_MEASURE_SCRIPT = textwrap.dedent(
+    """
+    import json, sys, time
+    import psutil
+
+    process = psutil.Process()
+    baseline_rss = process.memory_info().rss
+    start = time.perf_counter()
+
+    from registry.search.onnx_backend import load_onnx_sentence_transformer
+    from sentence_transformers import SentenceTransformer
+
+    backend, model_dir, num_queries = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    if backend == "onnx":
+        model = load_onnx_sentence_transformer(model_dir, quantization="avx2")
+    else:
+        model = SentenceTransformer(model_dir)
+    load_seconds = time.perf_counter() - start
+
+    queries = [f"find a tool for task number {i}" for i in range(num_queries)]
+    model.encode(queries[:5])  # warm-up
+    latencies = []
+    for query in queries:
+        query_start = time.perf_counter()
+        model.encode([query])
+        latencies.append((time.perf_counter() - query_start) * 1000)
+    latencies.sort()
+
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "rss_mb": (process.memory_info().rss - baseline_rss) / 1024 / 1024,
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(len(latencies) * 0.95)],
+    }))
+    """
+)
+
+
+def _measure(backend: str, model_dir: Path) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE_SCRIPT, backend, str(model_dir), str(NUM_QUERIES)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+@pytest.mark.search
+def test_embedding_backend_latency_and_memory(tmp_path):
+    """Print single-query encode latency, load time and RSS for each backend."""
+    pytest.importorskip("optimum.onnxruntime")
+    model_dir = Path(settings.embeddings_model_dir)
+    if not (model_dir.exists() and any(model_dir.iterdir())):
+        pytest.skip(f"Embedding model not available at {model_dir}")
+
+    # Export into a copy so the benchmark leaves the model directory untouched
+    work_dir = tmp_path / model_dir.name
+    shutil.copytree(model_dir, work_dir)
+    _measure("onnx", work_dir)  # one-off export, not timed
+
+    results = {backend: _measure(backend, work_dir) for backend in ("torch", "onnx")}
+
+    print(f"\n{'backend':<8} {'load s':>8} {'RSS MB':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for backend, stats in results.items():
+        print(
+            f"{backend:<8} {stats['load_seconds']:>8.2f} {stats['rss_mb']:>8.0f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f}"
+        )
+
+    assert results["onnx"]["p50_ms"] < results["torch"]["p50_ms"]
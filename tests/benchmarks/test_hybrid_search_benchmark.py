@@ -0,0 +1,120 @@
+"""
+Latency/quality benchmark for hybrid (BM25 + vector) search.
+
+Indexes the bundled server definitions in registry/servers and queries every
+tool by its exact name and by its description. Hit@k of the expected tool is
+compared between vector-only and hybrid search. The quality comparison needs
+the embedding model on disk. Run with: pytest tests/benchmarks -m slow -s
+"""
+import json
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from registry.core.config import settings
+from registry.search.bm25_index import BM25Index
+from registry.search.service import FaissService
+
+
+SERVERS_DIR = Path(__file__).resolve().parents[2] / "registry" / "servers"
+TOP_K = 5
+
+
+def _load_servers():
+    servers = []
+    for path in sorted(SERVERS_DIR.glob("*.json")):
+        info = json.loads(path.read_text())
+        if isinstance(info, dict) and info.get("tool_list"):
+            servers.append(info)
+    return servers
+
+
+def _tool_queries(servers):
+    """(query, kind, server_path, tool_name) for each tool's name and description."""
+    queries = []
+    for info in servers:
+        for tool in info["tool_list"]:
+            parsed_description = tool.get("parsed_description", {}) or {}
+            description = parsed_description.get("main") or tool.get("description") or ""
+            queries.append((tool["name"], "name", info["path"], tool["name"]))
+            if description.strip():
+                queries.append((description.strip().split("\n")[0], "description", info["path"], tool["name"]))
+    return queries
+
+
+@pytest.mark.slow
+@pytest.mark.search
+def test_bm25_query_latency():
+    """BM25 lookups over the fixture tools (replicated 50x) stay well under a millisecond."""
+    servers = _load_servers()
+    queries = _tool_queries(servers)
+    index = BM25Index()
+    for copy in range(50):
+        for info in servers:
+            for tool in info["tool_list"]:
+                index.add((copy, info["path"], tool["name"]), f"{tool['name']} {tool.get('description', '')}")
+
+    start = time.perf_counter()
+    for query, *_ in queries:
+        index.search(query, TOP_K)
+    per_query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"\nBM25 over {len(index)} tools: {per_query_ms:.3f} ms/query ({len(queries)} queries)")
+    assert per_query_ms < 5.0
+
+
+@pytest.mark.slow
+@pytest.mark.search
+@pytest.mark.asyncio
+async def test_hybrid_vs_vector_hit_rate():
+    """Hybrid search should find exact tool names at least as often as vector search alone."""
+    from sentence_transformers import SentenceTransformer
+
+    model_dir = Path(settings.embeddings_model_dir)
+    if not (model_dir.exists() and any(model_dir.iterdir())):
+        pytest.skip(f"Embedding model not available at {model_dir}")
+
+    servers = _load_servers()
+    queries = _tool_queries(servers)
+
+    service = FaissService()
+    service.embedding_model = SentenceTransformer(str(model_dir))
+    service._initialize_new_index()
+    with patch.object(service, "save_data", AsyncMock()), \
+         patch.object(service, "_record_changes", AsyncMock()):
+        await service.index_many([(info["path"], info, "mcp_server", True) for info in servers])
+
+    report = []
+    hit_rates = {}
+    for hybrid in (False, True):
+        hits = {"name": 0, "description": 0}
+        totals = {"name": 0, "description": 0}
+        latencies = []
+        with patch("registry.search.service.settings.search_hybrid_enabled", hybrid):
+            for query, kind, server_path, tool_name in queries:
+                service.query_cache.clear()
+                start = time.perf_counter()
+                results = await service.search_mixed(query, entity_types=["tool"], max_results=TOP_K)
+                latencies.append((time.perf_counter() - start) * 1000)
+                totals[kind] += 1
+                hits[kind] += any(
+                    hit["server_path"] == server_path and hit["tool_name"] == tool_name
+                    for hit in results["tools"]
+                )
+        await service.embedding_batcher.close()
+
+        latencies.sort()
+        label = "hybrid" if hybrid else "vector"
+        hit_rates[label] = {kind: hits[kind] / max(1, totals[kind]) for kind in hits}
+        report.append(
+            f"{label:<7} p50={latencies[len(latencies) // 2]:6.2f}ms "
+            f"p95={latencies[int(len(latencies) * 0.95)]:6.2f}ms "
+            f"hit@{TOP_K} name={hit_rates[label]['name']:.3f} "
+            f"description={hit_rates[label]['description']:.3f}"
+        )
+
+    print("\n" + "\n".join(report))
+
+    assert hit_rates["hybrid"]["name"] >= hit_rates["vector"]["name"]
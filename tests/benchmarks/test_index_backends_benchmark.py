@@ -0,0 +1,100 @@
+"""
+Recall/latency benchmark for the FAISS index backends.
+
+Compares HNSW and IVF-PQ against exact flat search on synthetic clustered
+embeddings. Run with: pytest tests/benchmarks -m slow -s
+"""
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from registry.search.service import FaissService
+
+
+NUM_VECTORS = 10000
+NUM_QUERIES = 200
+DIMENSION = 128
+TOP_K = 10
+
+
+def _clustered_vectors(
+    rng: np.random.Generator,
+    count: int,
+    centers: np.ndarray,
+) -> np.ndarray:
+    """Sample unit-normalised vectors around random cluster centers."""
+    labels = rng.integers(0, len(centers), size=count)
+    vectors = centers[labels] + 0.35 * rng.standard_normal((count, DIMENSION))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def _build(index_type: str, vectors: np.ndarray, ids: np.ndarray):
+    """Build an index of the given type through FaissService._build_index."""
+    service = FaissService()
+    with patch("registry.search.service.settings") as mock_settings:
+        mock_settings.faiss_index_type = index_type
+        mock_settings.faiss_metric = "l2"
+        mock_settings.faiss_hnsw_m = 32
+        mock_settings.faiss_hnsw_ef_construction = 80
+        mock_settings.faiss_hnsw_ef_search = 64
+        mock_settings.faiss_ivf_nlist = 128
+        mock_settings.faiss_ivf_nprobe = 16
+        mock_settings.faiss_ivf_min_train_size = 2048
+        mock_settings.faiss_pq_m = 32
+
+        start = time.perf_counter()
+        index, built_type = service._build_index(vectors, ids, DIMENSION)
+        build_seconds = time.perf_counter() - start
+
+    assert built_type == index_type
+    return index, build_seconds
+
+
+def _search(index, queries: np.ndarray):
+    """Run one query at a time, as search_mixed does, and time it."""
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        _, ids = index.search(query.reshape(1, -1), TOP_K)
+        results.append(ids[0])
+    per_query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    return np.array(results), per_query_ms
+
+
+def _recall(candidate: np.ndarray, truth: np.ndarray) -> float:
+    """Average recall@k of candidate results against exact results."""
+    hits = sum(len(set(c) & set(t)) for c, t in zip(candidate, truth))
+    return hits / truth.size
+
+
+@pytest.mark.slow
+@pytest.mark.search
+def test_ann_backends_recall_and_latency_vs_flat():
+    """HNSW and IVF-PQ should keep useful recall@10 while answering faster than flat."""
+    rng = np.random.default_rng(42)
+    centers = rng.standard_normal((200, DIMENSION))
+    vectors = _clustered_vectors(rng, NUM_VECTORS, centers)
+    queries = _clustered_vectors(rng, NUM_QUERIES, centers)
+    ids = np.arange(NUM_VECTORS, dtype=np.int64)
+
+    flat_index, flat_build = _build("flat", vectors, ids)
+    truth, flat_ms = _search(flat_index, queries)
+
+    report = [f"flat   build={flat_build:6.2f}s query={flat_ms:6.3f}ms recall@{TOP_K}=1.000"]
+    recalls = {}
+    for index_type in ("hnsw", "ivfpq"):
+        index, build_seconds = _build(index_type, vectors, ids)
+        results, query_ms = _search(index, queries)
+        recalls[index_type] = _recall(results, truth)
+        report.append(
+            f"{index_type:<6} build={build_seconds:6.2f}s query={query_ms:6.3f}ms "
+            f"recall@{TOP_K}={recalls[index_type]:.3f}"
+        )
+
+    print("\n" + "\n".join(report))
+
+    assert recalls["hnsw"] >= 0.9
+    assert recalls["ivfpq"] >= 0.5
@@ -0,0 +1,94 @@
+"""
+Load test for the mcpgw shared HTTP client.
+
+Sends concurrent requests to a local keep-alive HTTP server, once with a new
+httpx.AsyncClient per call (the previous behaviour) and once through
+PooledHttpClient, and counts the TCP connections the server accepted. Needs
+the mcpgw dependencies (fastmcp). Run with: pytest tests/benchmarks -m slow -s
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+
+NUM_REQUESTS = 500
+CONCURRENCY = 20
+_RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}"
+
+
+class _KeepAliveServer:
+    """Minimal HTTP/1.1 server that answers every request with {} and counts connections."""
+
+    def __init__(self):
+        self.connections = 0
+        self._server = None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                if not request:
+                    break
+                writer.write(_RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/api/servers"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def _run(send):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            response = await send()
+            assert response.status_code == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(NUM_REQUESTS)))
+    return (time.perf_counter() - start) * 1000 / NUM_REQUESTS
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_pooled_client_reuses_connections(mcpgw_server):
+    """The pooled client opens at most one connection per concurrent caller."""
+    async with _KeepAliveServer() as server:
+        async def per_call():
+            async with httpx.AsyncClient() as client:
+                return await client.get(server.url)
+
+        per_call_ms = await _run(per_call)
+        per_call_connections = server.connections
+
+    pooled = mcpgw_server.PooledHttpClient(max_connections=100, max_keepalive_connections=CONCURRENCY)
+    async with _KeepAliveServer() as server:
+        pooled_ms = await _run(lambda: pooled.get(server.url, timeout=5.0))
+        pooled_connections = server.connections
+        stats = pooled.stats()
+        await pooled.aclose()
+
+    print(
+        f"\n{NUM_REQUESTS} requests, concurrency {CONCURRENCY}: "
+        f"per-call client {per_call_connections} connections {per_call_ms:.2f} ms/request, "
+        f"pooled client {pooled_connections} connections {pooled_ms:.2f} ms/request, stats {stats}"
+    )
+    assert per_call_connections == NUM_REQUESTS
+    assert pooled_connections <= CONCURRENCY
+    assert stats["connections_opened"] == pooled_connections
+    assert stats["requests"] == NUM_REQUESTS
+    assert stats["connection_reuse_ratio"] >= 1 - CONCURRENCY / NUM_REQUESTS
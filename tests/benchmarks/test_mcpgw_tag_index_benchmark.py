@@ -0,0 +1,70 @@
+"""
+Latency benchmark for the mcpgw tags-only lookup.
+
+Compares the per-request scan that re-parsed every service's tags with the
+TagIndex posting-list intersection over 10k synthetic services. Needs the
+mcpgw dependencies (fastmcp). Run with: pytest tests/benchmarks -m slow -s
+"""
+import random
+import time
+
+import pytest
+
+
+NUM_SERVICES = 10_000
+NUM_QUERIES = 200
+TAG_VOCABULARY = [f"tag{i}" for i in range(200)]
+
+
+def _synthetic_metadata(rng):
+    metadata = {}
+    for i in range(NUM_SERVICES):
+        tags = rng.sample(TAG_VOCABULARY, 4)
+        # Registry entries carry tags either as a list or as a comma-separated string
+        metadata[f"/service{i}"] = {
+            "id": i,
+            "full_server_info": {"tags": tags if i % 2 else " , ".join(tag.upper() for tag in tags)},
+        }
+    return metadata
+
+
+def _scan(metadata, tags):
+    """The previous tags-only path: parse every service's tags on each request."""
+    matches = []
+    for service_path, entry in metadata.items():
+        server_tags = entry["full_server_info"].get("tags", "")
+        if isinstance(server_tags, str):
+            server_tags_list = [tag.strip().lower() for tag in server_tags.split(",") if tag.strip()]
+        else:
+            server_tags_list = [str(tag).lower().strip() for tag in server_tags] if server_tags else []
+        if all(tag in server_tags_list for tag in tags):
+            matches.append(service_path)
+    return matches
+
+
+@pytest.mark.slow
+@pytest.mark.search
+def test_tag_index_vs_scan(mcpgw_server):
+    """Posting-list intersection returns the scan's matches, in order, far faster."""
+    rng = random.Random(7)
+    metadata = _synthetic_metadata(rng)
+    queries = [rng.sample(TAG_VOCABULARY, rng.choice((1, 2))) for _ in range(NUM_QUERIES)]
+
+    start = time.perf_counter()
+    tag_index = mcpgw_server.TagIndex(metadata)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    scan_results = [_scan(metadata, tags) for tags in queries]
+    scan_ms = (time.perf_counter() - start) * 1000 / NUM_QUERIES
+
+    start = time.perf_counter()
+    index_results = [tag_index.services_with_all_tags(tags) for tags in queries]
+    index_ms = (time.perf_counter() - start) * 1000 / NUM_QUERIES
+
+    print(
+        f"\n{NUM_SERVICES} services: index build {build_ms:.1f} ms, "
+        f"scan {scan_ms:.3f} ms/query, tag index {index_ms:.3f} ms/query"
+    )
+    assert index_results == scan_results
+    assert index_ms < scan_ms
@@ -2,6 +2,8 @@
 Pytest configuration and shared fixtures.
 """
 import asyncio
+import importlib.util
+import sys
 import tempfile
 import shutil
 from pathlib import Path
@@ -29,6 +31,9 @@ from tests.fixtures.factories import (
 )
 
 
+MCPGW_SERVER = Path(__file__).resolve().parents[1] / "servers" / "mcpgw" / "server.py"
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an event loop for the test session."""
@@ -189,6 +194,18 @@ def mock_websocket():
     return mock_ws
 
 
+@pytest.fixture
+def mcpgw_server(monkeypatch):
+    """Import servers/mcpgw/server.py as a module; skipped without the mcpgw dependencies."""
+    pytest.importorskip("fastmcp")
+    monkeypatch.setenv("REGISTRY_BASE_URL", "http://localhost:7860")
+    monkeypatch.setattr(sys, "argv", ["server.py"])
+    spec = importlib.util.spec_from_file_location("mcpgw_server", MCPGW_SERVER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 @pytest.fixture(autouse=True)
 def cleanup_services():
     """Automatically cleanup services after each test."""
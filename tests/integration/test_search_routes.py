@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, patch, Mock
 
 from registry.main import app
 from registry.auth import dependencies as auth_dependencies
+from registry.search.service import SearchWarmingError
 
 
 @pytest.mark.integration
@@ -17,7 +18,7 @@ class TestSearchRoutes:
     def setup_method(self):
         """Override auth dependency for each test."""
         app.dependency_overrides[auth_dependencies.nginx_proxied_auth] = (
-            lambda *args, **kwargs: {
+            lambda: {
                 "username": "test-user",
                 "is_admin": True,
                 "accessible_servers": ["all"],
@@ -110,6 +111,18 @@ class TestSearchRoutes:
         assert data["tools"][0]["tool_name"] == "alpha"
         assert data["agents"][0]["agent_name"] == "Demo Agent"
 
+    def test_semantic_search_passes_min_score(self, test_client: TestClient):
+        """The min_score cutoff is applied by the search service before serialisation."""
+        with patch("registry.api.search_routes.faiss_service") as mock_faiss:
+            mock_faiss.search_mixed = AsyncMock(return_value={"servers": [], "tools": [], "agents": []})
+
+            response = test_client.post(
+                "/api/search/semantic", json={"query": "alpha", "min_score": 0.6}
+            )
+
+        assert response.status_code == 200
+        assert mock_faiss.search_mixed.call_args.kwargs["min_score"] == 0.6
+
     def test_semantic_search_handles_service_errors(self, test_client: TestClient):
         """Service-level errors propagate as 503."""
         with patch("registry.api.search_routes.faiss_service") as mock_faiss:
@@ -119,3 +132,14 @@ class TestSearchRoutes:
 
         assert response.status_code == 503
         assert "temporarily unavailable" in response.json()["detail"]
+
+    def test_semantic_search_returns_retry_after_while_warming(self, test_client: TestClient):
+        """Searches during model warm-up get 503 with a Retry-After header."""
+        with patch("registry.api.search_routes.faiss_service") as mock_faiss:
+            mock_faiss.search_mixed = AsyncMock(side_effect=SearchWarmingError("loading"))
+
+            response = test_client.post("/api/search/semantic", json={"query": "alpha"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"].isdigit()
+        assert "warming up" in response.json()["detail"]
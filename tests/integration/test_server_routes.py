@@ -238,4 +238,57 @@ class TestServerRoutes:
                 "proxy_pass_url": "http://localhost:8000",
             })
             
-            assert response.status_code == 404 
\ No newline at end of file
+            assert response.status_code == 404 
+    def _list_internal(self, test_client: TestClient, monkeypatch, servers, **params):
+        monkeypatch.setenv("ADMIN_USER", "admin")
+        monkeypatch.setenv("ADMIN_PASSWORD", "secret")
+        with patch('registry.api.server_routes.server_service') as mock_service, \
+             patch('registry.health.service.health_service') as mock_health:
+            mock_service.get_all_servers.return_value = servers
+            mock_service.is_service_enabled.return_value = True
+            mock_health._get_service_health_data.return_value = {
+                "status": "healthy", "last_checked_iso": "2026-01-01T00:00:00"
+            }
+            response = test_client.get("/api/internal/list", params=params, auth=("admin", "secret"))
+            return response, mock_health
+
+    def test_internal_list_paginates_by_path(self, test_client: TestClient, monkeypatch):
+        """Pages follow path order and next_cursor continues where the last page stopped."""
+        servers = {f"/server{i:02d}": ServerInfoFactory(path=f"/server{i:02d}") for i in range(5)}
+
+        response, _ = self._list_internal(test_client, monkeypatch, servers, limit=2)
+        first_page = response.json()
+        response, _ = self._list_internal(
+            test_client, monkeypatch, servers, limit=2, cursor=first_page["next_cursor"]
+        )
+        second_page = response.json()
+        response, _ = self._list_internal(
+            test_client, monkeypatch, servers, limit=2, cursor=second_page["next_cursor"]
+        )
+        last_page = response.json()
+
+        assert [s["path"] for s in first_page["services"]] == ["/server00", "/server01"]
+        assert [s["path"] for s in second_page["services"]] == ["/server02", "/server03"]
+        assert [s["path"] for s in last_page["services"]] == ["/server04"]
+        assert last_page["next_cursor"] is None
+        assert first_page["total_count"] == 5
+
+    def test_internal_list_projects_fields(self, test_client: TestClient, monkeypatch):
+        """Only requested fields are returned, and health is not looked up unless asked for."""
+        servers = {"/fininfo": ServerInfoFactory(path="/fininfo")}
+
+        response, mock_health = self._list_internal(
+            test_client, monkeypatch, servers, fields="server_name,path"
+        )
+
+        assert response.status_code == 200
+        assert response.json()["services"] == [
+            {"server_name": servers["/fininfo"]["server_name"], "path": "/fininfo"}
+        ]
+        mock_health._get_service_health_data.assert_not_called()
+
+    def test_internal_list_rejects_unknown_fields(self, test_client: TestClient, monkeypatch):
+        response, _ = self._list_internal(test_client, monkeypatch, {}, fields="path,secrets")
+
+        assert response.status_code == 400
+        assert "secrets" in response.json()["detail"]
@@ -37,7 +37,8 @@ class TestMainApplication:
             mock_server_service.get_enabled_services.return_value = ["service1", "service2"]
             mock_server_service.get_server_info.return_value = {"name": "test_server"}
             
-            mock_faiss_service.initialize = AsyncMock()
+            mock_faiss_service.start_background_initialization = Mock()
+            mock_faiss_service.shutdown = AsyncMock()
             
             mock_health_service.initialize = AsyncMock()
             mock_health_service.shutdown = AsyncMock()
@@ -59,7 +60,7 @@ class TestMainApplication:
         async with lifespan(test_app):
             # Verify all initialization steps were called
             mock_services['server_service'].load_servers_and_state.assert_called_once()
-            mock_services['faiss_service'].initialize.assert_called_once()
+            mock_services['faiss_service'].start_background_initialization.assert_called_once()
             mock_services['health_service'].initialize.assert_called_once()
             mock_services['nginx_service'].generate_config.assert_called_once()
             
@@ -78,15 +79,15 @@ class TestMainApplication:
                 pass
 
     @pytest.mark.asyncio
-    async def test_lifespan_startup_faiss_service_failure(self, mock_settings, mock_services):
-        """Test startup failure during FAISS service initialization."""
-        mock_services['faiss_service'].initialize.side_effect = Exception("FAISS init failed")
-        
+    async def test_lifespan_startup_does_not_wait_for_faiss(self, mock_settings, mock_services):
+        """FAISS loads in the background; the remaining services start without waiting."""
+        mock_services['nginx_service'].generate_config_async = AsyncMock()
         test_app = FastAPI()
-        
-        with pytest.raises(Exception, match="FAISS init failed"):
-            async with lifespan(test_app):
-                pass
+
+        async with lifespan(test_app):
+            mock_services['faiss_service'].start_background_initialization.assert_called_once()
+            mock_services['faiss_service'].initialize.assert_not_called()
+            mock_services['health_service'].initialize.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_lifespan_startup_health_service_failure(self, mock_settings, mock_services):
@@ -2,11 +2,15 @@
 Unit tests for health monitoring service.
 """
 import asyncio
+import json
+import sys
+import types
+import httpx
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import Mock, AsyncMock, patch
 
-from registry.health.service import HealthMonitoringService
+from registry.health.service import HealthMonitoringService, HighPerformanceWebSocketManager
 
 
 @pytest.mark.unit
@@ -245,4 +249,297 @@ class TestHealthMonitoringService:
             
             assert "/test1" in result
             assert "/test2" in result
-            assert mock_get_data.call_count == 2 
\ No newline at end of file
+            assert mock_get_data.call_count == 2 
+    @pytest.mark.asyncio
+    async def test_http_client_reuses_connections_across_probes(self, health_service: HealthMonitoringService):
+        """The shared probe client keeps connections alive and reports reuse per host."""
+        connections = []
+
+        async def handle(reader, writer):
+            connections.append(writer)
+            try:
+                while await reader.readuntil(b"\r\n\r\n"):
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+                    await writer.drain()
+            except (asyncio.IncompleteReadError, ConnectionResetError):
+                pass
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            client = health_service._get_http_client()
+            for _ in range(3):
+                response = await client.get(f"http://127.0.0.1:{port}/mcp")
+                assert response.status_code == 200
+            assert health_service._get_http_client() is client
+
+            stats = health_service.get_http_client_stats()
+            host_stats = stats["hosts"][f"127.0.0.1:{port}"]
+            assert host_stats["requests"] == 3
+            assert host_stats["connections_opened"] == 1
+            assert len(connections) == 1
+            assert stats["connection_reuse_ratio"] == pytest.approx(2 / 3)
+
+            await health_service.shutdown()
+            assert client.is_closed
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_streamable_http_check_reuses_mcp_session(self, health_service: HealthMonitoringService):
+        """Later checks ping on the cached session and re-initialize only once it is rejected."""
+        live_sessions = set()
+        methods = []
+
+        def handler(request):
+            method = json.loads(request.content)["method"]
+            methods.append(method)
+            if method == "initialize":
+                session_id = f"session-{len(live_sessions)}"
+                live_sessions.add(session_id)
+                return httpx.Response(200, headers={"Mcp-Session-Id": session_id}, json={"result": {}})
+            if request.headers.get("Mcp-Session-Id") not in live_sessions:
+                return httpx.Response(404, json={"error": {"code": -32001, "message": "Session not found"}})
+            return httpx.Response(200, json={"result": {}})
+
+        server_info = {"supported_transports": ["streamable-http"]}
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            for _ in range(3):
+                result = await health_service._check_server_endpoint_transport_aware(client, "http://server:8000", server_info)
+                assert result == (True, "healthy")
+            assert methods == ["initialize", "ping", "ping", "ping"]
+
+            # A server restart forgets the session, so the next check renegotiates
+            live_sessions.clear()
+            result = await health_service._check_server_endpoint_transport_aware(client, "http://server:8000", server_info)
+            assert result == (True, "healthy")
+            assert methods[4:] == ["ping", "initialize", "ping"]
+
+        stats = health_service.get_http_client_stats()["mcp_sessions"]
+        assert stats == {"handshakes": 2, "handshakes_avoided": 2, "sessions_rejected": 1, "cached": 1}
+
+    @pytest.mark.asyncio
+    async def test_tool_refresh_is_single_flight_and_throttled(self, health_service: HealthMonitoringService):
+        """Overlapping or too frequent refresh requests for one server start no new fetch."""
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_refresh(service_path, proxy_pass_url):
+            calls.append(service_path)
+            await release.wait()
+
+        with patch.object(health_service, '_update_tools_background', side_effect=slow_refresh):
+            assert health_service._schedule_tool_refresh("/test", "http://test")
+            assert not health_service._schedule_tool_refresh("/test", "http://test")
+            assert health_service._schedule_tool_refresh("/other", "http://other")
+
+            release.set()
+            await asyncio.gather(*list(health_service._tool_refresh_tasks.values()))
+            assert health_service._tool_refresh_tasks == {}
+
+            # Finished, but still inside the minimum refresh interval
+            assert not health_service._schedule_tool_refresh("/test", "http://test")
+            health_service._tool_refresh_started["/test"] -= 3600
+            assert health_service._schedule_tool_refresh("/test", "http://test")
+            await health_service._tool_refresh_tasks["/test"]
+
+        assert calls == ["/test", "/other", "/test"]
+
+    @pytest.mark.asyncio
+    async def test_update_tools_background_skips_unchanged_tool_list(self, health_service: HealthMonitoringService):
+        """A refetched tool list with the same content writes nothing."""
+        tool_list = [{"name": "tool1", "description": "First"}, {"name": "tool2", "description": "Second"}]
+        server_info = {"server_name": "Test", "tool_list": tool_list, "num_tools": 2}
+        mock_mcp_client = Mock()
+        mock_mcp_client.get_tools_from_server_with_server_info = AsyncMock(
+            return_value=[{"description": "First", "name": "tool1"}, {"description": "Second", "name": "tool2"}]
+        )
+
+        with _patch_mcp_client(mock_mcp_client), \
+             patch('registry.services.server_service.server_service') as mock_server_service, \
+             patch('registry.utils.scopes_manager.update_server_scopes', new_callable=AsyncMock) as mock_scopes, \
+             patch('asyncio.sleep', new_callable=AsyncMock):
+            mock_server_service.get_server_info.return_value = server_info
+
+            await health_service._update_tools_background("/test", "http://test")
+            mock_server_service.update_server.assert_not_called()
+
+            # A description change is written, but scopes only depend on tool names
+            mock_mcp_client.get_tools_from_server_with_server_info.return_value = [
+                {"name": "tool1", "description": "Changed"}, {"name": "tool2", "description": "Second"}
+            ]
+            await health_service._update_tools_background("/test", "http://test")
+            mock_server_service.update_server.assert_called_once()
+            mock_scopes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_overlapping_tool_refreshes_fetch_once(self, health_service: HealthMonitoringService):
+        """Refresh requests arriving while a fetch is in flight do not fetch the tool list again."""
+        release = asyncio.Event()
+        server_info = {"server_name": "Test", "tool_list": [], "num_tools": 0}
+
+        async def slow_fetch(proxy_pass_url, info):
+            await release.wait()
+            return [{"name": "tool1"}]
+
+        mock_mcp_client = Mock()
+        mock_mcp_client.get_tools_from_server_with_server_info = AsyncMock(side_effect=slow_fetch)
+
+        with _patch_mcp_client(mock_mcp_client), \
+             patch('registry.services.server_service.server_service') as mock_server_service, \
+             patch('registry.utils.scopes_manager.update_server_scopes', new_callable=AsyncMock), \
+             patch.object(health_service, 'broadcast_health_update', new_callable=AsyncMock), \
+             patch('asyncio.sleep', new_callable=AsyncMock):
+            mock_server_service.get_server_info.return_value = server_info
+
+            assert health_service._schedule_tool_refresh("/test", "http://test")
+            task = health_service._tool_refresh_tasks["/test"]
+            for _ in range(3):
+                await asyncio.sleep(0)
+                assert not health_service._schedule_tool_refresh("/test", "http://test")
+
+            release.set()
+            await task
+
+        mock_mcp_client.get_tools_from_server_with_server_info.assert_awaited_once()
+        mock_server_service.update_server.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_tool_refresh_inside_min_interval_is_skipped(self, health_service: HealthMonitoringService):
+        """A server is refetched at most once per interval, even when the last fetch failed."""
+        mock_mcp_client = Mock()
+        mock_mcp_client.get_tools_from_server_with_server_info = AsyncMock(side_effect=Exception("down"))
+
+        with _patch_mcp_client(mock_mcp_client), \
+             patch('registry.services.server_service.server_service'), \
+             patch('registry.health.service.settings') as mock_settings, \
+             patch('registry.health.service.monotonic') as mock_monotonic, \
+             patch('asyncio.sleep', new_callable=AsyncMock):
+            mock_settings.health_check_tool_refresh_min_interval_seconds = 60
+            mock_monotonic.return_value = 1000.0
+
+            assert health_service._schedule_tool_refresh("/test", "http://test")
+            await health_service._tool_refresh_tasks["/test"]
+
+            mock_monotonic.return_value = 1059.0
+            assert not health_service._schedule_tool_refresh("/test", "http://test")
+
+            mock_monotonic.return_value = 1060.0
+            assert health_service._schedule_tool_refresh("/test", "http://test")
+            await health_service._tool_refresh_tasks["/test"]
+
+        assert mock_mcp_client.get_tools_from_server_with_server_info.await_count == 2
+
+
+def _patch_mcp_client(mock_mcp_client):
+    """Stand in for registry.core.mcp_client, which the health service imports at call time."""
+    return patch.dict(
+        sys.modules,
+        {"registry.core.mcp_client": types.SimpleNamespace(mcp_client_service=mock_mcp_client)},
+    )
+
+
+def _websocket(send_text):
+    websocket = Mock()
+    websocket.client = None
+    websocket.accept = AsyncMock()
+    websocket.send_text = send_text
+    return websocket
+
+
+async def _drain():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.unit
+@pytest.mark.health
+class TestHighPerformanceWebSocketManager:
+    """Test suite for the delta-encoded WebSocket broadcast."""
+
+    @pytest.fixture
+    def manager(self):
+        manager = HighPerformanceWebSocketManager()
+        manager.min_broadcast_interval = 0
+        manager.client_queue_size = 4
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_shared_deltas(self, manager):
+        """Clients start from a snapshot and share one serialised delta per update."""
+        initial = {"/a": {"status": "healthy"}, "/b": {"status": "healthy"}}
+        fast1, fast2 = _websocket(AsyncMock()), _websocket(AsyncMock())
+
+        with patch('registry.health.service.health_service') as mock_health_service:
+            mock_health_service.get_all_health_status.side_effect = lambda: dict(initial)
+            await manager.add_connection(fast1)
+            await manager.add_connection(fast2)
+            await _drain()
+
+            await manager.broadcast_update("/a", {"status": "unhealthy: timeout"})
+            await manager.broadcast_update("/a", {"status": "unhealthy: timeout"})  # Unchanged, not sent
+            initial.pop("/b")
+            await manager.broadcast_update()
+            await _drain()
+
+        messages = [call.args[0] for call in fast1.send_text.call_args_list]
+        assert [json.loads(message) for message in messages] == [
+            {"type": "snapshot", "seq": 1, "data": {"/a": {"status": "healthy"}, "/b": {"status": "healthy"}}},
+            {"type": "delta", "seq": 2, "data": {"/a": {"status": "unhealthy: timeout"}}},
+            {"type": "delta", "seq": 3, "data": {"/a": {"status": "healthy"}}, "removed": ["/b"]},
+        ]
+        # The same serialised string went to both clients
+        assert all(a is b for a, b in zip(messages, [call.args[0] for call in fast2.send_text.call_args_list]))
+
+    @pytest.mark.asyncio
+    async def test_slow_client_is_coalesced_into_snapshot(self, manager):
+        """A client that falls behind gets one snapshot instead of every missed delta."""
+        release = asyncio.Event()
+        slow_messages = []
+
+        async def slow_send(message):
+            slow_messages.append(message)
+            await release.wait()
+
+        fast, slow = _websocket(AsyncMock()), _websocket(slow_send)
+        with patch('registry.health.service.health_service') as mock_health_service, \
+             patch('registry.health.service.settings.websocket_send_timeout_seconds', 5.0):
+            mock_health_service.get_all_health_status.return_value = {}
+            await manager.add_connection(fast)
+            await manager.add_connection(slow)
+            await _drain()
+
+            for i in range(20):
+                await manager.broadcast_update("/a", {"status": "healthy", "num_tools": i})
+                await _drain()
+
+            # The fast client already has every delta while the slow one is stuck on its first send
+            assert fast.send_text.call_count == 21
+            assert len(slow_messages) == 1
+            assert manager.get_stats()["coalesced_clients"] >= 1
+
+            release.set()
+            await _drain()
+
+        last = json.loads(slow_messages[-1])
+        assert last["type"] == "snapshot"
+        assert last["seq"] == manager.sequence
+        assert last["data"] == {"/a": {"status": "healthy", "num_tools": 19}}
+        assert len(slow_messages) < 6
+
+    @pytest.mark.asyncio
+    async def test_resync_request_sends_snapshot(self, manager):
+        websocket = _websocket(AsyncMock())
+        with patch('registry.health.service.health_service') as mock_health_service:
+            mock_health_service.get_all_health_status.return_value = {"/a": {"status": "healthy"}}
+            await manager.add_connection(websocket)
+            await _drain()
+            manager.request_snapshot(websocket)
+            await _drain()
+
+        assert [json.loads(call.args[0])["type"] for call in websocket.send_text.call_args_list] == ["snapshot", "snapshot"]
+        await manager.remove_connection(websocket)
+        assert manager.streams == {}
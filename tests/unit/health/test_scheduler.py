@@ -0,0 +1,132 @@
+"""
+Unit tests for the per-service health check scheduler.
+"""
+import random
+
+import pytest
+
+from registry.health.scheduler import HealthCheckScheduler
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _scheduler(clock: _Clock, jitter_ratio: float = 0.0) -> HealthCheckScheduler:
+    return HealthCheckScheduler(
+        interval_seconds=300,
+        min_interval_seconds=15,
+        max_interval_seconds=1800,
+        jitter_ratio=jitter_ratio,
+        clock=clock,
+        rng=random.Random(3),
+    )
+
+
+def _check(scheduler: HealthCheckScheduler, clock: _Clock, service_path: str, healthy: bool, changed: bool = False):
+    """Advance to the service's next due time, pop it and record a result."""
+    delay = scheduler.seconds_until_next()
+    clock.now += delay
+    assert scheduler.pop_due() == [service_path]
+    return scheduler.record_result(service_path, healthy, changed)
+
+
+@pytest.mark.unit
+@pytest.mark.health
+class TestHealthCheckScheduler:
+    """Test suite for HealthCheckScheduler."""
+
+    def test_new_services_are_due_immediately(self):
+        clock = _Clock()
+        scheduler = _scheduler(clock)
+        scheduler.sync(["/a", "/b"])
+
+        assert sorted(scheduler.pop_due()) == ["/a", "/b"]
+        assert scheduler.pop_due() == []
+
+    def test_pop_due_respects_limit(self):
+        clock = _Clock()
+        scheduler = _scheduler(clock)
+        scheduler.sync(["/a", "/b", "/c"])
+
+        assert len(scheduler.pop_due(limit=2)) == 2
+        assert len(scheduler.pop_due()) == 1
+
+    def test_first_round_is_spread_over_interval(self):
+        clock = _Clock()
+        scheduler = _scheduler(clock)
+        paths = [f"/service{i}" for i in range(50)]
+        scheduler.sync(paths)
+        scheduler.pop_due()
+
+        delays = [scheduler.record_result(path, True, True) for path in paths]
+
+        assert all(15 <= delay <= 300 for delay in delays)
+        assert max(delays) - min(delays) > 150
+
+    def test_healthy_service_uses_jittered_interval(self):
+        clock = _Clock()
+        scheduler = _scheduler(clock, jitter_ratio=0.1)
+        scheduler.sync(["/a"])
+        scheduler.pop_due()
+        scheduler.record_result("/a", True, True)
+
+        delays = {round(_check(scheduler, clock, "/a", True), 3) for _ in range(20)}
+
+        assert all(270 <= delay <= 330 for delay in delays)
+        assert len(delays) > 1
+
+    def test_unhealthy_service_backs_off_to_cap(self):
+        clock = _Clock()
+        scheduler = _scheduler(clock)
+        scheduler.sync(["/a"])
+        scheduler.pop_due()
+        scheduler.record_result("/a", True, True)
+
+        assert _check(scheduler, clock, "/a", False, changed=True) == 15
+        delays = [_check(scheduler, clock, "/a", False) for _ in range(5)]
+
+        assert delays == [600, 1200, 1800, 1800, 1800]
+        assert scheduler.consecutive_failures("/a") == 6
+
+    def test_recovery_resets_backoff_with_fast_recheck(self):
+        clock = _Clock()
+        scheduler = _scheduler(clock)
+        scheduler.sync(["/a"])
+        scheduler.pop_due()
+        scheduler.record_result("/a", False, True)
+        _check(scheduler, clock, "/a", False)
+
+        assert _check(scheduler, clock, "/a", True, changed=True) == 15
+        assert scheduler.consecutive_failures("/a") == 0
+        assert _check(scheduler, clock, "/a", True) == 300
+
+    def test_sync_drops_removed_services(self):
+        clock = _Clock()
+        scheduler = _scheduler(clock)
+        scheduler.sync(["/a", "/b"])
+        scheduler.pop_due()
+        scheduler.sync(["/b"])
+
+        assert scheduler.record_result("/a", True, False) is None
+        assert "/a" not in scheduler
+        assert scheduler.record_result("/b", True, False) is not None
+        assert len(scheduler) == 1
+
+    def test_in_flight_service_is_not_popped_again(self):
+        clock = _Clock()
+        scheduler = _scheduler(clock)
+        scheduler.sync(["/a"])
+        assert scheduler.pop_due() == ["/a"]
+
+        # Removing and re-adding while the check runs must not queue a second check
+        scheduler.sync([])
+        scheduler.sync(["/a"])
+
+        assert scheduler.is_in_flight("/a")
+        assert scheduler.pop_due() == []
+        assert scheduler.seconds_until_next() is None
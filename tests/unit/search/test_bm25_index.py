@@ -0,0 +1,93 @@
+"""
+Unit tests for the BM25 keyword index and reciprocal rank fusion.
+"""
+import pytest
+
+from registry.search.bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestBM25Index:
+    """Test suite for BM25Index."""
+
+    def test_tokenize_keeps_identifiers_and_parts(self):
+        """Snake-case identifiers match both whole and by their words."""
+        assert tokenize("Tool: get_stock_aggregates.") == [
+            "tool", "get_stock_aggregates", "get", "stock", "aggregates"
+        ]
+
+    def test_rare_terms_outweigh_common_terms(self):
+        """IDF weighting ranks the document holding the rare term first."""
+        index = BM25Index()
+        index.add("/time", "get current time")
+        index.add("/stocks", "get stock aggregates")
+        index.add("/weather", "get weather forecast")
+
+        results = index.search("get stock", k=3)
+
+        assert results[0][0] == "/stocks"
+        assert {key for key, _ in results} == {"/time", "/stocks", "/weather"}
+
+    def test_exact_identifier_match(self):
+        """A full tool name query ranks that tool above partial word matches."""
+        index = BM25Index()
+        index.add("a", "get_stock_aggregates get stock aggregates")
+        index.add("b", "print_stock_data print stock data")
+
+        assert index.search("get_stock_aggregates", k=1)[0][0] == "a"
+
+    def test_incremental_replace_and_remove(self):
+        """Replacing or removing a document updates postings and lengths."""
+        index = BM25Index()
+        index.add("a", "alpha beta")
+        index.add("a", "gamma")
+        index.add("b", "alpha")
+
+        assert [key for key, _ in index.search("alpha", k=5)] == ["b"]
+        assert [key for key, _ in index.search("gamma", k=5)] == ["a"]
+
+        index.remove("a")
+        index.remove("missing")
+
+        assert len(index) == 1
+        assert index.search("gamma", k=5) == []
+
+    def test_search_restricted_to_allowed_keys(self):
+        """Disallowed documents are not scored, so they do not take result slots."""
+        index = BM25Index()
+        for i in range(10):
+            index.add(f"/hidden{i}", "stock stock stock")
+        index.add("/visible", "stock quotes")
+
+        assert [key for key, _ in index.search("stock", k=1, allowed={"/visible"})] == ["/visible"]
+
+    def test_empty_index_and_query(self):
+        """Searching nothing, or for nothing, returns no results."""
+        index = BM25Index()
+        assert index.search("alpha", k=5) == []
+        index.add("a", "alpha")
+        assert index.search("!!", k=5) == []
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestReciprocalRankFusion:
+    """Test suite for reciprocal_rank_fusion."""
+
+    def test_agreement_beats_single_list(self):
+        """Keys ranked by both lists come ahead of keys from one list."""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b"]], k=60)
+
+        assert [key for key, _ in fused][:2] == ["c", "b"]
+        assert fused[-1][0] == "a"
+
+    def test_scores_are_normalised(self):
+        """A key ranked first everywhere scores 1.0; empty lists are ignored."""
+        fused = reciprocal_rank_fusion([["a", "b"], [], ["a"]], k=60)
+
+        assert fused[0] == ("a", pytest.approx(1.0))
+        assert 0.0 < fused[1][1] < 1.0
+
+    def test_no_rankings(self):
+        assert reciprocal_rank_fusion([[], []]) == []
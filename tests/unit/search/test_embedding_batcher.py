@@ -0,0 +1,86 @@
+"""
+Unit tests for the micro-batching embedding executor.
+"""
+import asyncio
+
+import pytest
+import numpy as np
+
+from registry.search.embedding_batcher import EmbeddingBatcher
+
+
+def _fake_encode(calls):
+    def encode(texts):
+        calls.append(list(texts))
+        # Row i encodes the length of text i so callers can check their slice
+        return np.array([[len(text), 0.0] for text in texts], dtype=np.float32)
+    return encode
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestEmbeddingBatcher:
+    """Test suite for EmbeddingBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_encode(self):
+        """Requests arriving within the wait window are encoded together."""
+        calls = []
+        batcher = EmbeddingBatcher(_fake_encode(calls), max_batch_size=8, max_wait_ms=50)
+
+        results = await asyncio.gather(
+            batcher.encode(["a"]),
+            batcher.encode(["bb"]),
+            batcher.encode(["ccc", "dddd"]),
+        )
+        await batcher.close()
+
+        assert calls == [["a", "bb", "ccc", "dddd"]]
+        assert results[0][:, 0].tolist() == [1.0]
+        assert results[1][:, 0].tolist() == [2.0]
+        assert results[2][:, 0].tolist() == [3.0, 4.0]
+
+        stats = batcher.stats()
+        assert stats["batches"] == 1
+        assert stats["requests"] == 3
+        assert stats["avg_batch_size"] == 4.0
+        assert stats["max_batch_size"] == 4
+
+    @pytest.mark.asyncio
+    async def test_batches_are_capped_at_max_size(self):
+        """A request that would overflow the batch goes into the next one."""
+        calls = []
+        batcher = EmbeddingBatcher(_fake_encode(calls), max_batch_size=2, max_wait_ms=50)
+
+        await asyncio.gather(
+            batcher.encode(["a"]),
+            batcher.encode(["b"]),
+            batcher.encode(["c"]),
+        )
+        await batcher.close()
+
+        assert calls == [["a", "b"], ["c"]]
+        assert batcher.stats()["batches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_encode_errors_reach_every_caller(self):
+        """A failed batch propagates the exception to all waiting callers."""
+        def failing_encode(texts):
+            raise RuntimeError("model unavailable")
+
+        batcher = EmbeddingBatcher(failing_encode, max_batch_size=8, max_wait_ms=20)
+
+        results = await asyncio.gather(
+            batcher.encode(["a"]), batcher.encode(["b"]), return_exceptions=True
+        )
+        await batcher.close()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_request(self):
+        """Empty requests are a caller error."""
+        batcher = EmbeddingBatcher(_fake_encode([]))
+
+        with pytest.raises(ValueError):
+            await batcher.encode([])
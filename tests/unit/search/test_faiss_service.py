@@ -9,7 +9,8 @@ from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from pathlib import Path
 import numpy as np
 
-from registry.search.service import FaissService, faiss_service
+from registry.search.metadata_file import MappedMetadata, MappedToolVectors
+from registry.search.service import FaissService, SearchWarmingError, faiss_service
 
 
 @pytest.mark.unit
@@ -32,8 +33,35 @@ class TestFaissService:
             mock_settings.embeddings_model_dir = Path("/tmp/test_model")
             mock_settings.embeddings_model_name = "all-MiniLM-L6-v2"
             mock_settings.embeddings_model_dimensions = 384
+            mock_settings.embeddings_batch_size = 64
+            mock_settings.embeddings_backend = "torch"
+            mock_settings.embeddings_onnx_quantization = "avx2"
+            mock_settings.embeddings_onnx_export_dir = Path("/tmp/test_model-onnx")
+            mock_settings.faiss_index_type = "flat"
+            mock_settings.faiss_metric = "l2"
+            mock_settings.faiss_hnsw_m = 16
+            mock_settings.faiss_hnsw_ef_construction = 40
+            mock_settings.faiss_hnsw_ef_search = 32
+            mock_settings.faiss_ivf_nlist = 16
+            mock_settings.faiss_ivf_nprobe = 4
+            mock_settings.faiss_ivf_min_train_size = 512
+            mock_settings.faiss_pq_m = 4
+            mock_settings.faiss_compaction_tombstone_ratio = 0.2
+            mock_settings.faiss_compaction_min_tombstones = 50
             mock_settings.faiss_index_path = Path("/tmp/test_index.faiss")
             mock_settings.faiss_metadata_path = Path("/tmp/test_metadata.json")
+            mock_settings.faiss_tool_index_path = Path("/tmp/test_index_tools.faiss")
+            mock_settings.faiss_wal_path = Path("/tmp/test_metadata.wal")
+            mock_settings.faiss_metadata_binary_path = Path("/tmp/test_metadata.bin")
+            mock_settings.faiss_tool_vectors_path = Path("/tmp/test_tool_vectors.bin")
+            mock_settings.search_query_cache_size = 1024
+            mock_settings.search_query_cache_ttl_seconds = 600
+            mock_settings.search_hybrid_enabled = True
+            mock_settings.search_rrf_k = 60
+            mock_settings.embeddings_query_batch_max_size = 32
+            mock_settings.embeddings_query_batch_max_wait_ms = 5.0
+            mock_settings.faiss_snapshot_debounce_seconds = 2.0
+            mock_settings.faiss_snapshot_max_delay_seconds = 30.0
             
             # Mock the mkdir calls to avoid actual directory creation
             with patch.object(Path, 'mkdir'):
@@ -121,6 +149,52 @@ class TestFaissService:
             mock_transformer.assert_called_once_with(str(mock_settings.embeddings_model_name))
             assert faiss_service_instance.embedding_model == mock_transformer_instance
 
+    @pytest.mark.asyncio
+    async def test_load_embedding_model_onnx_backend(self, faiss_service_instance, mock_settings):
+        """The ONNX backend is used when configured."""
+        mock_settings.embeddings_backend = "onnx"
+        with patch('registry.search.service.SentenceTransformer') as mock_transformer, \
+             patch('registry.search.service.load_onnx_sentence_transformer') as mock_onnx, \
+             patch('os.environ'), \
+             patch.object(Path, 'exists', return_value=False):
+            await faiss_service_instance._load_embedding_model()
+
+        mock_onnx.assert_called_once_with(
+            str(mock_settings.embeddings_model_name), "avx2", mock_settings.embeddings_onnx_export_dir
+        )
+        mock_transformer.assert_not_called()
+        assert faiss_service_instance.embedding_model == mock_onnx.return_value
+
+    @pytest.mark.asyncio
+    async def test_load_embedding_model_onnx_falls_back_to_torch(self, faiss_service_instance, mock_settings):
+        """A missing ONNX runtime falls back to the PyTorch model."""
+        mock_settings.embeddings_backend = "onnx"
+        with patch('registry.search.service.SentenceTransformer') as mock_transformer, \
+             patch('registry.search.service.load_onnx_sentence_transformer',
+                   side_effect=ImportError("optimum not installed")), \
+             patch('os.environ'), \
+             patch.object(Path, 'exists', return_value=False):
+            await faiss_service_instance._load_embedding_model()
+
+        mock_transformer.assert_called_once_with(str(mock_settings.embeddings_model_name))
+        assert faiss_service_instance.embedding_model == mock_transformer.return_value
+
+    @pytest.mark.asyncio
+    async def test_load_embedding_model_sets_query_cache_case_folding(self, faiss_service_instance, mock_settings):
+        """Loading a model clears cached queries and folds case only for uncased tokenizers."""
+        faiss_service_instance.query_cache.put("AWS", np.ones((1, 3)))
+        with patch('registry.search.service.SentenceTransformer') as mock_transformer, \
+             patch('os.environ'), \
+             patch.object(Path, 'exists', return_value=False):
+            mock_transformer.return_value = Mock(tokenizer=Mock(do_lower_case=False))
+            await faiss_service_instance._load_embedding_model()
+            assert faiss_service_instance.query_cache.get("AWS") is None
+            assert faiss_service_instance.query_cache.fold_case is False
+
+            mock_transformer.return_value = Mock(tokenizer=Mock(do_lower_case=True))
+            await faiss_service_instance._load_embedding_model()
+            assert faiss_service_instance.query_cache.fold_case is True
+
     @pytest.mark.asyncio
     async def test_load_embedding_model_exception(self, faiss_service_instance, mock_settings):
         """Test handling exception during model loading."""
@@ -144,6 +218,7 @@ class TestFaissService:
             # Mock FAISS index
             mock_index = Mock()
             mock_index.d = 384  # Matching dimension
+            mock_index.metric_type = mock_faiss.METRIC_L2  # Matching metric
             mock_faiss.read_index.return_value = mock_index
             
             # Mock metadata file
@@ -242,6 +317,118 @@ class TestFaissService:
             # Should not raise exception
             await faiss_service_instance.save_data()
 
+    def _use_tmp_paths(self, mock_settings, tmp_path):
+        mock_settings.servers_dir = tmp_path
+        mock_settings.faiss_index_path = tmp_path / "service_index.faiss"
+        mock_settings.faiss_tool_index_path = tmp_path / "service_index_tools.faiss"
+        mock_settings.faiss_metadata_path = tmp_path / "service_index_metadata.json"
+        mock_settings.faiss_wal_path = tmp_path / "service_index_metadata.wal"
+        mock_settings.faiss_metadata_binary_path = tmp_path / "service_index_metadata.bin"
+        mock_settings.faiss_tool_vectors_path = tmp_path / "service_index_tool_vectors.bin"
+        mock_settings.embeddings_model_dimensions = 3
+
+    @pytest.mark.asyncio
+    async def test_save_data_replaces_files_atomically(self, faiss_service_instance, tmp_path, mock_settings):
+        """Snapshots go through temp files, write compact JSON and clear the write-ahead log."""
+        import faiss
+
+        self._use_tmp_paths(mock_settings, tmp_path)
+        faiss_service_instance.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.metadata_store = {"/a": {"id": 0, "entity_type": "mcp_server"}}
+        mock_settings.faiss_wal_path.write_text('{"seq": 1}\n')
+
+        await faiss_service_instance.save_data()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "service_index.faiss", "service_index_metadata.bin", "service_index_metadata.json"
+        ]
+        content = mock_settings.faiss_metadata_path.read_text()
+        assert "\n" not in content
+        assert json.loads(content)["metadata"] == {"/a": {"id": 0, "entity_type": "mcp_server"}}
+        mapped = MappedMetadata(mock_settings.faiss_metadata_binary_path)
+        assert dict(mapped) == {"/a": {"id": 0, "entity_type": "mcp_server"}}
+
+    @pytest.mark.asyncio
+    async def test_save_data_writes_live_tool_vectors(self, faiss_service_instance, tmp_path, mock_settings):
+        """Live tool vectors are exported for mcpgw; removed tools are left out."""
+        import faiss
+
+        self._use_tmp_paths(mock_settings, tmp_path)
+        faiss_service_instance.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.tool_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.tool_index.add_with_ids(
+            np.array([[2.0, 0, 0], [0, 5.0, 0], [0, 0, 1.0]], dtype=np.float32),
+            np.array([0, 1, 2], dtype=np.int64),
+        )
+        faiss_service_instance.tool_metadata_store = {
+            "/a": {"t0": {"id": 0, "text_hash": "h0"}, "t2": {"id": 2, "text_hash": "h2"}},
+        }
+
+        await faiss_service_instance.save_data()
+
+        mapped = MappedToolVectors(mock_settings.faiss_tool_vectors_path)
+        assert len(mapped) == 2
+        np.testing.assert_allclose(mapped.vectors[mapped.row_for("/a", "t0", "h0")], [1, 0, 0])
+        np.testing.assert_allclose(mapped.vectors[mapped.row_for("/a", "t2", "h2")], [0, 0, 1])
+
+    @pytest.mark.asyncio
+    async def test_record_changes_debounces_snapshots(self, faiss_service_instance, tmp_path, mock_settings):
+        """A burst of changes is appended to the log and costs a single snapshot."""
+        import asyncio
+
+        self._use_tmp_paths(mock_settings, tmp_path)
+        mock_settings.faiss_snapshot_debounce_seconds = 0.05
+        faiss_service_instance.metadata_store = {
+            f"/server{i}": {"id": i, "entity_type": "mcp_server"} for i in range(100)
+        }
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock) as mock_save:
+            for i in range(100):
+                await faiss_service_instance._record_changes([f"/server{i}"])
+            await asyncio.sleep(0.2)
+
+        mock_save.assert_called_once()
+        lines = mock_settings.faiss_wal_path.read_text().splitlines()
+        assert len(lines) == 100
+        assert [json.loads(line)["seq"] for line in lines] == list(range(1, 101))
+
+    @pytest.mark.asyncio
+    async def test_load_replays_write_ahead_log(self, faiss_service_instance, tmp_path, mock_settings):
+        """Changes logged after the last snapshot are applied on load and then snapshotted."""
+        import faiss
+
+        self._use_tmp_paths(mock_settings, tmp_path)
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        index.add_with_ids(np.ones((2, 3), dtype=np.float32), np.array([0, 1], dtype=np.int64))
+        faiss_service_instance.faiss_index = index
+        faiss_service_instance.metadata_store = {
+            "/keep": {"id": 0, "entity_type": "mcp_server", "text_hash": "k"},
+            "/drop": {"id": 1, "entity_type": "mcp_server", "text_hash": "d"},
+        }
+        faiss_service_instance.next_id_counter = 2
+        await faiss_service_instance.save_data()
+
+        # Changes after the snapshot only reach the log
+        faiss_service_instance.metadata_store["/new"] = {"id": 2, "entity_type": "mcp_server", "text_hash": "n"}
+        faiss_service_instance.next_id_counter = 3
+        del faiss_service_instance.metadata_store["/drop"]
+        with patch.object(faiss_service_instance, '_schedule_snapshot'):
+            await faiss_service_instance._record_changes(["/new", "/drop"])
+        # Simulate a crash mid-append
+        with open(mock_settings.faiss_wal_path, "a") as f:
+            f.write('{"op": "upsert", "pa')
+
+        restored = FaissService()
+        await restored._load_faiss_data()
+
+        assert set(restored.metadata_store) == {"/keep", "/new"}
+        # Replayed entries are re-embedded by the next index_many pass
+        assert restored.metadata_store["/new"]["text_hash"] is None
+        assert restored.metadata_store["/keep"]["text_hash"] == "k"
+        assert restored.next_id_counter == 3
+        assert restored.faiss_index.ntotal == 1
+        assert not mock_settings.faiss_wal_path.exists()
+
     @pytest.mark.asyncio
     async def test_add_or_update_service_not_initialized(self, faiss_service_instance):
         """Test add_or_update_service when service not initialized."""
@@ -340,6 +527,471 @@ class TestFaissService:
             # Should not raise exception
             await faiss_service_instance.add_or_update_service("test_service", server_info)
 
+    @pytest.mark.asyncio
+    async def test_index_many_embeds_only_changed_entities(self, faiss_service_instance, mock_settings):
+        """Bulk indexing re-encodes only entities whose text hash changed and saves once."""
+        import faiss
+
+        faiss_service_instance.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 3), dtype=np.float32)
+        )
+
+        entities = [
+            ("/one", {"server_name": "One", "description": "first", "tags": []}, "mcp_server", True),
+            ("/two", {"server_name": "Two", "description": "second", "tags": []}, "mcp_server", False),
+        ]
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock) as mock_save:
+            counts = await faiss_service_instance.index_many(entities)
+
+            assert counts == {"embedded": 2, "updated": 0, "unchanged": 0}
+            assert faiss_service_instance.faiss_index.ntotal == 2
+            assert faiss_service_instance.next_id_counter == 2
+            assert faiss_service_instance.metadata_store["/two"]["full_server_info"]["is_enabled"] is False
+            mock_save.assert_called_once()
+
+            # Identical input: nothing to encode, nothing to save
+            faiss_service_instance.embedding_model.encode.reset_mock()
+            mock_save.reset_mock()
+            counts = await faiss_service_instance.index_many(entities)
+
+            assert counts == {"embedded": 0, "updated": 0, "unchanged": 2}
+            faiss_service_instance.embedding_model.encode.assert_not_called()
+            mock_save.assert_not_called()
+
+            # One changed description and one enabled-state change
+            entities[0] = ("/one", {"server_name": "One", "description": "changed", "tags": []}, "mcp_server", True)
+            entities[1] = ("/two", {"server_name": "Two", "description": "second", "tags": []}, "mcp_server", True)
+            counts = await faiss_service_instance.index_many(entities)
+
+            assert counts == {"embedded": 1, "updated": 1, "unchanged": 0}
+            encoded_texts = faiss_service_instance.embedding_model.encode.call_args[0][0]
+            assert len(encoded_texts) == 1 and "changed" in encoded_texts[0]
+            assert faiss_service_instance.faiss_index.ntotal == 2
+            assert faiss_service_instance.metadata_store["/one"]["id"] == 0
+            assert faiss_service_instance.metadata_store["/two"]["full_server_info"]["is_enabled"] is True
+            mock_save.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_index_many_encodes_in_batches(self, faiss_service_instance, mock_settings):
+        """Bulk indexing splits pending texts into encode batches."""
+        import faiss
+
+        mock_settings.embeddings_batch_size = 2
+        faiss_service_instance.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 3), dtype=np.float32)
+        )
+
+        entities = [
+            (f"/server{i}", {"server_name": f"Server {i}", "description": "", "tags": []}, "mcp_server", True)
+            for i in range(5)
+        ]
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock) as mock_save:
+            counts = await faiss_service_instance.index_many(entities)
+
+        assert counts["embedded"] == 5
+        assert faiss_service_instance.embedding_model.encode.call_count == 3
+        assert faiss_service_instance.faiss_index.ntotal == 5
+        mock_save.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_remove_service_removes_vector(self, faiss_service_instance, mock_settings):
+        """Removing a service deletes its vector, not only the metadata entry."""
+        import faiss
+
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        index.add_with_ids(np.ones((2, 3), dtype=np.float32), np.array([0, 1], dtype=np.int64))
+        faiss_service_instance.faiss_index = index
+        faiss_service_instance.metadata_store = {
+            "/keep": {"id": 0, "entity_type": "mcp_server"},
+            "/drop": {"id": 1, "entity_type": "mcp_server"},
+        }
+        faiss_service_instance.next_id_counter = 2
+
+        with patch.object(faiss_service_instance, '_record_changes', new_callable=AsyncMock) as mock_record:
+            await faiss_service_instance.remove_service("/drop")
+
+        mock_record.assert_called_once_with(["/drop"], ["/drop"])
+
+        assert index.ntotal == 1
+        assert "/drop" not in faiss_service_instance.metadata_store
+        assert faiss_service_instance.get_tombstone_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_reverse_id_map_tracks_updates(self, faiss_service_instance, mock_settings):
+        """The ID-to-path map follows bulk indexing and removals without per-query rebuilds."""
+        import faiss
+
+        faiss_service_instance.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 3), dtype=np.float32)
+        )
+        entities = [
+            ("/one", {"server_name": "One", "description": "", "tags": []}, "mcp_server", True),
+            ("/two", {"server_name": "Two", "description": "", "tags": []}, "mcp_server", True),
+        ]
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock), \
+             patch.object(faiss_service_instance, '_record_changes', new_callable=AsyncMock):
+            await faiss_service_instance.index_many(entities)
+            assert faiss_service_instance._id_to_path == {0: "/one", 1: "/two"}
+
+            await faiss_service_instance.remove_service("/one")
+
+        assert faiss_service_instance._id_to_path == {1: "/two"}
+        assert faiss_service_instance._path_for_id(0) is None
+        assert faiss_service_instance._path_for_id(1) == "/two"
+
+    def test_verify_id_maps_repairs_metadata(self, faiss_service_instance, mock_settings):
+        """Duplicate IDs and entries without vectors are flagged for re-embedding on load."""
+        import faiss
+
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        index.add_with_ids(np.ones((1, 3), dtype=np.float32), np.array([0], dtype=np.int64))
+        faiss_service_instance.faiss_index = index
+        faiss_service_instance.metadata_store = {
+            "/a": {"id": 0, "text_hash": "a"},
+            "/b": {"id": 0, "text_hash": "b"},
+            "/c": {"id": 5, "text_hash": "c"},
+        }
+        faiss_service_instance.next_id_counter = 1
+
+        repaired = faiss_service_instance._verify_id_maps()
+
+        assert repaired == 2
+        store = faiss_service_instance.metadata_store
+        assert store["/a"]["text_hash"] == "a"
+        assert store["/b"]["text_hash"] is None and store["/b"]["id"] == 1
+        assert store["/c"]["text_hash"] is None
+        assert faiss_service_instance._id_to_path == {0: "/a", 1: "/b", 5: "/c"}
+        assert faiss_service_instance.next_id_counter == 6
+
+    @pytest.mark.asyncio
+    async def test_index_many_reembeds_flagged_entries(self, faiss_service_instance, mock_settings):
+        """Entries whose vector went missing are re-encoded and added back to the index."""
+        import faiss
+
+        server_info = {"server_name": "One", "description": "first", "tags": []}
+        text = faiss_service_instance._get_text_for_embedding(server_info)
+        faiss_service_instance.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.metadata_store = {
+            "/one": {
+                "id": 0,
+                "text_for_embedding": text,
+                "text_hash": faiss_service_instance._hash_text(text),
+                "full_server_info": {**server_info, "is_enabled": True},
+                "entity_type": "mcp_server",
+            },
+        }
+        faiss_service_instance.next_id_counter = 1
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 3), dtype=np.float32)
+        )
+
+        # The orphaned entry is flagged while verifying the loaded index
+        assert faiss_service_instance._verify_id_maps() == 1
+        assert faiss_service_instance.metadata_store["/one"]["text_hash"] is None
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            counts = await faiss_service_instance.index_many([("/one", server_info, "mcp_server", True)])
+
+        assert counts == {"embedded": 1, "updated": 0, "unchanged": 0}
+        faiss_service_instance.embedding_model.encode.assert_called_once()
+        assert faiss_service_instance.faiss_index.ntotal == 1
+        assert faiss_service_instance.metadata_store["/one"]["text_hash"] == faiss_service_instance._hash_text(text)
+
+    @pytest.mark.asyncio
+    async def test_add_or_update_service_reembeds_replayed_entry(self, faiss_service_instance, mock_settings):
+        """A replayed entry without a vector is re-encoded even if its text is unchanged."""
+        import faiss
+
+        server_info = {"server_name": "One", "description": "first", "tags": []}
+        faiss_service_instance.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.metadata_store = {}
+        faiss_service_instance._apply_wal_record({
+            "op": "upsert",
+            "path": "/one",
+            "entry": {
+                "id": 0,
+                "text_for_embedding": faiss_service_instance._get_text_for_embedding(server_info),
+                "text_hash": "stale",
+                "full_server_info": {**server_info, "is_enabled": True},
+                "entity_type": "mcp_server",
+            },
+            "next_id": 1,
+        })
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 3), dtype=np.float32)
+        )
+
+        with patch.object(faiss_service_instance, '_record_changes', new_callable=AsyncMock):
+            await faiss_service_instance.add_or_update_service("/one", server_info, True)
+
+        faiss_service_instance.embedding_model.encode.assert_called_once()
+        assert faiss_service_instance.faiss_index.ntotal == 1
+        assert faiss_service_instance.metadata_store["/one"]["id"] == 0
+
+    @pytest.mark.asyncio
+    async def test_compact_index_renumbers_ids(self, faiss_service_instance, mock_settings):
+        """Compaction rebuilds a dense index, keeps live vectors and resets the ID counter."""
+        import faiss
+
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        vectors = np.array([[0, 0, 0], [1, 1, 1], [2, 2, 2], [3, 3, 3]], dtype=np.float32)
+        index.add_with_ids(vectors, np.array([0, 3, 5, 9], dtype=np.int64))
+        faiss_service_instance.faiss_index = index
+        # ID 5 is an orphaned vector left behind without metadata
+        faiss_service_instance.metadata_store = {
+            "/a": {"id": 3, "entity_type": "mcp_server"},
+            "/b": {"id": 9, "entity_type": "mcp_server"},
+            "/c": {"id": 0, "entity_type": "a2a_agent"},
+        }
+        faiss_service_instance.next_id_counter = 10
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock) as mock_save:
+            result = await faiss_service_instance.compact_index(force=True)
+
+        assert result["live"] == 3
+        assert result["dropped"] == 1
+        assert result["tombstones_cleared"] == 7
+        assert faiss_service_instance.next_id_counter == 3
+        assert sorted(e["id"] for e in faiss_service_instance.metadata_store.values()) == [0, 1, 2]
+        new_index = faiss_service_instance.faiss_index
+        assert new_index.ntotal == 3
+        distances, ids = new_index.search(np.array([[3, 3, 3]], dtype=np.float32), 1)
+        assert ids[0][0] == faiss_service_instance.metadata_store["/b"]["id"]
+        mock_save.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_compact_index_serialises_with_updates(self, faiss_service_instance, mock_settings):
+        """An update racing a background compaction gets an ID from the renumbered range."""
+        import asyncio
+        import faiss
+
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        index.add_with_ids(np.ones((2, 3), dtype=np.float32), np.array([0, 5], dtype=np.int64))
+        faiss_service_instance.faiss_index = index
+        faiss_service_instance.metadata_store = {
+            "/a": {"id": 0, "entity_type": "mcp_server"},
+            "/b": {"id": 5, "entity_type": "mcp_server"},
+        }
+        faiss_service_instance.next_id_counter = 6
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 3), dtype=np.float32)
+        )
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock), \
+             patch.object(faiss_service_instance, '_record_changes', new_callable=AsyncMock):
+            # The update allocates its ID, then yields while encoding
+            await asyncio.gather(
+                faiss_service_instance.add_or_update_service(
+                    "/new", {"server_name": "New", "description": "", "tags": []}, True
+                ),
+                faiss_service_instance.compact_index(force=True),
+            )
+
+        ids = [entry["id"] for entry in faiss_service_instance.metadata_store.values()]
+        assert sorted(ids) == [0, 1, 2]
+        assert faiss_service_instance.next_id_counter == 3
+        assert faiss_service_instance.faiss_index.ntotal == 3
+        assert faiss_service_instance._path_for_id(2) == "/new"
+
+    @pytest.mark.asyncio
+    async def test_compact_index_skips_below_threshold(self, faiss_service_instance, mock_settings):
+        """Compaction without force is a no-op until the tombstone threshold is reached."""
+        faiss_service_instance._initialize_new_index()
+        faiss_service_instance.metadata_store = {"/a": {"id": 0}}
+        faiss_service_instance.next_id_counter = 2
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock) as mock_save:
+            result = await faiss_service_instance.compact_index()
+
+        assert result["tombstones_cleared"] == 0
+        assert faiss_service_instance.next_id_counter == 2
+        mock_save.assert_not_called()
+
+    def test_initialize_new_index_hnsw(self, faiss_service_instance, mock_settings):
+        """HNSW backend is selected from settings and wrapped for custom IDs."""
+        import faiss
+
+        mock_settings.faiss_index_type = "hnsw"
+        faiss_service_instance._initialize_new_index()
+
+        assert faiss_service_instance.index_type == "hnsw"
+        hnsw_index = faiss.downcast_index(faiss_service_instance.faiss_index.index)
+        assert isinstance(hnsw_index, faiss.IndexHNSWFlat)
+        assert hnsw_index.hnsw.efSearch == 32
+
+    def test_ivfpq_waits_for_training_data(self, faiss_service_instance, mock_settings):
+        """IVF-PQ falls back to flat search until enough vectors exist to train it."""
+        mock_settings.faiss_index_type = "ivfpq"
+
+        assert faiss_service_instance._target_index_type(10) == "flat"
+        assert faiss_service_instance._target_index_type(512) == "ivfpq"
+
+    def test_ivfpq_fallback_has_hysteresis(self, faiss_service_instance, mock_settings):
+        """Churn just below the training threshold does not push an IVF-PQ index back to flat."""
+        mock_settings.faiss_index_type = "ivfpq"
+
+        assert faiss_service_instance._target_index_type(500, "flat") == "flat"
+        assert faiss_service_instance._target_index_type(500, "ivfpq") == "ivfpq"
+        assert faiss_service_instance._target_index_type(409, "ivfpq") == "ivfpq"
+        assert faiss_service_instance._target_index_type(408, "ivfpq") == "flat"
+        assert not faiss_service_instance._index_needs_rebuild("ivfpq", 500, 500)
+        assert not faiss_service_instance._index_needs_rebuild("flat", 500, 500)
+        assert faiss_service_instance._index_needs_rebuild("ivfpq", 400, 400)
+
+    @pytest.mark.asyncio
+    async def test_compact_index_trains_ivfpq_on_rebuild(self, faiss_service_instance, mock_settings):
+        """Once past the training threshold, compaction migrates a flat index to IVF-PQ."""
+        import faiss
+
+        mock_settings.faiss_index_type = "ivfpq"
+        dimension = 16
+        num_vectors = 600
+        rng = np.random.default_rng(0)
+        vectors = rng.random((num_vectors, dimension), dtype=np.float32)
+
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(dimension))
+        index.add_with_ids(vectors, np.arange(num_vectors, dtype=np.int64))
+        faiss_service_instance.faiss_index = index
+        faiss_service_instance.index_type = "flat"
+        faiss_service_instance.metadata_store = {
+            f"/server{i}": {"id": i, "entity_type": "mcp_server"} for i in range(num_vectors)
+        }
+        faiss_service_instance.next_id_counter = num_vectors
+
+        assert faiss_service_instance._needs_compaction()
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            result = await faiss_service_instance.compact_index()
+
+        assert result["live"] == num_vectors
+        assert faiss_service_instance.index_type == "ivfpq"
+        assert isinstance(faiss_service_instance.faiss_index, faiss.IndexIVFPQ)
+        assert faiss_service_instance.faiss_index.is_trained
+        assert faiss_service_instance.faiss_index.nprobe == 4
+
+        # IVF-PQ supports real removal through its direct map
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            await faiss_service_instance.remove_service("/server0")
+        assert faiss_service_instance.faiss_index.ntotal == num_vectors - 1
+
+    @pytest.mark.asyncio
+    async def test_ivfpq_rebuild_reembeds_instead_of_reconstructing(self, faiss_service_instance, mock_settings):
+        """Rebuilding an IVF-PQ index starts from fresh embeddings, not PQ reconstructions."""
+        import faiss
+
+        mock_settings.faiss_index_type = "ivfpq"
+        dimension = 16
+        num_vectors = 600
+        rng = np.random.default_rng(0)
+        vectors = rng.random((num_vectors, dimension), dtype=np.float32)
+
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(dimension))
+        index.add_with_ids(vectors, np.arange(num_vectors, dtype=np.int64))
+        faiss_service_instance.faiss_index = index
+        faiss_service_instance.index_type = "flat"
+        faiss_service_instance.metadata_store = {
+            f"/server{i}": {"id": i, "entity_type": "mcp_server", "text_for_embedding": f"server {i}", "text_hash": "h"}
+            for i in range(num_vectors)
+        }
+        faiss_service_instance.next_id_counter = num_vectors
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = lambda texts, **kwargs: np.array(
+            [vectors[int(text.split()[1])] for text in texts], dtype=np.float32
+        )
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            await faiss_service_instance.compact_index()
+            assert faiss_service_instance.index_type == "ivfpq"
+            faiss_service_instance.embedding_model.encode.assert_not_called()
+
+            # Dropping well below the training threshold migrates back to flat
+            for i in range(200, num_vectors):
+                faiss_service_instance._pop_entry(f"/server{i}")
+            await faiss_service_instance.compact_index(force=True)
+
+        assert faiss_service_instance.index_type == "flat"
+        assert faiss_service_instance.embedding_model.encode.called
+        assert [faiss_service_instance.metadata_store[f"/server{i}"]["id"] for i in range(200)] == list(range(200))
+        np.testing.assert_allclose(faiss_service_instance.faiss_index.index.reconstruct_n(0, 200), vectors[:200])
+
+    @pytest.mark.asyncio
+    async def test_ivfpq_reembedding_runs_outside_index_lock(self, faiss_service_instance, mock_settings):
+        """Re-embedding for a rebuild does not hold the index lock; entries edited meanwhile are re-encoded."""
+        import faiss
+
+        mock_settings.faiss_index_type = "ivfpq"
+        dimension = 16
+        num_vectors = 600
+        rng = np.random.default_rng(0)
+        vectors = rng.random((num_vectors, dimension), dtype=np.float32)
+
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(dimension))
+        index.add_with_ids(vectors, np.arange(num_vectors, dtype=np.int64))
+        faiss_service_instance.faiss_index = index
+        faiss_service_instance.index_type = "flat"
+        faiss_service_instance.metadata_store = {
+            f"/server{i}": {"id": i, "entity_type": "mcp_server", "text_for_embedding": f"server {i}", "text_hash": "h"}
+            for i in range(num_vectors)
+        }
+        faiss_service_instance.next_id_counter = num_vectors
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            await faiss_service_instance.compact_index()
+        assert faiss_service_instance.index_type == "ivfpq"
+
+        calls = []
+
+        def encode(texts, **kwargs):
+            calls.append((faiss_service_instance._index_lock.locked(), list(texts)))
+            if len(calls) == 1:
+                # An edit lands while the snapshot is being re-embedded
+                faiss_service_instance.metadata_store["/server5"]["text_for_embedding"] = "server 7 edited"
+            return np.array([vectors[int(text.split()[1])] for text in texts], dtype=np.float32)
+
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = encode
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            await faiss_service_instance.compact_index(force=True)
+
+        unlocked = [text for locked, texts in calls if not locked for text in texts]
+        locked = [text for locked, texts in calls if locked for text in texts]
+        assert len(unlocked) == num_vectors
+        assert locked == ["server 7 edited"]
+        new_id = faiss_service_instance.metadata_store["/server5"]["id"]
+        distances, ids = faiss_service_instance.faiss_index.search(vectors[7:8], 1)
+        assert ids[0][0] == new_id
+
+    @pytest.mark.asyncio
+    async def test_hnsw_updates_leave_tombstones(self, faiss_service_instance, mock_settings):
+        """HNSW cannot delete vectors, so re-embedding assigns a fresh ID."""
+        mock_settings.faiss_index_type = "hnsw"
+        mock_settings.embeddings_model_dimensions = 3
+        faiss_service_instance._initialize_new_index()
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 3), dtype=np.float32)
+        )
+
+        server = {"server_name": "One", "description": "first", "tags": []}
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            await faiss_service_instance.index_many([("/one", server, "mcp_server", True)])
+            changed = dict(server, description="changed")
+            await faiss_service_instance.index_many([("/one", changed, "mcp_server", True)])
+
+        assert faiss_service_instance.metadata_store["/one"]["id"] == 1
+        assert faiss_service_instance.faiss_index.ntotal == 2
+        assert faiss_service_instance.get_tombstone_count() == 1
+
     @pytest.mark.asyncio
     async def test_search_mixed_returns_servers_and_tools(self, faiss_service_instance, mock_settings):
         """Test semantic search happy path for servers and tools."""
@@ -405,6 +1057,369 @@ class TestFaissService:
         assert results["tools"][0]["tool_name"] == "alpha_tool"
         assert results["agents"][0]["agent_name"] == "Demo Agent"
 
+    @pytest.mark.asyncio
+    async def test_index_many_syncs_tool_vectors(self, faiss_service_instance, mock_settings):
+        """Tools are embedded once, re-embedded when changed and dropped when removed."""
+        import faiss
+
+        faiss_service_instance.faiss_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.tool_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 3), dtype=np.float32)
+        )
+
+        def server(tools):
+            return {"server_name": "Demo", "description": "demo", "tags": [], "tool_list": tools}
+
+        tools = [
+            {"name": "alpha", "description": "first tool"},
+            {"name": "beta", "description": "second tool"},
+        ]
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock), \
+             patch.object(faiss_service_instance, '_record_changes', new_callable=AsyncMock):
+            await faiss_service_instance.index_many([("/demo", server(tools), "mcp_server", True)])
+
+            assert faiss_service_instance.tool_index.ntotal == 2
+            assert set(faiss_service_instance.tool_metadata_store["/demo"]) == {"alpha", "beta"}
+
+            # Change beta, drop alpha: only beta is re-encoded
+            faiss_service_instance.embedding_model.encode.reset_mock()
+            tools = [{"name": "beta", "description": "second tool, revised"}]
+            await faiss_service_instance.index_many([("/demo", server(tools), "mcp_server", True)])
+
+            tool_texts = [
+                call_args[0][0] for call_args in faiss_service_instance.embedding_model.encode.call_args_list
+            ]
+            assert ["Service: Demo. Tool: beta. Description: second tool, revised"] in tool_texts
+            assert faiss_service_instance.tool_index.ntotal == 1
+            assert set(faiss_service_instance.tool_metadata_store["/demo"]) == {"beta"}
+
+            await faiss_service_instance.remove_service("/demo")
+
+        assert faiss_service_instance.tool_index.ntotal == 0
+        assert "/demo" not in faiss_service_instance.tool_metadata_store
+
+    @pytest.mark.asyncio
+    async def test_search_mixed_uses_tool_index(self, faiss_service_instance, mock_settings):
+        """Tool hits come from the tool index even when their server is outside the server top-k."""
+        import faiss
+
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.return_value = [[0.0, 0.0, 1.0]]
+
+        server_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        server_index.add_with_ids(
+            np.array([[0, 0, 1], [1, 0, 0]], dtype=np.float32), np.array([0, 1], dtype=np.int64)
+        )
+        tool_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        tool_index.add_with_ids(
+            np.array([[0, 0, 1], [0, 1, 0]], dtype=np.float32), np.array([0, 1], dtype=np.int64)
+        )
+        faiss_service_instance.faiss_index = server_index
+        faiss_service_instance.tool_index = tool_index
+
+        def server(name, tool_name):
+            return {
+                "server_name": name,
+                "description": "",
+                "tags": [],
+                "tool_list": [{"name": tool_name, "description": f"{tool_name} description"}],
+            }
+
+        faiss_service_instance.metadata_store = {
+            "/near": {"id": 0, "entity_type": "mcp_server", "full_server_info": server("Near", "unrelated")},
+            "/far": {"id": 1, "entity_type": "mcp_server", "full_server_info": server("Far", "exact_match")},
+        }
+        faiss_service_instance.tool_metadata_store = {
+            "/far": {"exact_match": {"id": 0, "text_hash": "x"}},
+            "/near": {"unrelated": {"id": 1, "text_hash": "y"}},
+        }
+
+        results = await faiss_service_instance.search_mixed(
+            query="exact", entity_types=["mcp_server", "tool"], max_results=1
+        )
+
+        assert [s["path"] for s in results["servers"]] == ["/near"]
+        assert results["tools"][0]["tool_name"] == "exact_match"
+        assert results["tools"][0]["server_path"] == "/far"
+        assert results["tools"][0]["relevance_score"] == pytest.approx(1.0)
+
+    def _exact_name_fixture(self, faiss_service_instance):
+        """Two servers where the vector ranking puts the exact tool-name match last."""
+        import faiss
+
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.return_value = [[0.0, 0.0, 1.0]]
+
+        server_index = faiss.IndexIDMap(faiss.IndexFlatL2(3))
+        server_index.add_with_ids(
+            np.array([[0, 0, 1], [1, 0, 0]], dtype=np.float32), np.array([0, 1], dtype=np.int64)
+        )
+        faiss_service_instance.faiss_index = server_index
+
+        def server(name, description, tool_name):
+            info = {
+                "server_name": name,
+                "description": description,
+                "tags": [],
+                "tool_list": [{"name": tool_name, "description": description}],
+            }
+            return {
+                "id": 0,
+                "entity_type": "mcp_server",
+                "text_for_embedding": faiss_service_instance._get_text_for_embedding(info),
+                "full_server_info": info,
+            }
+
+        faiss_service_instance._set_entry("/markets", server("Markets", "Market news and quotes", "list_news"))
+        faiss_service_instance._set_entry(
+            "/fininfo",
+            {**server("Fininfo", "Financial data", "get_stock_aggregates"), "id": 1},
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_mixed_fuses_keyword_matches(self, faiss_service_instance, mock_settings):
+        """An exact tool name outranks a closer vector neighbour once BM25 results are fused in."""
+        self._exact_name_fixture(faiss_service_instance)
+
+        results = await faiss_service_instance.search_mixed(
+            query="get_stock_aggregates", entity_types=["mcp_server", "tool"], max_results=2
+        )
+
+        assert [s["path"] for s in results["servers"]] == ["/fininfo", "/markets"]
+        assert results["servers"][0]["matching_tools"][0]["tool_name"] == "get_stock_aggregates"
+        assert results["tools"][0]["tool_name"] == "get_stock_aggregates"
+        assert all(0.0 <= s["relevance_score"] <= 1.0 for s in results["servers"])
+
+    @pytest.mark.asyncio
+    async def test_search_mixed_vector_only_when_hybrid_disabled(self, faiss_service_instance, mock_settings):
+        """With hybrid search off, ranking follows vector distance alone."""
+        mock_settings.search_hybrid_enabled = False
+        self._exact_name_fixture(faiss_service_instance)
+
+        results = await faiss_service_instance.search_mixed(
+            query="get_stock_aggregates", entity_types=["mcp_server"], max_results=2
+        )
+
+        assert [s["path"] for s in results["servers"]] == ["/markets", "/fininfo"]
+
+    def test_lexical_index_follows_metadata_changes(self, faiss_service_instance, mock_settings):
+        """Entries set, replaced and popped are reflected in the BM25 indexes."""
+        info = {"server_name": "Fininfo", "tool_list": [{"name": "get_stock_aggregates"}]}
+        faiss_service_instance._set_entry(
+            "/fininfo", {"id": 0, "text_for_embedding": "Name: Fininfo", "full_server_info": info}
+        )
+        assert "/fininfo" in faiss_service_instance.lexical_index
+        assert ("/fininfo", "get_stock_aggregates") in faiss_service_instance.tool_lexical_index
+
+        faiss_service_instance._set_entry(
+            "/fininfo", {"id": 0, "text_for_embedding": "Name: Fininfo", "full_server_info": {"tool_list": []}}
+        )
+        assert ("/fininfo", "get_stock_aggregates") not in faiss_service_instance.tool_lexical_index
+
+        faiss_service_instance._pop_entry("/fininfo")
+        assert len(faiss_service_instance.lexical_index) == 0
+
+    def _many_servers_fixture(self, faiss_service_instance, index_type, num_servers=400):
+        """Populate a real index of small random vectors, one per server."""
+        dimension = 8
+        rng = np.random.default_rng(7)
+        vectors = rng.random((num_servers, dimension), dtype=np.float32)
+
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.return_value = [vectors[0]]
+        faiss_service_instance.index_type = index_type
+        faiss_service_instance.faiss_index = faiss_service_instance._create_empty_index(
+            dimension=dimension, index_type=index_type
+        )
+        faiss_service_instance._apply_search_params(faiss_service_instance.faiss_index, index_type)
+        faiss_service_instance.faiss_index.add_with_ids(vectors, np.arange(num_servers, dtype=np.int64))
+        faiss_service_instance.metadata_store = {
+            f"/server{i}": {
+                "id": i,
+                "entity_type": "mcp_server",
+                "text_for_embedding": f"Name: server{i}",
+                "full_server_info": {"server_name": f"server{i}", "is_enabled": i % 2 == 0},
+            }
+            for i in range(num_servers)
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    async def test_search_mixed_prefilters_by_access(self, faiss_service_instance, mock_settings, index_type):
+        """A user who can see only a few servers still gets all of them back."""
+        mock_settings.search_hybrid_enabled = False
+        mock_settings.faiss_hnsw_ef_search = 4
+        self._many_servers_fixture(faiss_service_instance, index_type)
+        visible = {"/server350", "/server351", "/server352", "/server353", "/server399"}
+        access_filter = Mock(side_effect=lambda entity_type, path, name: path in visible)
+
+        results = await faiss_service_instance.search_mixed(
+            query="servers", entity_types=["mcp_server"], max_results=5, access_filter=access_filter
+        )
+
+        assert {s["path"] for s in results["servers"]} == visible
+        access_filter.assert_any_call("mcp_server", "/server350", "server350")
+
+    @pytest.mark.asyncio
+    async def test_search_mixed_enabled_only(self, faiss_service_instance, mock_settings):
+        """enabled_only drops disabled servers before the kNN search, keeping k results."""
+        self._many_servers_fixture(faiss_service_instance, "flat", num_servers=20)
+
+        results = await faiss_service_instance.search_mixed(
+            query="server", entity_types=["mcp_server"], max_results=10, enabled_only=True
+        )
+
+        assert len(results["servers"]) == 10
+        assert all(s["is_enabled"] for s in results["servers"])
+
+    def test_filter_sets_skip_store_scan(self, faiss_service_instance, mock_settings):
+        """Type and enabled filters come from sets kept in step with the store, not a scan."""
+        self._many_servers_fixture(faiss_service_instance, "flat", num_servers=6)
+        faiss_service_instance._set_entry(
+            "/agent", {"id": 6, "entity_type": "a2a_agent", "full_agent_card": {"name": "agent", "is_enabled": True}}
+        )
+        faiss_service_instance._pop_entry("/server4")
+
+        class ScanGuard(dict):
+            def items(self):
+                raise AssertionError("metadata store scanned")
+
+            def values(self):
+                raise AssertionError("metadata store scanned")
+
+            def __iter__(self):
+                raise AssertionError("metadata store scanned")
+
+        faiss_service_instance._metadata_store = ScanGuard(faiss_service_instance._metadata_store)
+
+        assert faiss_service_instance._allowed_entity_ids({"mcp_server", "a2a_agent"}, None) == (None, None)
+        paths, ids = faiss_service_instance._allowed_entity_ids({"a2a_agent"}, None)
+        assert paths == {"/agent"} and ids == [6]
+
+        visible = faiss_service_instance._visible_paths({"mcp_server", "a2a_agent"}, True, None)
+        assert visible == {"/server0", "/server2", "/agent"}
+        paths, ids = faiss_service_instance._allowed_entity_ids({"mcp_server"}, visible)
+        assert paths == {"/server0", "/server2"} and sorted(ids) == [0, 2]
+
+    @pytest.mark.asyncio
+    async def test_search_mixed_prefilters_tools_by_server_access(self, faiss_service_instance, mock_settings):
+        """Tool hits only come from servers the access filter allows."""
+        self._exact_name_fixture(faiss_service_instance)
+
+        results = await faiss_service_instance.search_mixed(
+            query="get_stock_aggregates",
+            entity_types=["mcp_server", "tool"],
+            max_results=5,
+            access_filter=lambda entity_type, path, name: path == "/markets",
+        )
+
+        assert [s["path"] for s in results["servers"]] == ["/markets"]
+        assert all(t["server_path"] == "/markets" for t in results["tools"])
+
+    def test_cosine_metric_uses_inner_product_indexes(self, faiss_service_instance, mock_settings):
+        """Cosine mode builds inner-product indexes of every type."""
+        import faiss
+
+        mock_settings.faiss_metric = "cosine"
+
+        for index_type in ("flat", "hnsw"):
+            index = faiss_service_instance._create_empty_index(dimension=8, index_type=index_type)
+            assert index.metric_type == faiss.METRIC_INNER_PRODUCT
+
+    @pytest.mark.asyncio
+    async def test_cosine_scores_and_min_score(self, faiss_service_instance, mock_settings):
+        """Cosine mode stores normalised vectors and reports cosine similarity; min_score cuts weak hits."""
+        mock_settings.faiss_metric = "cosine"
+        mock_settings.search_hybrid_enabled = False
+        faiss_service_instance._initialize_new_index()
+        faiss_service_instance.faiss_index = faiss_service_instance._create_empty_index(dimension=3)
+
+        vectors = {"Near": [4.0, 0.0, 0.0], "Angled": [1.0, 1.0, 0.0], "Far": [0.0, 0.0, 2.0]}
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = lambda texts, **kwargs: [
+            next(vector for name, vector in vectors.items() if f"Name: {name}" in text)
+            if text.startswith("Name:") else [2.0, 0.0, 0.0]
+            for text in texts
+        ]
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            await faiss_service_instance.index_many(
+                [(f"/{name.lower()}", {"server_name": name}, "mcp_server", True) for name in vectors]
+            )
+
+        results = await faiss_service_instance.search_mixed(
+            query="query", entity_types=["mcp_server"], max_results=5
+        )
+        scores = {s["path"]: s["relevance_score"] for s in results["servers"]}
+        assert scores["/near"] == pytest.approx(1.0, abs=1e-5)
+        assert scores["/angled"] == pytest.approx(0.7071, abs=1e-3)
+        assert scores["/far"] == pytest.approx(0.0, abs=1e-5)
+
+        results = await faiss_service_instance.search_mixed(
+            query="query", entity_types=["mcp_server"], max_results=5, min_score=0.5
+        )
+        assert [s["path"] for s in results["servers"]] == ["/near", "/angled"]
+
+    @pytest.mark.asyncio
+    async def test_min_score_applies_to_similarity_in_hybrid_mode(self, faiss_service_instance, mock_settings):
+        """With hybrid search on, scores stay cosine similarities and min_score drops keyword-only weak hits."""
+        mock_settings.faiss_metric = "cosine"
+        mock_settings.search_hybrid_enabled = True
+        faiss_service_instance._initialize_new_index()
+        faiss_service_instance.faiss_index = faiss_service_instance._create_empty_index(dimension=3)
+
+        vectors = {"Near": [4.0, 0.0, 0.0], "Angled": [1.0, 1.0, 0.0], "Far": [0.0, 0.0, 2.0]}
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.side_effect = lambda texts, **kwargs: [
+            next(vector for name, vector in vectors.items() if f"Name: {name}" in text)
+            if text.startswith("Name:") else [2.0, 0.0, 0.0]
+            for text in texts
+        ]
+
+        with patch.object(faiss_service_instance, 'save_data', new_callable=AsyncMock):
+            await faiss_service_instance.index_many(
+                [(f"/{name.lower()}", {"server_name": name}, "mcp_server", True) for name in vectors]
+            )
+
+        # "far" is an exact keyword match for /far, whose vector is orthogonal to the query
+        results = await faiss_service_instance.search_mixed(
+            query="far", entity_types=["mcp_server"], max_results=5
+        )
+        scores = {s["path"]: s["relevance_score"] for s in results["servers"]}
+        assert scores["/near"] == pytest.approx(1.0, abs=1e-5)
+        assert scores["/angled"] == pytest.approx(0.7071, abs=1e-3)
+        assert scores["/far"] == pytest.approx(0.0, abs=1e-5)
+
+        results = await faiss_service_instance.search_mixed(
+            query="far", entity_types=["mcp_server"], max_results=5, min_score=0.5
+        )
+        assert [s["path"] for s in results["servers"]] == ["/near", "/angled"]
+
+    @pytest.mark.asyncio
+    async def test_search_mixed_reuses_cached_query_embedding(self, faiss_service_instance, mock_settings):
+        """Repeated queries are encoded once and served from the query cache."""
+        faiss_service_instance.embedding_model = Mock()
+        faiss_service_instance.embedding_model.encode.return_value = [[0.1] * 384]
+
+        mock_index = Mock()
+        mock_index.ntotal = 1
+        mock_index.search.return_value = (
+            np.array([[0.25]], dtype=np.float32),
+            np.array([[-1]], dtype=np.int64),
+        )
+        faiss_service_instance.faiss_index = mock_index
+
+        await faiss_service_instance.search_mixed(query="stock price", entity_types=None, max_results=5)
+        await faiss_service_instance.search_mixed(query=" stock  price ", entity_types=None, max_results=5)
+
+        faiss_service_instance.embedding_model.encode.assert_called_once()
+        stats = faiss_service_instance.get_query_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
     @pytest.mark.asyncio
     async def test_search_mixed_rejects_empty_query(self, faiss_service_instance, mock_settings):
         """Ensure empty queries raise validation errors."""
@@ -417,6 +1432,49 @@ class TestFaissService:
                 query="  ", entity_types=None, max_results=5
             )
 
+    @pytest.mark.asyncio
+    async def test_search_mixed_raises_while_warming(self, faiss_service_instance, mock_settings):
+        """Searches before the model has loaded report the warming state."""
+        faiss_service_instance.state = "warming"
+
+        with pytest.raises(SearchWarmingError):
+            await faiss_service_instance.search_mixed(query="time", entity_types=None, max_results=5)
+
+    @pytest.mark.asyncio
+    async def test_warm_up_indexes_entities_and_drains_removals(self, faiss_service_instance, mock_settings):
+        """Background warm-up loads the model, applies queued removals and indexes entities."""
+        faiss_service_instance.state = "warming"
+        await faiss_service_instance.remove_service("/gone")
+        assert faiss_service_instance._pending_removals == {"/gone"}
+
+        entities = [("/kept", {"server_name": "kept"}, "mcp_server", True)]
+
+        async def fake_initialize():
+            faiss_service_instance.faiss_index = Mock()
+            faiss_service_instance.state = "ready"
+
+        with patch.object(faiss_service_instance, 'initialize', side_effect=fake_initialize), \
+             patch.object(faiss_service_instance, 'remove_service', new_callable=AsyncMock) as mock_remove, \
+             patch.object(faiss_service_instance, 'index_many', new_callable=AsyncMock) as mock_index_many:
+            await faiss_service_instance._warm_up(lambda: entities)
+
+        mock_remove.assert_awaited_once_with("/gone")
+        mock_index_many.assert_awaited_once_with(entities)
+        assert faiss_service_instance._pending_removals == set()
+        assert faiss_service_instance.state == "ready"
+
+    @pytest.mark.asyncio
+    async def test_warm_up_failure_marks_service_failed(self, faiss_service_instance, mock_settings):
+        """A failed model load leaves search in the failed state instead of warming forever."""
+        faiss_service_instance.state = "warming"
+        provider = Mock()
+
+        with patch.object(faiss_service_instance, 'initialize', side_effect=RuntimeError("no model")):
+            await faiss_service_instance._warm_up(provider)
+
+        assert faiss_service_instance.state == "failed"
+        provider.assert_not_called()
+
     def test_global_service_instance(self):
         """Test that the global service instance is accessible."""
         from registry.search.service import faiss_service
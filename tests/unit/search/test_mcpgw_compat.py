@@ -0,0 +1,96 @@
+"""
+Unit tests checking that mcpgw's copies of the registry search helpers stay in step.
+
+servers/mcpgw/server.py reads files written by the registry and cannot import
+registry code, so it carries its own readers. These tests write with the
+registry and read back with mcpgw. Skipped without the mcpgw dependencies.
+"""
+import numpy as np
+import pytest
+
+from registry.search.metadata_file import (
+    write_metadata_file,
+    write_tool_vectors_file
+)
+from registry.search.service import FaissService
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestMcpgwMetadataReaders:
+    """mcpgw's MappedMetadata and MappedToolVectors read the registry's files."""
+
+    def test_metadata_file_round_trip(self, mcpgw_server, tmp_path):
+        """Entries written by the registry read back unchanged, by path and by FAISS ID."""
+        metadata = {
+            "/fininfo": {"id": 7, "full_server_info": {"server_name": "Fininfo", "tags": ["finance"]}},
+            "/currenttime/": {"id": 2, "full_server_info": {"server_name": "Current Time ⏰"}},
+            "/no-id": {"text": "x"},
+        }
+        path = tmp_path / "metadata.bin"
+        write_metadata_file(path, metadata)
+
+        mapped = mcpgw_server.MappedMetadata(path)
+
+        assert len(mapped) == 2
+        assert dict(mapped) == {"/fininfo": metadata["/fininfo"], "/currenttime/": metadata["/currenttime/"]}
+        assert mapped.path_for_id(7) == "/fininfo"
+        assert mapped.path_for_id(2) == "/currenttime/"
+        assert mapped.path_for_id(3) is None
+
+    def test_tool_vectors_file_round_trip(self, mcpgw_server, tmp_path):
+        """Tool rows written by the registry are found by server, tool and text hash."""
+        keys = [("/fininfo", "get_stock_aggregates", "h1"), ("/time", "current_time_by_timezone", "h2")]
+        vectors = np.array([[3.0, 4.0, 0.0], [0.0, 0.0, 2.0]], dtype=np.float32)
+        path = tmp_path / "tool_vectors.bin"
+        write_tool_vectors_file(path, keys, vectors)
+
+        mapped = mcpgw_server.MappedToolVectors(path)
+
+        assert len(mapped) == 2
+        assert mapped.vectors.shape == (2, 3)
+        row = mapped.row_for("/fininfo", "get_stock_aggregates", "h1")
+        np.testing.assert_allclose(mapped.vectors[row], [0.6, 0.8, 0.0], rtol=1e-6)
+        np.testing.assert_allclose(mapped.vectors[mapped.row_for("/time", "current_time_by_timezone")], [0, 0, 1])
+        assert mapped.row_for("/fininfo", "get_stock_aggregates", "changed") is None
+
+    def test_empty_tool_vectors_file(self, mcpgw_server, tmp_path):
+        path = tmp_path / "tool_vectors.bin"
+        write_tool_vectors_file(path, [], np.zeros((0, 384), dtype=np.float32))
+
+        mapped = mcpgw_server.MappedToolVectors(path)
+
+        assert len(mapped) == 0
+        assert mapped.vectors.shape == (0, 384)
+
+    def test_readers_reject_each_others_files(self, mcpgw_server, tmp_path):
+        metadata_path = tmp_path / "metadata.bin"
+        write_metadata_file(metadata_path, {"/ok": {"id": 1}})
+        tool_vectors_path = tmp_path / "tool_vectors.bin"
+        write_tool_vectors_file(tool_vectors_path, [("/ok", "tool", "h")], np.ones((1, 4)))
+
+        with pytest.raises(ValueError):
+            mcpgw_server.MappedToolVectors(metadata_path)
+        with pytest.raises(ValueError):
+            mcpgw_server.MappedMetadata(tool_vectors_path)
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestMcpgwToolText:
+    """mcpgw embeds tools from the same text as the registry, so tool vector lookups hit."""
+
+    @pytest.mark.parametrize("tool", [
+        {
+            "name": "get_stock_aggregates",
+            "parsed_description": {"main": "Aggregated stock bars.", "args": "ticker"},
+            "description": "Raw docstring.",
+        },
+        {"name": "current_time_by_timezone", "parsed_description": {}, "description": "Current time in a timezone."},
+        {"name": "ping", "parsed_description": None},
+        {},
+    ])
+    def test_matches_registry_tool_text(self, mcpgw_server, tool):
+        registry_text = FaissService()._get_text_for_tool("Fininfo", tool)
+
+        assert mcpgw_server._tool_text_for_embedding_mcpgw("Fininfo", tool) == registry_text
@@ -0,0 +1,107 @@
+"""
+Unit tests for the memory-mapped binary metadata and tool vector files.
+"""
+import numpy as np
+import pytest
+
+from registry.search.metadata_file import (
+    MappedMetadata,
+    MappedToolVectors,
+    write_metadata_file,
+    write_tool_vectors_file
+)
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestMetadataFile:
+    """Test suite for write_metadata_file and MappedMetadata."""
+
+    def test_round_trip(self, tmp_path):
+        """Entries read back unchanged and are keyed by path."""
+        metadata = {
+            "/fininfo": {"id": 7, "full_server_info": {"server_name": "Fininfo", "tags": ["finance"]}},
+            "/currenttime/": {"id": 2, "full_server_info": {"server_name": "Current Time ⏰"}},
+        }
+        path = tmp_path / "metadata.bin"
+        write_metadata_file(path, metadata)
+
+        mapped = MappedMetadata(path)
+
+        assert len(mapped) == 2
+        assert set(mapped) == {"/fininfo", "/currenttime/"}
+        assert mapped["/currenttime/"] == metadata["/currenttime/"]
+        assert dict(mapped) == metadata
+        assert mapped.get("/missing") is None
+
+    def test_path_for_id(self, tmp_path):
+        """FAISS IDs resolve through the sorted ID table."""
+        metadata = {f"/server{i}": {"id": i * 3} for i in range(50)}
+        path = tmp_path / "metadata.bin"
+        write_metadata_file(path, metadata)
+
+        mapped = MappedMetadata(path)
+
+        assert mapped.path_for_id(27) == "/server9"
+        assert mapped.path_for_id(28) is None
+        assert mapped.path_for_id(10_000) is None
+
+    def test_skips_entries_without_ids(self, tmp_path):
+        """Malformed entries are left out rather than breaking the file."""
+        path = tmp_path / "metadata.bin"
+        write_metadata_file(path, {"/ok": {"id": 1}, "/no-id": {"text": "x"}, "/bad": "x"})
+
+        assert list(MappedMetadata(path)) == ["/ok"]
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "metadata.json"
+        path.write_text('{"metadata": {}}')
+
+        with pytest.raises(ValueError):
+            MappedMetadata(path)
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestToolVectorsFile:
+    """Test suite for write_tool_vectors_file and MappedToolVectors."""
+
+    def test_round_trip_normalises_rows(self, tmp_path):
+        """Rows are stored unit length and looked up by server, tool and text hash."""
+        keys = [("/fininfo", "get_stock_aggregates", "h1"), ("/time", "current_time_by_timezone", "h2")]
+        vectors = np.array([[3.0, 4.0, 0.0], [0.0, 0.0, 2.0]], dtype=np.float32)
+        path = tmp_path / "tool_vectors.bin"
+        write_tool_vectors_file(path, keys, vectors)
+
+        mapped = MappedToolVectors(path)
+
+        assert len(mapped) == 2
+        assert mapped.dimension == 3
+        row = mapped.row_for("/fininfo", "get_stock_aggregates", "h1")
+        np.testing.assert_allclose(mapped.vectors[row], [0.6, 0.8, 0.0], rtol=1e-6)
+        np.testing.assert_allclose(mapped.vectors[mapped.row_for("/time", "current_time_by_timezone")], [0, 0, 1])
+
+    def test_stale_or_missing_tools_have_no_row(self, tmp_path):
+        path = tmp_path / "tool_vectors.bin"
+        write_tool_vectors_file(path, [("/fininfo", "get_stock_aggregates", "h1")], np.ones((1, 4)))
+
+        mapped = MappedToolVectors(path)
+
+        assert mapped.row_for("/fininfo", "get_stock_aggregates", "changed") is None
+        assert mapped.row_for("/fininfo", "unknown_tool") is None
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "tool_vectors.bin"
+        write_tool_vectors_file(path, [], np.zeros((0, 384), dtype=np.float32))
+
+        mapped = MappedToolVectors(path)
+
+        assert len(mapped) == 0
+        assert mapped.vectors.shape == (0, 384)
+
+    def test_rejects_metadata_files(self, tmp_path):
+        path = tmp_path / "metadata.bin"
+        write_metadata_file(path, {"/ok": {"id": 1}})
+
+        with pytest.raises(ValueError):
+            MappedToolVectors(path)
@@ -0,0 +1,78 @@
+"""
+Unit tests for the ONNX embedding backend.
+"""
+import pytest
+import numpy as np
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from registry.core.config import settings
+from registry.search.onnx_backend import (
+    load_onnx_sentence_transformer,
+    quantized_model_file,
+)
+
+
+PARITY_SENTENCES = [
+    "get current time in a timezone",
+    "stock price for a ticker symbol",
+    "search the web for recent news",
+    "Service: currenttime. Tool: current_time_by_timezone. Description: Get the current time.",
+    "Name: fininfo\nDescription: Financial information service\nTags: finance, stocks",
+]
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestOnnxBackend:
+    """Test suite for the ONNX embedding backend loader."""
+
+    def test_rejects_unknown_quantization(self):
+        """Unsupported quantization configs fail before any model is loaded."""
+        with patch('registry.search.onnx_backend.SentenceTransformer') as mock_transformer:
+            with pytest.raises(ValueError):
+                load_onnx_sentence_transformer("all-MiniLM-L6-v2", quantization="int4")
+
+        mock_transformer.assert_not_called()
+
+    def test_reuses_existing_quantized_export(self, tmp_path):
+        """An existing quantised file is loaded directly without re-exporting."""
+        quantized = tmp_path / quantized_model_file("avx2")
+        quantized.parent.mkdir(parents=True)
+        quantized.touch()
+
+        with patch('registry.search.onnx_backend.SentenceTransformer') as mock_transformer:
+            load_onnx_sentence_transformer(str(tmp_path), quantization="avx2")
+
+        mock_transformer.assert_called_once_with(
+            str(tmp_path), backend="onnx", model_kwargs={"file_name": "onnx/model_qint8_avx2.onnx"}
+        )
+
+    def test_fp32_onnx_when_quantization_disabled(self):
+        """An empty quantization config loads the plain ONNX export."""
+        with patch('registry.search.onnx_backend.SentenceTransformer') as mock_transformer:
+            load_onnx_sentence_transformer("all-MiniLM-L6-v2", quantization="")
+
+        mock_transformer.assert_called_once_with("all-MiniLM-L6-v2", backend="onnx")
+
+    def test_quantized_embeddings_match_torch(self, tmp_path):
+        """Int8 ONNX embeddings stay within 0.98 cosine similarity of the PyTorch model."""
+        pytest.importorskip("optimum.onnxruntime")
+        from sentence_transformers import SentenceTransformer
+
+        model_dir = Path(settings.embeddings_model_dir)
+        if not (model_dir.exists() and any(model_dir.iterdir())):
+            pytest.skip(f"Embedding model not available at {model_dir}")
+
+        torch_model = SentenceTransformer(str(model_dir))
+        torch_model.save(str(tmp_path))
+        onnx_model = load_onnx_sentence_transformer(str(tmp_path), quantization="avx2")
+
+        expected = torch_model.encode(PARITY_SENTENCES)
+        actual = onnx_model.encode(PARITY_SENTENCES)
+        cosine = np.sum(expected * actual, axis=1) / (
+            np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+        )
+
+        assert actual.shape == expected.shape
+        assert cosine.min() >= 0.98
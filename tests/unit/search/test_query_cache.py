@@ -0,0 +1,79 @@
+"""
+Unit tests for the query embedding cache.
+"""
+import pytest
+import numpy as np
+from unittest.mock import patch
+
+from registry.search.query_cache import QueryEmbeddingCache
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestQueryEmbeddingCache:
+    """Test suite for QueryEmbeddingCache."""
+
+    def test_hit_after_put_with_normalised_key(self):
+        """With case folding, queries differing only in case and whitespace share an entry."""
+        cache = QueryEmbeddingCache(max_size=4, ttl_seconds=60, fold_case=True)
+        cache.put("Get current  time", np.ones((1, 3)))
+
+        cached = cache.get("  get CURRENT time ")
+
+        assert cached is not None
+        assert cached.dtype == np.float32
+        assert not cached.flags.writeable
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 0
+
+    def test_case_is_kept_by_default(self):
+        """Without case folding, only whitespace is collapsed, so cased models keep separate entries."""
+        cache = QueryEmbeddingCache(max_size=4, ttl_seconds=60)
+        cache.put("AWS  pricing", np.ones((1, 3)))
+
+        assert cache.get("aws pricing") is None
+        assert cache.get(" AWS pricing ") is not None
+
+    def test_miss_is_counted(self):
+        """Unknown queries return None and count as misses."""
+        cache = QueryEmbeddingCache(max_size=4, ttl_seconds=60)
+
+        assert cache.get("stock price") is None
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 0.0
+
+    def test_evicts_least_recently_used(self):
+        """A full cache evicts the entry that was used longest ago."""
+        cache = QueryEmbeddingCache(max_size=2, ttl_seconds=60)
+        cache.put("a", np.zeros((1, 3)))
+        cache.put("b", np.zeros((1, 3)))
+        cache.get("a")
+        cache.put("c", np.zeros((1, 3)))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size"] == 2
+
+    def test_expired_entries_are_dropped(self):
+        """Entries older than the TTL are treated as misses."""
+        cache = QueryEmbeddingCache(max_size=4, ttl_seconds=10)
+        with patch("registry.search.query_cache.time.monotonic", return_value=100.0):
+            cache.put("a", np.zeros((1, 3)))
+        with patch("registry.search.query_cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+
+        stats = cache.stats()
+        assert stats["expirations"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 0
+
+    def test_zero_size_disables_cache(self):
+        """A max size of 0 turns the cache into a no-op."""
+        cache = QueryEmbeddingCache(max_size=0, ttl_seconds=60)
+        cache.put("a", np.zeros((1, 3)))
+
+        assert cache.get("a") is None
+        assert cache.stats()["enabled"] is False
+        assert cache.stats()["misses"] == 0
@@ -0,0 +1,43 @@
+"""
+Unit tests for the lifecycle of mcpgw's shared registry HTTP client.
+
+Skipped without the mcpgw dependencies (fastmcp).
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+@pytest.mark.unit
+class TestPooledHttpClientLifecycle:
+    """PooledHttpClient is closed on loop changes and at server shutdown."""
+
+    def test_loop_change_closes_previous_client(self, mcpgw_server):
+        pooled = mcpgw_server.PooledHttpClient()
+
+        first = asyncio.run(pooled._get_client())
+        second = asyncio.run(pooled._get_client())
+
+        assert second is not first
+        assert first.is_closed
+        assert not second.is_closed
+
+        asyncio.run(pooled.aclose())
+        assert second.is_closed
+
+    def test_server_shutdown_closes_client(self, mcpgw_server):
+        with patch.object(mcpgw_server.mcp, "run_async", new_callable=AsyncMock) as mock_run, \
+             patch.object(mcpgw_server._http_client_mcpgw, "aclose", new_callable=AsyncMock) as mock_aclose:
+            asyncio.run(mcpgw_server._run_server())
+
+        mock_run.assert_awaited_once()
+        mock_aclose.assert_awaited_once()
+
+    def test_client_is_closed_when_server_fails(self, mcpgw_server):
+        with patch.object(mcpgw_server.mcp, "run_async", new_callable=AsyncMock, side_effect=OSError("port in use")), \
+             patch.object(mcpgw_server._http_client_mcpgw, "aclose", new_callable=AsyncMock) as mock_aclose:
+            with pytest.raises(OSError):
+                asyncio.run(mcpgw_server._run_server())
+
+        mock_aclose.assert_awaited_once()